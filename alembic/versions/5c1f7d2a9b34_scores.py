@@ -0,0 +1,40 @@
+"""scores
+
+Revision ID: 5c1f7d2a9b34
+Revises: a83dddc1e3f0
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '5c1f7d2a9b34'
+down_revision = 'a83dddc1e3f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('scores',
+    sa.Column('peer_id', sa.BigInteger(), nullable=False),
+    sa.Column('user_id', sa.BigInteger(), nullable=False),
+    sa.Column('score', sa.Integer(), nullable=False),
+    sa.Column('moves', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('peer_id', 'user_id')
+    )
+    op.create_index('ix_scores_peer_id_score', 'scores', ['peer_id', 'score'], unique=False)
+    op.create_table('global_scores',
+    sa.Column('user_id', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('score', sa.Integer(), nullable=False),
+    sa.Column('moves', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index(op.f('ix_global_scores_score'), 'global_scores', ['score'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_global_scores_score'), table_name='global_scores')
+    op.drop_table('global_scores')
+    op.drop_index('ix_scores_peer_id_score', table_name='scores')
+    op.drop_table('scores')
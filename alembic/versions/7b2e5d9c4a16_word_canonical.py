@@ -0,0 +1,87 @@
+"""word canonical
+
+Revision ID: 7b2e5d9c4a16
+Revises: 3d8a6c1f0b52
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '7b2e5d9c4a16'
+down_revision = '3d8a6c1f0b52'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 10000
+
+# a frozen copy of app.words.normalize as of this revision, the migration
+# must keep producing the same canonical forms when the app code changes
+HOMOGLYPHS = str.maketrans('abcehkmoptxy', 'авсенкмортху')
+CYRILLIC = re.compile('[а-я]')
+LATIN = re.compile('[a-z]')
+
+
+def normalize(title: str) -> str:
+    title = unicodedata.normalize('NFC', title).lower().replace('ё', 'е')
+    title = ' '.join(title.split())
+    if LATIN.search(title) and CYRILLIC.search(title):
+        return title.translate(HOMOGLYPHS)
+    return title
+
+
+def upgrade() -> None:
+    op.add_column('words', sa.Column('canonical', sa.String(), nullable=True))
+
+    words = sa.table(
+        'words',
+        sa.column('id', sa.Integer()),
+        sa.column('title', sa.String()),
+        sa.column('canonical', sa.String()),
+    )
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(words.c.id, words.c.title)
+            .where(words.c.id > last_id)
+            .order_by(words.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        canonicals = [normalize(title) for _, title in rows]
+        bind.execute(
+            words.update()
+            .where(words.c.id == sa.bindparam('word_id'))
+            .values(canonical=sa.bindparam('word_canonical')),
+            [
+                {'word_id': word_id, 'word_canonical': canonical}
+                for (word_id, _), canonical in zip(rows, canonicals)
+            ],
+        )
+        last_id = rows[-1][0]
+
+    duplicates = bind.execute(
+        sa.select(words.c.canonical, sa.func.array_agg(words.c.title))
+        .group_by(words.c.canonical)
+        .having(sa.func.count() > 1)
+        .limit(20)
+    ).all()
+    if duplicates:
+        raise RuntimeError(
+            'words differ only in spelling, merge them before upgrading: '
+            + '; '.join(', '.join(titles) for _, titles in duplicates)
+        )
+
+    op.alter_column('words', 'canonical', nullable=False)
+    op.create_index(op.f('ix_words_canonical'), 'words', ['canonical'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_words_canonical'), table_name='words')
+    op.drop_column('words', 'canonical')
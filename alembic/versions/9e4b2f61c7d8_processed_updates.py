@@ -0,0 +1,30 @@
+"""processed updates
+
+Revision ID: 9e4b2f61c7d8
+Revises: 5c1f7d2a9b34
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '9e4b2f61c7d8'
+down_revision = '5c1f7d2a9b34'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('processed_updates',
+    sa.Column('peer_id', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('conversation_message_id', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('peer_id', 'conversation_message_id')
+    )
+    op.create_index(op.f('ix_processed_updates_created_at'), 'processed_updates', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_processed_updates_created_at'), table_name='processed_updates')
+    op.drop_table('processed_updates')
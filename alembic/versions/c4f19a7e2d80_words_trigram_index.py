@@ -0,0 +1,23 @@
+"""words trigram index
+
+Revision ID: c4f19a7e2d80
+Revises: 7b2e5d9c4a16
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'c4f19a7e2d80'
+down_revision = '7b2e5d9c4a16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_words_canonical_trgm', 'words', ['canonical'], unique=False, postgresql_using='gist', postgresql_ops={'canonical': 'gist_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_words_canonical_trgm', table_name='words', postgresql_using='gist')
@@ -0,0 +1,46 @@
+"""dictionary version
+
+Revision ID: e2a7c5d91b46
+Revises: c4f19a7e2d80
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e2a7c5d91b46'
+down_revision = 'c4f19a7e2d80'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('dictionary_version',
+    sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute('INSERT INTO dictionary_version (id, version) VALUES (1, 0)')
+    # statement level, so a bulk import bumps the version once
+    op.execute('''
+        CREATE FUNCTION bump_dictionary_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE dictionary_version SET version = version + 1 WHERE id = 1;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    ''')
+    for table in ('words', 'settings'):
+        op.execute(f'''
+            CREATE TRIGGER {table}_dictionary_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_dictionary_version()
+        ''')
+
+
+def downgrade() -> None:
+    for table in ('words', 'settings'):
+        op.execute(f'DROP TRIGGER {table}_dictionary_version ON {table}')
+    op.execute('DROP FUNCTION bump_dictionary_version()')
+    op.drop_table('dictionary_version')
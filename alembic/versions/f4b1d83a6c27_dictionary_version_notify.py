@@ -0,0 +1,42 @@
+"""dictionary version notify
+
+Revision ID: f4b1d83a6c27
+Revises: e2a7c5d91b46
+Create Date: 2026-10-20 11:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'f4b1d83a6c27'
+down_revision = 'e2a7c5d91b46'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # NOTIFY is delivered on commit, so listeners never see a version whose
+    # rows they cannot read yet
+    op.execute('''
+        CREATE OR REPLACE FUNCTION bump_dictionary_version() RETURNS trigger AS $$
+        DECLARE
+            new_version bigint;
+        BEGIN
+            UPDATE dictionary_version SET version = version + 1 WHERE id = 1
+            RETURNING version INTO new_version;
+            PERFORM pg_notify('dictionary_version', new_version::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    ''')
+
+
+def downgrade() -> None:
+    op.execute('''
+        CREATE OR REPLACE FUNCTION bump_dictionary_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE dictionary_version SET version = version + 1 WHERE id = 1;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    ''')
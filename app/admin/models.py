@@ -1,14 +1,16 @@
 import uuid
 from dataclasses import dataclass, field
 from hashlib import sha256
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
-from aiohttp_session import Session
 from sqlalchemy import Column, String
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.store.database.sqlalchemy_base import mapper_registry
 
+if TYPE_CHECKING:
+    from aiohttp_session import Session
+
 
 @mapper_registry.mapped
 @dataclass
@@ -31,5 +33,7 @@ class AdminModel:
         return self.password == str(sha256(password.encode()).hexdigest())
 
     @classmethod
-    def from_session(cls, session: Optional[Session]) -> Optional["AdminModel"]:
+    def from_session(
+        cls, session: Optional["Session"]
+    ) -> Optional["AdminModel"]:
         return cls(id=session["admin"]["id"], email=session["admin"]["email"])
@@ -0,0 +1,36 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, Column, DateTime, func
+
+from app.store.database.sqlalchemy_base import mapper_registry
+
+
+@mapper_registry.mapped
+@dataclass
+class ProcessedUpdateModel:
+    __tablename__ = "processed_updates"
+    __sa_dataclass_metadata_key__ = "sa"
+
+    peer_id: int = field(
+        metadata={
+            "sa": Column(BigInteger, primary_key=True, autoincrement=False)
+        }
+    )
+    conversation_message_id: int = field(
+        metadata={
+            "sa": Column(BigInteger, primary_key=True, autoincrement=False)
+        }
+    )
+    created_at: Optional[datetime] = field(
+        default=None,
+        metadata={
+            "sa": Column(
+                DateTime(timezone=True),
+                nullable=False,
+                server_default=func.now(),
+                index=True,
+            )
+        },
+    )
@@ -0,0 +1,41 @@
+from dataclasses import dataclass, field
+
+from sqlalchemy import BigInteger, Column, Index, Integer
+
+from app.store.database.sqlalchemy_base import mapper_registry
+
+
+@mapper_registry.mapped
+@dataclass
+class ScoreModel:
+    __tablename__ = "scores"
+    __sa_dataclass_metadata_key__ = "sa"
+    __table_args__ = (Index("ix_scores_peer_id_score", "peer_id", "score"),)
+
+    peer_id: int = field(metadata={"sa": Column(BigInteger, primary_key=True)})
+    user_id: int = field(metadata={"sa": Column(BigInteger, primary_key=True)})
+    score: int = field(
+        default=0, metadata={"sa": Column(Integer, nullable=False)}
+    )
+    moves: int = field(
+        default=0, metadata={"sa": Column(Integer, nullable=False)}
+    )
+
+
+@mapper_registry.mapped
+@dataclass
+class GlobalScoreModel:
+    __tablename__ = "global_scores"
+    __sa_dataclass_metadata_key__ = "sa"
+
+    user_id: int = field(
+        metadata={
+            "sa": Column(BigInteger, primary_key=True, autoincrement=False)
+        }
+    )
+    score: int = field(
+        default=0, metadata={"sa": Column(Integer, nullable=False, index=True)}
+    )
+    moves: int = field(
+        default=0, metadata={"sa": Column(Integer, nullable=False)}
+    )
@@ -0,0 +1,18 @@
+import typing
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+
+def setup_routes(app: "Application"):
+    from app.game.views import (
+        GameGetView,
+        GameListView,
+        GameStopView,
+        LeaderboardView,
+    )
+
+    app.router.add_view("/game.leaderboard", LeaderboardView)
+    app.router.add_view("/game.list_active", GameListView)
+    app.router.add_view("/game.get", GameGetView)
+    app.router.add_view("/game.stop", GameStopView)
@@ -0,0 +1,63 @@
+from marshmallow import Schema, fields, validate
+
+from app.store.game.dataclasses import GAME_ACTIVE, GAME_STATUSES
+
+
+class LeaderboardQuerySchema(Schema):
+    peer_id = fields.Int(required=False)
+    limit = fields.Int(
+        required=False, load_default=10, validate=validate.Range(min=1, max=100)
+    )
+
+
+class ScoreSchema(Schema):
+    user_id = fields.Int(required=True)
+    score = fields.Int(required=True)
+    moves = fields.Int(required=True)
+
+
+class LeaderboardSchema(Schema):
+    peer_id = fields.Int(allow_none=True)
+    scores = fields.Nested(ScoreSchema, many=True)
+
+
+class GamePlayerSchema(Schema):
+    user_id = fields.Int(required=True)
+    name = fields.Str(required=True)
+    points = fields.Int(required=True)
+
+
+class GameSchema(Schema):
+    peer_id = fields.Int(required=True)
+    status = fields.Str(required=True)
+    players = fields.Nested(GamePlayerSchema, many=True)
+    current_user_id = fields.Int(allow_none=True)
+    last_word = fields.Str(allow_none=True)
+    used_words = fields.Int(required=True)
+    moves = fields.Int(required=True)
+    started_at = fields.Float(required=True)
+    updated_at = fields.Float(required=True)
+
+
+class GameListQuerySchema(Schema):
+    peer_id = fields.Int(required=False)
+    status = fields.Str(
+        required=False,
+        load_default=GAME_ACTIVE,
+        validate=validate.OneOf(GAME_STATUSES),
+    )
+    offset = fields.Int(
+        required=False, load_default=0, validate=validate.Range(min=0)
+    )
+    limit = fields.Int(
+        required=False, load_default=50, validate=validate.Range(min=1, max=500)
+    )
+
+
+class GameListSchema(Schema):
+    total = fields.Int(required=True)
+    games = fields.Nested(GameSchema, many=True)
+
+
+class GamePeerIdSchema(Schema):
+    peer_id = fields.Int(required=True)
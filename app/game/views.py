@@ -0,0 +1,118 @@
+from aiohttp.web_exceptions import HTTPNotFound
+from aiohttp_apispec import (
+    docs,
+    querystring_schema,
+    request_schema,
+    response_schema,
+)
+
+from app.game.schemes import (
+    GameListQuerySchema,
+    GameListSchema,
+    GamePeerIdSchema,
+    GameSchema,
+    LeaderboardQuerySchema,
+    LeaderboardSchema,
+)
+from app.store.game.dataclasses import GAME_ACTIVE, GameState
+from app.web.app import View
+from app.web.mixins import AuthRequiredMixin, BotWorkerMixin
+from app.web.utils import json_response
+
+
+def game_to_dict(game: GameState) -> dict:
+    return {
+        "peer_id": game.peer_id,
+        "status": game.status,
+        "players": [
+            {"user_id": user_id, "name": name, "points": points}
+            for user_id, name, points in zip(
+                game.players, game.names, game.points
+            )
+        ],
+        "current_user_id": (
+            game.current_user_id if game.status == GAME_ACTIVE else None
+        ),
+        "last_word": game.last_word,
+        "used_words": len(game.used_words),
+        "moves": game.moves,
+        "started_at": game.started_at,
+        "updated_at": game.updated_at,
+    }
+
+
+class LeaderboardView(AuthRequiredMixin, View):
+    @docs(
+        tags=["game"],
+        summary="leaderboard",
+        description="top players of a chat or across all chats",
+    )
+    @querystring_schema(LeaderboardQuerySchema)
+    @response_schema(LeaderboardSchema)
+    async def get(self):
+        peer_id = self.request["querystring"].get("peer_id")
+        limit = self.request["querystring"]["limit"]
+        if peer_id is None:
+            top = await self.store.scores.top_global(limit)
+        else:
+            top = await self.store.scores.top_chat(peer_id, limit)
+        return json_response(
+            data=LeaderboardSchema().dump(
+                {
+                    "peer_id": peer_id,
+                    "scores": [
+                        {"user_id": user_id, "score": score, "moves": moves}
+                        for user_id, score, moves in top
+                    ],
+                }
+            )
+        )
+
+
+class GameListView(AuthRequiredMixin, BotWorkerMixin, View):
+    @docs(
+        tags=["game"],
+        summary="list games",
+        description="paginated games filtered by status and peer_id",
+    )
+    @querystring_schema(GameListQuerySchema)
+    @response_schema(GameListSchema)
+    async def get(self):
+        query = self.request["querystring"]
+        total, games = self.store.games.list_games(
+            status=query["status"],
+            peer_id=query.get("peer_id"),
+            offset=query["offset"],
+            limit=query["limit"],
+        )
+        return json_response(
+            data=GameListSchema().dump(
+                {"total": total, "games": [game_to_dict(g) for g in games]}
+            )
+        )
+
+
+class GameGetView(AuthRequiredMixin, BotWorkerMixin, View):
+    @docs(
+        tags=["game"], summary="get game", description="return game of a chat"
+    )
+    @querystring_schema(GamePeerIdSchema)
+    @response_schema(GameSchema)
+    async def get(self):
+        game = self.store.games.get(self.request["querystring"]["peer_id"])
+        if game is None:
+            raise HTTPNotFound
+        return json_response(data=GameSchema().dump(game_to_dict(game)))
+
+
+class GameStopView(AuthRequiredMixin, BotWorkerMixin, View):
+    @docs(tags=["game"], summary="stop game", description="stop running game")
+    @request_schema(GamePeerIdSchema)
+    @response_schema(GameSchema)
+    async def post(self):
+        peer_id = self.data["peer_id"]
+        if self.store.games.get_active(peer_id) is None:
+            raise HTTPNotFound
+        await self.store.bots_manager.stop_game(peer_id)
+        game = self.store.games.get(peer_id)
+        return json_response(data=GameSchema().dump(game_to_dict(game)))
@@ -0,0 +1,71 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Column, DateTime, Index, Integer, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.store.database.sqlalchemy_base import mapper_registry
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+@mapper_registry.mapped
+@dataclass
+class JobModel:
+    __tablename__ = "jobs"
+    __sa_dataclass_metadata_key__ = "sa"
+    __table_args__ = (Index("ix_jobs_status_id", "status", "id"),)
+
+    kind: str = field(metadata={"sa": Column(String, nullable=False)})
+    params: dict = field(
+        default_factory=dict,
+        metadata={"sa": Column(JSONB, nullable=False, server_default="{}")},
+    )
+    status: str = field(
+        default=JOB_QUEUED,
+        metadata={
+            "sa": Column(String, nullable=False, server_default=JOB_QUEUED)
+        },
+    )
+    done: int = field(
+        default=0,
+        metadata={"sa": Column(Integer, nullable=False, server_default="0")},
+    )
+    total: Optional[int] = field(
+        default=None, metadata={"sa": Column(Integer, nullable=True)}
+    )
+    attempts: int = field(
+        default=0,
+        metadata={"sa": Column(Integer, nullable=False, server_default="0")},
+    )
+    result: Optional[dict] = field(
+        default=None, metadata={"sa": Column(JSONB, nullable=True)}
+    )
+    error: Optional[str] = field(
+        default=None, metadata={"sa": Column(String, nullable=True)}
+    )
+    created_at: Optional[datetime] = field(
+        default=None,
+        metadata={
+            "sa": Column(
+                DateTime(timezone=True),
+                nullable=False,
+                server_default=func.now(),
+            )
+        },
+    )
+    started_at: Optional[datetime] = field(
+        default=None,
+        metadata={"sa": Column(DateTime(timezone=True), nullable=True)},
+    )
+    finished_at: Optional[datetime] = field(
+        default=None,
+        metadata={"sa": Column(DateTime(timezone=True), nullable=True)},
+    )
+    id: Optional[int] = field(
+        default=None, metadata={"sa": Column(Integer, primary_key=True)}
+    )
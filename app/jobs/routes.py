@@ -0,0 +1,11 @@
+import typing
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+
+def setup_routes(app: "Application"):
+    from app.jobs.views import JobGetView, JobResultView
+
+    app.router.add_view("/jobs.get", JobGetView)
+    app.router.add_view("/jobs.result", JobResultView)
@@ -0,0 +1,19 @@
+from marshmallow import Schema, fields
+
+
+class JobSchema(Schema):
+    id = fields.Int(required=True)
+    kind = fields.Str(required=True)
+    status = fields.Str(required=True)
+    done = fields.Int(required=True)
+    total = fields.Int(allow_none=True)
+    attempts = fields.Int(required=True)
+    result = fields.Dict(allow_none=True)
+    error = fields.Str(allow_none=True)
+    created_at = fields.DateTime(allow_none=True)
+    started_at = fields.DateTime(allow_none=True)
+    finished_at = fields.DateTime(allow_none=True)
+
+
+class JobIdSchema(Schema):
+    id = fields.Int(required=True)
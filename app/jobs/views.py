@@ -0,0 +1,53 @@
+import os
+
+from aiohttp.web import FileResponse
+from aiohttp.web_exceptions import HTTPNotFound
+from aiohttp_apispec import docs, querystring_schema, response_schema
+
+from app.jobs.models import JOB_DONE
+from app.jobs.schemes import JobIdSchema, JobSchema
+from app.web.app import View
+from app.web.mixins import AuthRequiredMixin
+from app.web.utils import json_response
+
+
+class JobGetView(AuthRequiredMixin, View):
+    @docs(
+        tags=["jobs"],
+        summary="get job",
+        description="status, progress and result of a background job",
+    )
+    @querystring_schema(JobIdSchema)
+    @response_schema(JobSchema)
+    async def get(self):
+        job = await self.store.jobs.get(self.request["querystring"]["id"])
+        if job is None:
+            raise HTTPNotFound
+        return json_response(data=JobSchema().dump(job))
+
+
+class JobResultView(AuthRequiredMixin, View):
+    @docs(
+        tags=["jobs"],
+        summary="download job result",
+        description="file written by a finished job, such as words.list",
+    )
+    @querystring_schema(JobIdSchema)
+    async def get(self):
+        job = await self.store.jobs.get(self.request["querystring"]["id"])
+        if (
+            job is None
+            or job.status != JOB_DONE
+            or "file" not in (job.result or {})
+        ):
+            raise HTTPNotFound
+        filename = os.path.basename(job.result["file"])
+        path = os.path.join(self.request.app.config.jobs.result_dir, filename)
+        if not os.path.isfile(path):
+            raise HTTPNotFound
+        return FileResponse(
+            path,
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}"'
+            },
+        )
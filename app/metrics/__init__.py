@@ -0,0 +1,22 @@
+import typing
+
+from app.metrics.loop import LoopLagMonitor
+from app.metrics.watchdog import LoopWatchdog
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+
+def setup_metrics(app: "Application"):
+    app.loop_monitor = LoopLagMonitor(app.config.metrics.loop_lag_interval)
+    app.on_startup.append(app.loop_monitor.start)
+    app.on_cleanup.append(app.loop_monitor.stop)
+    if app.config.metrics.watchdog:
+        app.watchdog = LoopWatchdog(
+            app.loop_monitor,
+            threshold=app.config.metrics.watchdog_threshold,
+            max_stalls=app.config.metrics.watchdog_max_stalls,
+            asyncio_debug=app.config.metrics.asyncio_debug,
+        )
+        app.on_startup.append(app.watchdog.start)
+        app.on_cleanup.append(app.watchdog.stop)
@@ -0,0 +1,39 @@
+import asyncio
+import time
+from asyncio import Task
+from typing import Optional
+
+from app.metrics.metrics import EVENT_LOOP_LAG_LAST, EVENT_LOOP_LAG_SECONDS
+
+
+class LoopLagMonitor:
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.is_running = False
+        self.heartbeat: Optional[float] = None
+        self.task: Optional[Task] = None
+        self._lag = EVENT_LOOP_LAG_SECONDS.labels()
+        self._last = EVENT_LOOP_LAG_LAST.labels()
+
+    async def start(self, *_: list, **__: dict):
+        self.is_running = True
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self, *_: list, **__: dict):
+        self.is_running = False
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while self.is_running:
+            scheduled = loop.time()
+            self.heartbeat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - scheduled - self.interval, 0.0)
+            self._lag.observe(lag)
+            self._last.set(lag)
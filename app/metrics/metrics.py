@@ -0,0 +1,95 @@
+from functools import wraps
+from time import perf_counter
+
+from app.metrics.registry import Counter, Gauge, Histogram
+
+VK_POLL_CYCLE_SECONDS = Histogram(
+    "vk_poll_cycle_seconds",
+    "Duration of one long poll cycle including update handling",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 7.5, 10.0, 30.0),
+)
+VK_POLL_UPDATES = Histogram(
+    "vk_poll_updates",
+    "Number of updates received in one long poll batch",
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+)
+BOT_HANDLE_UPDATE_SECONDS = Histogram(
+    "bot_handle_update_seconds",
+    "Time spent handling one update",
+    labelnames=("type",),
+)
+BOT_UPDATES_LIMITED = Counter(
+    "bot_updates_limited_total",
+    "Updates dropped or merged by the inbound rate limiter",
+    labelnames=("action",),
+)
+BOT_DUPLICATE_UPDATES = Counter(
+    "bot_duplicate_updates_total",
+    "Updates skipped because they were already processed",
+)
+JOBS_FINISHED = Counter(
+    "jobs_finished_total",
+    "Background jobs finished by the worker pool",
+    labelnames=("kind", "status"),
+)
+WRITE_BATCH_SIZE = Histogram(
+    "write_batch_size",
+    "Number of writes committed by the write batcher in one transaction",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+WRITE_BATCH_FALLBACKS = Counter(
+    "write_batch_fallbacks_total",
+    "Write batches replayed with a savepoint per write after a failure",
+)
+VK_API_REQUEST_SECONDS = Histogram(
+    "vk_api_request_seconds",
+    "VK API call latency",
+    labelnames=("method",),
+)
+VK_API_ERRORS = Counter(
+    "vk_api_errors_total",
+    "VK API responses with an error code",
+    labelnames=("method", "code"),
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_seconds",
+    "Latency of accessor database calls",
+    labelnames=("method",),
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_seconds",
+    "Admin API request latency",
+    labelnames=("route", "status"),
+)
+HTTP_MIDDLEWARE_SECONDS = Histogram(
+    "http_middleware_seconds",
+    "Time spent inside a middleware, excluding downstream handlers",
+    labelnames=("middleware",),
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05, 0.1),
+)
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between the scheduled and the actual wake up of the loop",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+EVENT_LOOP_LAG_LAST = Gauge(
+    "event_loop_lag_last_seconds",
+    "Last measured event loop lag",
+)
+
+
+def observe_query(name: str):
+    child = DB_QUERY_SECONDS.labels(name)
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            started = perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                child.observe(perf_counter() - started)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,11 @@
+import typing
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+
+def setup_routes(app: "Application"):
+    from app.metrics.views import LoopStallListView, MetricsView
+
+    app.router.add_view("/metrics", MetricsView)
+    app.router.add_view("/metrics.loop_stalls", LoopStallListView)
@@ -0,0 +1,14 @@
+from marshmallow import Schema, fields
+
+
+class LoopStallSchema(Schema):
+    kind = fields.Str()
+    lag = fields.Float(allow_none=True)
+    detected_at = fields.Str()
+    stack = fields.List(fields.Str())
+
+
+class LoopStallListSchema(Schema):
+    enabled = fields.Bool()
+    threshold = fields.Float(allow_none=True)
+    stalls = fields.Nested(LoopStallSchema, many=True)
@@ -0,0 +1,39 @@
+from aiohttp.web_response import Response
+from aiohttp_apispec import docs, response_schema
+
+from app.metrics.registry import REGISTRY
+from app.metrics.schemes import LoopStallListSchema
+from app.web.app import View
+from app.web.mixins import AuthRequiredMixin
+from app.web.utils import json_response
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsView(View):
+    @docs(tags=["metrics"], summary="Metrics", description="Prometheus metrics")
+    async def get(self):
+        return Response(
+            body=REGISTRY.render().encode("utf-8"),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+
+class LoopStallListView(AuthRequiredMixin, View):
+    @docs(
+        tags=["metrics"],
+        summary="Loop stalls",
+        description="Stacks captured while the event loop was blocked",
+    )
+    @response_schema(LoopStallListSchema)
+    async def get(self):
+        watchdog = self.request.app.watchdog
+        return json_response(
+            data=LoopStallListSchema().dump(
+                {
+                    "enabled": watchdog is not None,
+                    "threshold": watchdog.threshold if watchdog else None,
+                    "stalls": watchdog.snapshot() if watchdog else [],
+                }
+            )
+        )
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.metrics.loop import LoopLagMonitor
+
+
+class SlowCallbackHandler(logging.Handler):
+    def __init__(self, watchdog: "LoopWatchdog"):
+        super().__init__(level=logging.WARNING)
+        self.watchdog = watchdog
+
+    def emit(self, record: logging.LogRecord) -> None:
+        message = record.getMessage()
+        if message.startswith("Executing "):
+            self.watchdog.record("slow_callback", None, [message])
+
+
+class LoopWatchdog:
+    def __init__(
+        self,
+        monitor: LoopLagMonitor,
+        threshold: float = 0.1,
+        max_stalls: int = 50,
+        asyncio_debug: bool = False,
+    ):
+        self.monitor = monitor
+        self.threshold = threshold
+        self.asyncio_debug = asyncio_debug
+        self.stalls: deque[dict] = deque(maxlen=max_stalls)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._loop_thread_id: Optional[int] = None
+        self._handler: Optional[SlowCallbackHandler] = None
+
+    async def start(self, *_: list, **__: dict):
+        self._loop_thread_id = threading.get_ident()
+        if self.asyncio_debug:
+            loop = asyncio.get_running_loop()
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.threshold
+            self._handler = SlowCallbackHandler(self)
+            logging.getLogger("asyncio").addHandler(self._handler)
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self.run, name="loop-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self, *_: list, **__: dict):
+        self._stopped.set()
+        if self._handler:
+            logging.getLogger("asyncio").removeHandler(self._handler)
+            self._handler = None
+        if self._thread:
+            self._thread.join(timeout=1)
+
+    def record(self, kind: str, lag: Optional[float], stack: list[str]) -> None:
+        with self._lock:
+            self.stalls.append(
+                {
+                    "kind": kind,
+                    "lag": lag,
+                    "detected_at": datetime.now(timezone.utc).isoformat(),
+                    "stack": stack,
+                }
+            )
+
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            return list(self.stalls)
+
+    def run(self):
+        reported = None
+        check_interval = min(self.threshold / 2, self.monitor.interval)
+        while not self._stopped.wait(check_interval):
+            heartbeat = self.monitor.heartbeat
+            if heartbeat is None or heartbeat == reported:
+                continue
+            lag = time.monotonic() - heartbeat - self.monitor.interval
+            if lag < self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            reported = heartbeat
+            self.record("stall", lag, traceback.format_stack(frame))
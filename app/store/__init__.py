@@ -10,12 +10,24 @@ class Store:
     def __init__(self, app: "Application"):
         from app.store.bot.manager import BotManager
         from app.store.admin.accessor import AdminAccessor
+        from app.store.dedup.accessor import DedupAccessor
+        from app.store.game.accessor import GameAccessor
+        from app.store.jobs.accessor import JobsAccessor
+        from app.store.scores.accessor import ScoresAccessor
         from app.store.words.accessor import WordsAccessor
+        from app.store.writes.accessor import WritesAccessor
+        from app.store.storage import create_storage
         from app.store.vk_api.accessor import VkApiAccessor
 
+        self.storage = create_storage(app)
+        self.writes = WritesAccessor(app)
         self.words = WordsAccessor(app)
         self.admins = AdminAccessor(app)
         self.vk_api = VkApiAccessor(app)
+        self.scores = ScoresAccessor(app)
+        self.games = GameAccessor(app)
+        self.dedup = DedupAccessor(app)
+        self.jobs = JobsAccessor(app)
         self.bots_manager = BotManager(app)
 
 
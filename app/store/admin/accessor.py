@@ -3,35 +3,31 @@ import typing
 from hashlib import sha256
 from typing import Optional
 
-from sqlalchemy import select, insert
 from sqlalchemy.exc import IntegrityError
 
 from app.admin.models import AdminModel
 from app.base.base_accessor import BaseAccessor
+from app.tracing.tracer import KIND_CLIENT, traced
 
 if typing.TYPE_CHECKING:
+    from app.store.storage.base import Storage
     from app.web.app import Application
 
 
 class AdminAccessor(BaseAccessor):
+    @property
+    def storage(self) -> "Storage":
+        return self.app.store.storage
+
+    @traced("admins.get_by_email", KIND_CLIENT)
     async def get_by_email(self, email: str) -> Optional[AdminModel]:
-        query = select(AdminModel).where(AdminModel.email == email)
-        async with self.app.database.session() as session:
-            answer = await session.execute(query)
-            res = answer.first()
-            if res:
-                return res[0]
-            return
+        return await self.storage.get_admin_by_email(email)
 
+    @traced("admins.create_admin", KIND_CLIENT)
     async def create_admin(self, email: str, password: str) -> AdminModel:
-        admin = AdminModel(
-            email=email,
-            password=str(sha256(password.encode("utf-8")).hexdigest()),
+        return await self.storage.insert_admin(
+            email, str(sha256(password.encode("utf-8")).hexdigest())
         )
-        async with self.app.database.session() as session:
-            session.add(admin)
-            await session.commit()
-        return admin
 
     async def connect(self, app: "Application"):
         # while not app.database.session:
@@ -1,40 +1,271 @@
 import typing
 from logging import getLogger
+from time import perf_counter
+from typing import Optional
 
+from app.metrics.metrics import BOT_HANDLE_UPDATE_SECONDS
+from app.store.bot.messages import get_catalog
+from app.store.bot.ratelimit import UpdateRateLimiter
+from app.store.bot.router import (
+    COMMAND_PREFIX,
+    Argument,
+    ArgumentError,
+    CommandRouter,
+)
+from app.store.game.accessor import next_letter
+from app.store.game.dataclasses import GameState
 from app.store.vk_api.dataclasses import Message, Update
+from app.tracing.tracer import TRACER
+from app.words.normalize import normalize
 
 if typing.TYPE_CHECKING:
     from app.web.app import Application
 
+MIN_PLAYERS = 2
+POINTS_PER_WORD = 1
+MAX_LEADERBOARD_LIMIT = 50
+
+router = CommandRouter()
+
+
+def leaderboard_limit(value: str) -> int:
+    limit = int(value)
+    if not 1 <= limit <= MAX_LEADERBOARD_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_LEADERBOARD_LIMIT}")
+    return limit
+
 
 class BotManager:
     def __init__(self, app: "Application"):
         self.app = app
         self.bot = None
         self.logger = getLogger("handler")
+        self.messages = get_catalog(app.config.bot.locale)
+        self.rate_limiter: Optional[UpdateRateLimiter] = None
+        config = app.config.rate_limit
+        if config.enabled:
+            self.rate_limiter = UpdateRateLimiter(
+                user_rate=config.user_rate,
+                user_burst=config.user_burst,
+                peer_rate=config.peer_rate,
+                peer_burst=config.peer_burst,
+                policy=config.policy,
+            )
 
     async def handle_updates(self, updates: list[Update]):
+        # the poller task lives for the whole process, so like a request
+        # the dedup claim and every update get their own read-your-writes
+        # scope
+        with self.app.database.scope():
+            if updates:
+                updates = await self.app.store.dedup.filter(updates)
+        if self.rate_limiter is not None:
+            updates = self.rate_limiter.filter(updates)
         if updates:
             for update in updates:
-                if update.object.body.lower() == "старт":
-                    players = await self.app.store.vk_api.get_players(
-                        peer_id=update.object.peer_id
-                    )
-                    print(players)
-                    active_players = tuple(
-                        filter(lambda x: x.online > 0, players)
-                    )
-                    if len(active_players) < 2:
-                        await self.app.store.vk_api.send_message(
-                            Message(
-                                peer_id=update.object.peer_id,
-                                text="Для старта игры необходимо 2 и более игроков онлайн",
-                            )
-                        )
-                else:
-                    await self.app.store.vk_api.send_message(
-                        Message(
-                            peer_id=update.object.peer_id,
-                            text=f"И тебе {update.object.body}",
-                        )
+                started = perf_counter()
+                with self.app.database.scope():
+                    if TRACER.should_sample():
+                        with TRACER.start_trace(
+                            f"bot {update.type}",
+                            attributes={"vk.peer_id": update.object.peer_id},
+                        ):
+                            await self.handle_update(update)
+                    else:
+                        await self.handle_update(update)
+                BOT_HANDLE_UPDATE_SECONDS.labels(update.type).observe(
+                    perf_counter() - started
+                )
+
+    async def handle_update(self, update: Update):
+        if update.object.payload:
+            command = router.by_name(update.object.payload.get("command"))
+            if command is not None:
+                await command.handler(self, update)
+                return
+        text = update.object.body.lstrip()
+        explicit = text.startswith(COMMAND_PREFIX)
+        if explicit:
+            text = text[len(COMMAND_PREFIX) :]
+        game = self.app.store.games.get_active(update.object.peer_id)
+        # during a game words like «стоп» or «пропуск» are moves, text
+        # commands then need the prefix
+        if explicit or game is None:
+            try:
+                match = router.match(text)
+            except ArgumentError as e:
+                match = None
+                if explicit:
+                    await self.send(
+                        update.object.peer_id,
+                        self.messages.render("usage", usage=e.command.usage),
                     )
+                    return
+            if match is not None:
+                await match.command.handler(self, update, **match.args)
+                return
+        if game is not None:
+            await self.handle_move(update, game)
+        else:
+            await self.send(
+                update.object.peer_id,
+                self.messages.render("echo", text=update.object.body),
+            )
+
+    @router.command("start", "старт", "начать")
+    async def on_start(self, update: Update):
+        await self.start_game(update.object.peer_id)
+
+    @router.command("stop", "стоп")
+    async def on_stop(self, update: Update):
+        await self.stop_game(update.object.peer_id)
+
+    @router.command(
+        "top",
+        "топ",
+        "счёт",
+        "счет",
+        args=[Argument("limit", leaderboard_limit)],
+        usage="топ [количество]",
+    )
+    async def on_top(self, update: Update, limit: Optional[int] = None):
+        await self.send_leaderboard(update.object.peer_id, limit)
+
+    @router.command("rules", "правила")
+    async def on_rules(self, update: Update):
+        await self.send(update.object.peer_id, self.messages.render("rules"))
+
+    @router.command("skip", "пропуск")
+    async def on_skip(self, update: Update):
+        peer_id = update.object.peer_id
+        game = self.app.store.games.get_active(peer_id)
+        if game is None or game.current_user_id != update.object.user_id:
+            return
+        game = self.app.store.games.skip_turn(peer_id)
+        await self.send(
+            peer_id,
+            self.messages.render(
+                "turn",
+                name=game.current_name,
+                letter=next_letter(game.last_word),
+            ),
+        )
+
+    async def send(self, peer_id: int, text: str, keyboard: str = None):
+        await self.app.store.vk_api.send_message(
+            Message(peer_id=peer_id, text=text, keyboard=keyboard)
+        )
+
+    async def start_game(self, peer_id: int):
+        if self.app.store.games.get_active(peer_id):
+            await self.send(peer_id, self.messages.render("game_running"))
+            return
+        players = await self.app.store.vk_api.get_players(peer_id=peer_id)
+        active_players = tuple(filter(lambda x: x.online > 0, players))
+        if len(active_players) < MIN_PLAYERS:
+            await self.send(
+                peer_id,
+                self.messages.render(
+                    "not_enough_players", min_players=MIN_PLAYERS
+                ),
+                keyboard=self.messages.keyboard("start"),
+            )
+            return
+        word = await self.app.store.words.get_random_word()
+        if word is None:
+            await self.send(peer_id, self.messages.render("no_words"))
+            return
+        # the game compares canonical forms, players see the display title
+        first_word = normalize(word.title)
+        game = self.app.store.games.start_game(
+            peer_id, active_players, first_word, word.id
+        )
+        await self.send(
+            peer_id,
+            self.messages.render("game_started", word=word.title)
+            + "\n"
+            + self.messages.render(
+                "turn",
+                name=game.current_name,
+                letter=next_letter(first_word),
+            ),
+            keyboard=self.messages.keyboard("game"),
+        )
+
+    async def stop_game(self, peer_id: int):
+        game = self.app.store.games.stop_game(peer_id)
+        if game is None:
+            return
+        await self.send(
+            peer_id,
+            self.messages.render("game_stopped"),
+            keyboard=self.messages.keyboard("start"),
+        )
+
+    async def handle_move(self, update: Update, game: GameState):
+        peer_id = update.object.peer_id
+        if update.object.user_id != game.current_user_id:
+            return
+        word = normalize(update.object.body)
+        letter = next_letter(game.last_word)
+        if not word.startswith(letter):
+            await self.send(
+                peer_id, self.messages.render("wrong_letter", letter=letter)
+            )
+            return
+        index = await self.app.store.words.get_index()
+        position = index.find(word)
+        if position is None:
+            word_id, title = None, update.object.body.strip()
+        else:
+            word_id, title = index.ids[position], index.title(position)
+        if game.used_words.contains(word_id, word):
+            await self.send(
+                peer_id, self.messages.render("word_used", word=title)
+            )
+            return
+        if position is None or not index.is_correct(position):
+            text = self.messages.render("unknown_word", word=title)
+            suggestions = await self.app.store.words.suggest(
+                word, first_letter=letter, exclude=game.used_words
+            )
+            if suggestions:
+                text += "\n" + self.messages.render(
+                    "suggestions",
+                    words=", ".join(title for title, _ in suggestions),
+                )
+            await self.send(peer_id, text)
+            return
+
+        # the index lookup awaited, the game may have changed meanwhile
+        if self.app.store.games.get_active(peer_id) is not game:
+            return
+        game = self.app.store.games.make_move(
+            peer_id, word, POINTS_PER_WORD, word_id
+        )
+        self.app.store.scores.add_points(
+            peer_id, update.object.user_id, POINTS_PER_WORD
+        )
+        await self.send(
+            peer_id,
+            self.messages.render(
+                "word_accepted", word=title, points=POINTS_PER_WORD
+            )
+            + "\n"
+            + self.messages.render(
+                "turn", name=game.current_name, letter=next_letter(word)
+            ),
+        )
+
+    async def send_leaderboard(self, peer_id: int, limit: Optional[int] = None):
+        top = await self.app.store.scores.top_chat(
+            peer_id, limit or self.app.config.scores.leaderboard_limit
+        )
+        mention = self.messages.templates["mention"]
+        await self.send(
+            peer_id,
+            self.messages.scoreboard(
+                (mention.render(user_id=user_id), score)
+                for user_id, score, _ in top
+            ),
+        )
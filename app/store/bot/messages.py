@@ -0,0 +1,161 @@
+import json
+from string import Formatter
+from typing import Iterable, Optional
+
+MESSAGES = {
+    "ru": {
+        "echo": "И тебе {text}",
+        "not_enough_players": (
+            "Для старта игры необходимо {min_players} и более игроков онлайн"
+        ),
+        "game_started": "Игра началась! Первое слово: {word}",
+        "game_running": "Игра уже идёт",
+        "game_stopped": "Игра остановлена",
+        "no_words": "В словаре нет слов для начала игры",
+        "unknown_word": "Слова «{word}» нет в словаре",
+        "suggestions": "Может быть, вы имели в виду: {words}",
+        "turn": "{name}, твой ход. Слово на букву «{letter}»",
+        "word_accepted": "Слово «{word}» принято, +{points}",
+        "word_used": "Слово «{word}» уже было в этой игре",
+        "wrong_letter": "Слово должно начинаться на букву «{letter}»",
+        "vote": "Существует ли слово «{word}»? Голосование {seconds} сек.",
+        "timeout": "{name} не успел назвать слово и выбывает",
+        "game_over": "Игра окончена! Победитель: {name}",
+        "scoreboard_title": "Счёт:",
+        "scoreboard_line": "{place}. {name} — {score}",
+        "scoreboard_empty": "Пока никто не набрал очков",
+        "mention": "@id{user_id}",
+        "rules": (
+            "Называйте по очереди слова на последнюю букву предыдущего "
+            "слова. Слова не должны повторяться, за каждое принятое слово "
+            "начисляются очки. Команды: старт, стоп, топ, пропуск, правила. "
+            "Во время игры команды пишутся через «/», например /пропуск"
+        ),
+        "usage": "Использование: {usage}",
+    },
+}
+
+BUTTONS = {
+    "ru": {
+        "start": "Старт",
+        "stop": "Стоп",
+        "top": "Счёт",
+        "yes": "Да",
+        "no": "Нет",
+    },
+}
+
+KEYBOARDS = {
+    "start": {
+        "one_time": False,
+        "rows": [[("start", "positive")]],
+    },
+    "game": {
+        "one_time": False,
+        "rows": [[("top", "primary"), ("stop", "negative")]],
+    },
+    "vote": {
+        "inline": True,
+        "rows": [[("yes", "positive"), ("no", "negative")]],
+    },
+}
+
+
+class Template:
+    __slots__ = ("source", "_parts", "_fields", "_static")
+
+    def __init__(self, source: str):
+        self.source = source
+        parts = []
+        fields = []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if literal:
+                parts.append(literal)
+            if field is not None:
+                if spec or conversion:
+                    raise ValueError(f"unsupported field in {source!r}")
+                fields.append((len(parts), field))
+                parts.append("")
+        self._parts = parts
+        self._fields = tuple(fields)
+        self._static = source.replace("{{", "{").replace("}}", "}")
+
+    def render(self, **values) -> str:
+        if not self._fields:
+            return self._static
+        parts = self._parts.copy()
+        for position, field in self._fields:
+            parts[position] = str(values[field])
+        return "".join(parts)
+
+
+def build_keyboard(name: str, labels: dict[str, str]) -> str:
+    keyboard = KEYBOARDS[name]
+    return json.dumps(
+        {
+            "one_time": keyboard.get("one_time", False),
+            "inline": keyboard.get("inline", False),
+            "buttons": [
+                [
+                    {
+                        "action": {
+                            "type": "text",
+                            "label": labels[command],
+                            "payload": json.dumps(
+                                {"command": command}, separators=(",", ":")
+                            ),
+                        },
+                        "color": color,
+                    }
+                    for command, color in row
+                ]
+                for row in keyboard["rows"]
+            ],
+        },
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+class MessageCatalog:
+    def __init__(self, locale: str = "ru"):
+        self.locale = locale
+        self.templates = {
+            key: Template(source) for key, source in MESSAGES[locale].items()
+        }
+        self.keyboards = {
+            name: build_keyboard(name, BUTTONS[locale]) for name in KEYBOARDS
+        }
+        self._line = self.templates["scoreboard_line"]
+        self._buffer: list[str] = []
+
+    def render(self, key: str, **values) -> str:
+        return self.templates[key].render(**values)
+
+    def keyboard(self, name: str) -> str:
+        return self.keyboards[name]
+
+    def scoreboard(self, scores: Iterable[tuple[str, int]]) -> str:
+        buffer = self._buffer
+        buffer.clear()
+        buffer.append(self.templates["scoreboard_title"].render())
+        for place, (name, score) in enumerate(scores, 1):
+            buffer.append(
+                self._line.render(place=place, name=name, score=score)
+            )
+        if len(buffer) == 1:
+            return self.templates["scoreboard_empty"].render()
+        text = "\n".join(buffer)
+        buffer.clear()
+        return text
+
+
+_catalogs: dict[str, MessageCatalog] = {}
+
+
+def get_catalog(locale: Optional[str] = None) -> MessageCatalog:
+    locale = locale or "ru"
+    catalog = _catalogs.get(locale)
+    if catalog is None:
+        catalog = _catalogs[locale] = MessageCatalog(locale)
+    return catalog
@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Hashable, Optional
+
+from app.metrics.metrics import BOT_UPDATES_LIMITED
+from app.store.vk_api.dataclasses import Update
+
+POLICY_DROP = "drop"
+POLICY_MERGE = "merge"
+
+
+class TokenBuckets:
+    """Token buckets kept in least recently used order.
+
+    A bucket idle long enough to refill completely is the same as a missing
+    one, so such buckets are dropped from the old end while new keys arrive.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.idle_ttl = burst / rate
+        self._buckets: OrderedDict[Hashable, list[float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+    def tokens(self, key: Hashable, now: float) -> float:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return self.burst
+        return min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+
+    def take(self, key: Hashable, now: float, tokens: float) -> None:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._buckets[key] = [tokens - 1, now]
+        else:
+            bucket[0] = tokens - 1
+            bucket[1] = now
+            self._buckets.move_to_end(key)
+        self._expire(now)
+
+    def _expire(self, now: float) -> None:
+        buckets = self._buckets
+        # at most one extra eviction per call keeps the cost amortized O(1)
+        for _ in range(2):
+            key = next(iter(buckets), None)
+            if key is None or now - buckets[key][1] < self.idle_ttl:
+                return
+            del buckets[key]
+
+
+class UpdateRateLimiter:
+    def __init__(
+        self,
+        user_rate: float,
+        user_burst: float,
+        peer_rate: float,
+        peer_burst: float,
+        policy: str = POLICY_DROP,
+    ):
+        if policy not in (POLICY_DROP, POLICY_MERGE):
+            raise ValueError(f"unknown rate limit policy {policy!r}")
+        self.users = TokenBuckets(user_rate, user_burst)
+        self.peers = TokenBuckets(peer_rate, peer_burst)
+        self.policy = policy
+        self.deferred: dict[tuple[int, int], Update] = {}
+        self._dropped = BOT_UPDATES_LIMITED.labels("dropped")
+        self._merged = BOT_UPDATES_LIMITED.labels("merged")
+
+    def clear(self) -> None:
+        self.users.clear()
+        self.peers.clear()
+        self.deferred.clear()
+
+    def allow(self, peer_id: int, user_id: int, now: float) -> bool:
+        user_tokens = self.users.tokens(user_id, now)
+        peer_tokens = self.peers.tokens(peer_id, now)
+        if user_tokens < 1 or peer_tokens < 1:
+            return False
+        self.users.take(user_id, now, user_tokens)
+        self.peers.take(peer_id, now, peer_tokens)
+        return True
+
+    def filter(
+        self, updates: list[Update], now: Optional[float] = None
+    ) -> list[Update]:
+        if now is None:
+            now = monotonic()
+        allowed = []
+        if self.deferred:
+            for key, update in list(self.deferred.items()):
+                if self.allow(*key, now):
+                    del self.deferred[key]
+                    allowed.append(update)
+        for update in updates:
+            key = (update.object.peer_id, update.object.user_id)
+            if key not in self.deferred and self.allow(*key, now):
+                allowed.append(update)
+            elif self.policy == POLICY_MERGE:
+                # only the latest message of a flooding user is answered
+                if key in self.deferred:
+                    self._merged.inc()
+                self.deferred[key] = update
+            else:
+                self._dropped.inc()
+        return allowed
@@ -0,0 +1,119 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, Sequence
+
+TERMINAL = ""
+# marks text as a command even when it could be a move
+COMMAND_PREFIX = "/"
+
+
+class ArgumentError(ValueError):
+    def __init__(self, command: "Command", message: str):
+        super().__init__(message)
+        self.command = command
+
+
+@dataclass(frozen=True)
+class Argument:
+    name: str
+    convert: Callable[[str], Any] = str
+    default: Any = None
+
+
+@dataclass
+class Command:
+    name: str
+    handler: Callable
+    aliases: tuple[str, ...] = ()
+    args: tuple[Argument, ...] = ()
+    usage: str = ""
+
+    def parse(self, text: str) -> dict[str, Any]:
+        values = text.split()
+        if len(values) > len(self.args):
+            raise ArgumentError(
+                self, f"{self.name} takes {len(self.args)} arguments"
+            )
+        parsed = {}
+        for i, argument in enumerate(self.args):
+            if i < len(values):
+                try:
+                    parsed[argument.name] = argument.convert(values[i])
+                except ValueError as e:
+                    raise ArgumentError(self, str(e)) from e
+            else:
+                parsed[argument.name] = argument.default
+        return parsed
+
+
+@dataclass
+class Match:
+    command: Command
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+class CommandRouter:
+    """Commands and aliases are kept in a character trie.
+
+    Free text usually leaves the trie on its first character, so telling
+    moves apart from commands costs a single dict lookup.
+    """
+
+    def __init__(self):
+        self.commands: dict[str, Command] = {}
+        self._trie: dict = {}
+
+    def command(
+        self,
+        name: str,
+        *aliases: str,
+        args: Sequence[Argument] = (),
+        usage: str = "",
+    ):
+        def decorator(handler: Callable) -> Callable:
+            self.add(
+                Command(
+                    name=name,
+                    handler=handler,
+                    aliases=aliases,
+                    args=tuple(args),
+                    usage=usage or name,
+                )
+            )
+            return handler
+
+        return decorator
+
+    def add(self, command: Command) -> None:
+        if command.name in self.commands:
+            raise ValueError(f"command {command.name} is already registered")
+        self.commands[command.name] = command
+        for word in (command.name, *command.aliases):
+            node = self._trie
+            for char in word.lower():
+                node = node.setdefault(char, {})
+            if TERMINAL in node:
+                raise ValueError(f"{word} is already registered")
+            node[TERMINAL] = command
+
+    def find(self, text: str) -> Optional[tuple[Command, str]]:
+        node = self._trie
+        found = None
+        for i, char in enumerate(text):
+            if char.isspace() and TERMINAL in node:
+                found = node[TERMINAL], text[i + 1 :]
+            node = node.get(char.lower())
+            if node is None:
+                return found
+        if TERMINAL in node:
+            return node[TERMINAL], ""
+        return found
+
+    def match(self, text: str) -> Optional[Match]:
+        found = self.find(text.lstrip())
+        if found is None:
+            return None
+        command, rest = found
+        return Match(command, command.parse(rest))
+
+    def by_name(self, name: str) -> Optional[Command]:
+        return self.commands.get(name)
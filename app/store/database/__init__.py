@@ -1,2 +1,5 @@
 from app.admin.models import *
 from app.words.models import *
+from app.game.models import *
+from app.bot.models import *
+from app.jobs.models import *
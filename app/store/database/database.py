@@ -1,5 +1,11 @@
-from typing import Optional, TYPE_CHECKING
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import count
+from logging import getLogger
+from typing import Awaitable, Callable, Iterator, Optional, TYPE_CHECKING
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -12,6 +18,74 @@ from app.store.database.sqlalchemy_base import db
 if TYPE_CHECKING:
     from app.web.app import Application
 
+_wrote: ContextVar[bool] = ContextVar("database_wrote", default=False)
+
+
+LISTEN_RETRY = 5.0
+
+
+class Listener:
+    """LISTEN on one channel over a dedicated connection, reconnecting.
+
+    on_connect runs after every (re)connect, so the caller can catch up on
+    notifications sent while it was not listening.
+    """
+
+    def __init__(
+        self,
+        database: "Database",
+        channel: str,
+        on_notify: Callable[[str], None],
+        on_connect: Callable[[], Awaitable[None]],
+    ):
+        self.database = database
+        self.channel = channel
+        self.on_notify = on_notify
+        self.on_connect = on_connect
+        self.connected = False
+        self._task: Optional[asyncio.Task] = None
+        self.logger = getLogger("database")
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.wait({self._task})
+            self._task = None
+
+    def _notify(self, _connection, _pid, _channel, payload: str) -> None:
+        self.on_notify(payload)
+
+    async def _run(self):
+        while True:
+            lost = asyncio.Event()
+            try:
+                async with self.database._engine.connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    driver = raw.driver_connection
+                    driver.add_termination_listener(lambda _: lost.set())
+                    await driver.add_listener(self.channel, self._notify)
+                    self.connected = True
+                    await self.on_connect()
+                    await lost.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(
+                    "listen on %s failed", self.channel, exc_info=e
+                )
+            finally:
+                self.connected = False
+            await asyncio.sleep(LISTEN_RETRY)
+
+
+def async_dsn(dsn: str) -> str:
+    if dsn.startswith("postgresql://"):
+        return "postgresql+asyncpg://" + dsn[len("postgresql://") :]
+    return dsn
+
 
 class Database:
     def __init__(self, app: "Application"):
@@ -19,6 +93,9 @@ class Database:
         self._engine: Optional[AsyncEngine] = None
         self._db: Optional[declarative_base] = None
         self.session: Optional[sessionmaker] = None
+        self._replica_engines: list[AsyncEngine] = []
+        self._replica_sessions: list[sessionmaker] = []
+        self._next_replica = count()
 
     async def connect(self, *_: list, **__: dict) -> None:
         user = self.app.config.database.user
@@ -31,15 +108,73 @@ class Database:
         )
         self._db = db
         self._engine = create_async_engine(DATABASE_URL, echo=True, future=True)
+        event.listen(
+            self._engine.sync_engine,
+            "after_cursor_execute",
+            self._after_execute,
+        )
         self.session = sessionmaker(
             bind=self._engine, expire_on_commit=False, class_=AsyncSession
         )
+        for dsn in self.app.config.database.replicas:
+            engine = create_async_engine(async_dsn(dsn), future=True)
+            self._replica_engines.append(engine)
+            self._replica_sessions.append(
+                sessionmaker(
+                    bind=engine, expire_on_commit=False, class_=AsyncSession
+                )
+            )
 
     async def disconnect(self, *_: list, **__: dict) -> None:
+        for engine in (self._engine, *self._replica_engines):
+            try:
+                await engine.dispose()
+            except Exception:
+                pass
+        self._replica_engines = []
+        self._replica_sessions = []
+
+    @staticmethod
+    def _after_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        if context is not None and (
+            context.isinsert or context.isupdate or context.isdelete
+        ):
+            _wrote.set(True)
+
+    def listen(
+        self,
+        channel: str,
+        on_notify: Callable[[str], None],
+        on_connect: Callable[[], Awaitable[None]],
+    ) -> Listener:
+        listener = Listener(self, channel, on_notify, on_connect)
+        listener.start()
+        return listener
+
+    def mark_written(self) -> None:
+        _wrote.set(True)
+
+    @property
+    def wrote(self) -> bool:
+        return _wrote.get()
+
+    @contextmanager
+    def scope(self) -> Iterator[None]:
+        # a keep-alive connection serves requests from one task, so the
+        # flag has to be reset explicitly for every request
+        token = _wrote.set(False)
         try:
-            await self._engine.dispose()
-        except Exception:
-            pass
+            yield
+        finally:
+            _wrote.reset(token)
+
+    def read_session(self, primary: bool = False) -> AsyncSession:
+        if primary or not self._replica_sessions or _wrote.get():
+            return self.session()
+        replica = next(self._next_replica) % len(self._replica_sessions)
+        return self._replica_sessions[replica]()
 
 
 def setup_database(app: "Application"):
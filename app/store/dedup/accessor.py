@@ -0,0 +1,104 @@
+import typing
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from time import monotonic
+from typing import Optional
+
+from app.base.base_accessor import BaseAccessor
+from app.metrics.metrics import BOT_DUPLICATE_UPDATES, observe_query
+from app.store.storage.base import UpdateKey
+from app.store.vk_api.dataclasses import Update
+from app.tracing.tracer import KIND_CLIENT, traced
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+
+class DedupWindow:
+    def __init__(self, size: int):
+        self.size = size
+        self._keys: OrderedDict[UpdateKey, None] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: UpdateKey) -> bool:
+        return key in self._keys
+
+    def add(self, key: UpdateKey) -> bool:
+        if key in self._keys:
+            return False
+        self._keys[key] = None
+        if len(self._keys) > self.size:
+            self._keys.popitem(last=False)
+        return True
+
+    def clear(self) -> None:
+        self._keys.clear()
+
+
+def update_key(update: Update) -> Optional[UpdateKey]:
+    if update.object.conversation_message_id is None:
+        return None
+    return update.object.peer_id, update.object.conversation_message_id
+
+
+class DedupAccessor(BaseAccessor):
+    def __init__(self, app: "Application", *args, **kwargs):
+        super().__init__(app, *args, **kwargs)
+        self.window = DedupWindow(app.config.dedup.window)
+        self._cleaned_at = monotonic()
+
+    def clear(self) -> None:
+        self.window.clear()
+
+    async def filter(self, updates: list[Update]) -> list[Update]:
+        fresh: list[tuple[Optional[UpdateKey], Update]] = []
+        for update in updates:
+            key = update_key(update)
+            if key is None:
+                fresh.append((key, update))
+            elif self.window.add(key):
+                fresh.append((key, update))
+            else:
+                BOT_DUPLICATE_UPDATES.inc()
+
+        if self.app.config.dedup.shared:
+            keys = [key for key, _ in fresh if key is not None]
+            if keys:
+                claimed = await self._claim(keys)
+                if claimed is not None:
+                    duplicates = len(keys) - len(claimed)
+                    if duplicates:
+                        BOT_DUPLICATE_UPDATES.inc(duplicates)
+                    fresh = [
+                        (key, update)
+                        for key, update in fresh
+                        if key is None or key in claimed
+                    ]
+        return [update for _, update in fresh]
+
+    async def _claim(self, keys: list[UpdateKey]) -> Optional[set[UpdateKey]]:
+        try:
+            claimed = await self.claim(keys)
+            if monotonic() - self._cleaned_at > self.app.config.dedup.retention:
+                self._cleaned_at = monotonic()
+                await self.cleanup()
+        except Exception as e:
+            # a duplicate reply is better than a lost one
+            self.logger.error("shared dedup failed", exc_info=e)
+            return None
+        return claimed
+
+    @observe_query("claim_updates")
+    @traced("dedup.claim_updates", KIND_CLIENT)
+    async def claim(self, keys: list[UpdateKey]) -> set[UpdateKey]:
+        return await self.app.store.storage.claim_updates(keys)
+
+    @observe_query("cleanup_updates")
+    @traced("dedup.cleanup_updates", KIND_CLIENT)
+    async def cleanup(self) -> None:
+        await self.app.store.storage.cleanup_updates(
+            datetime.now(timezone.utc)
+            - timedelta(seconds=self.app.config.dedup.retention)
+        )
@@ -0,0 +1,156 @@
+import time
+import typing
+from dataclasses import replace
+from typing import Optional, Sequence
+
+from app.base.base_accessor import BaseAccessor
+from app.store.game.dataclasses import (
+    GAME_ACTIVE,
+    GAME_FINISHED,
+    GAME_STOPPED,
+    GameState,
+)
+from app.store.game.used_words import UsedWords
+from app.store.vk_api.dataclasses import Player
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+SKIPPED_LAST_LETTERS = frozenset("ьъы")
+
+
+def next_letter(word: str) -> str:
+    for letter in reversed(word):
+        if letter not in SKIPPED_LAST_LETTERS:
+            return letter
+    return word[-1]
+
+
+class GameError(Exception):
+    pass
+
+
+class GameAccessor(BaseAccessor):
+    """Game states are frozen, every change stores a new object.
+
+    Readers work on a snapshot of references taken without awaiting, so they
+    never block the update handlers and never see a half-applied move.
+    """
+
+    def __init__(self, app: "Application", *args, **kwargs):
+        super().__init__(app, *args, **kwargs)
+        self._games: dict[int, GameState] = {}
+        self.version = 0
+        self._snapshot: tuple[GameState, ...] = ()
+        self._snapshot_version = 0
+
+    def _store(self, game: GameState) -> GameState:
+        self._games[game.peer_id] = game
+        self.version += 1
+        return game
+
+    def clear(self) -> None:
+        self._games = {}
+        self.version += 1
+
+    def get(self, peer_id: int) -> Optional[GameState]:
+        return self._games.get(peer_id)
+
+    def get_active(self, peer_id: int) -> Optional[GameState]:
+        game = self._games.get(peer_id)
+        if game is None or game.status != GAME_ACTIVE:
+            return None
+        return game
+
+    def start_game(
+        self,
+        peer_id: int,
+        players: Sequence[Player],
+        first_word: str,
+        first_word_id: Optional[int] = None,
+    ) -> GameState:
+        if self.get_active(peer_id) is not None:
+            raise GameError(f"game in {peer_id} is already running")
+        now = time.time()
+        return self._store(
+            GameState(
+                peer_id=peer_id,
+                players=tuple(player.user_id for player in players),
+                names=tuple(player.name for player in players),
+                started_at=now,
+                updated_at=now,
+                last_word=first_word,
+                used_words=UsedWords().add_word(first_word_id, first_word),
+                points=(0,) * len(players),
+            )
+        )
+
+    def make_move(
+        self,
+        peer_id: int,
+        word: str,
+        points: int,
+        word_id: Optional[int] = None,
+    ) -> GameState:
+        game = self.get_active(peer_id)
+        if game is None:
+            raise GameError(f"no game in {peer_id}")
+        scores = list(game.points)
+        scores[game.turn] += points
+        return self._store(
+            replace(
+                game,
+                turn=(game.turn + 1) % len(game.players),
+                last_word=word,
+                used_words=game.used_words.add_word(word_id, word),
+                points=tuple(scores),
+                moves=game.moves + 1,
+                updated_at=time.time(),
+            )
+        )
+
+    def skip_turn(self, peer_id: int) -> GameState:
+        game = self.get_active(peer_id)
+        if game is None:
+            raise GameError(f"no game in {peer_id}")
+        return self._store(
+            replace(
+                game,
+                turn=(game.turn + 1) % len(game.players),
+                updated_at=time.time(),
+            )
+        )
+
+    def stop_game(
+        self, peer_id: int, status: str = GAME_STOPPED
+    ) -> Optional[GameState]:
+        game = self.get_active(peer_id)
+        if game is None:
+            return None
+        return self._store(replace(game, status=status, updated_at=time.time()))
+
+    def finish_game(self, peer_id: int) -> Optional[GameState]:
+        return self.stop_game(peer_id, status=GAME_FINISHED)
+
+    def snapshot(self) -> tuple[GameState, ...]:
+        if self._snapshot_version != self.version:
+            self._snapshot = tuple(
+                sorted(self._games.values(), key=lambda game: game.peer_id)
+            )
+            self._snapshot_version = self.version
+        return self._snapshot
+
+    def list_games(
+        self,
+        status: Optional[str] = None,
+        peer_id: Optional[int] = None,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> tuple[int, list[GameState]]:
+        games = self.snapshot()
+        if peer_id is not None:
+            game = self._games.get(peer_id)
+            games = () if game is None else (game,)
+        if status is not None:
+            games = [game for game in games if game.status == status]
+        return len(games), list(games[offset : offset + limit])
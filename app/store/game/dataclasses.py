@@ -0,0 +1,32 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.store.game.used_words import UsedWords
+
+GAME_ACTIVE = "active"
+GAME_FINISHED = "finished"
+GAME_STOPPED = "stopped"
+GAME_STATUSES = (GAME_ACTIVE, GAME_FINISHED, GAME_STOPPED)
+
+
+@dataclass(frozen=True)
+class GameState:
+    peer_id: int
+    players: tuple[int, ...]
+    names: tuple[str, ...]
+    started_at: float
+    updated_at: float
+    status: str = GAME_ACTIVE
+    turn: int = 0
+    last_word: Optional[str] = None
+    used_words: UsedWords = field(default_factory=UsedWords)
+    points: tuple[int, ...] = ()
+    moves: int = 0
+
+    @property
+    def current_user_id(self) -> int:
+        return self.players[self.turn]
+
+    @property
+    def current_name(self) -> str:
+        return self.names[self.turn]
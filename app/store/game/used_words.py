@@ -0,0 +1,161 @@
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator, Optional, Union
+
+ARRAY_LIMIT = 4096
+CHUNK_BITS = 16
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+BITMAP_BYTES = (1 << CHUNK_BITS) // 8
+
+Chunk = Union[array, bytes]
+
+
+def _chunk_contains(chunk: Chunk, low: int) -> bool:
+    if isinstance(chunk, bytes):
+        return bool(chunk[low >> 3] & (1 << (low & 7)))
+    i = bisect_left(chunk, low)
+    return i < len(chunk) and chunk[i] == low
+
+
+def _chunk_add(chunk: Optional[Chunk], low: int) -> Chunk:
+    if chunk is None:
+        return array("H", (low,))
+    if isinstance(chunk, bytes):
+        bitmap = bytearray(chunk)
+        bitmap[low >> 3] |= 1 << (low & 7)
+        return bytes(bitmap)
+    if len(chunk) < ARRAY_LIMIT:
+        i = bisect_left(chunk, low)
+        return chunk[:i] + array("H", (low,)) + chunk[i:]
+    bitmap = bytearray(BITMAP_BYTES)
+    for value in (*chunk, low):
+        bitmap[value >> 3] |= 1 << (value & 7)
+    return bytes(bitmap)
+
+
+def _chunk_values(chunk: Chunk) -> Iterator[int]:
+    if not isinstance(chunk, bytes):
+        yield from chunk
+        return
+    for i, byte in enumerate(chunk):
+        while byte:
+            bit = byte & -byte
+            yield i * 8 + bit.bit_length() - 1
+            byte ^= bit
+
+
+class UsedWords:
+    """Immutable set of the words used in one game.
+
+    Dictionary words are kept by id: up to ARRAY_LIMIT ids live in one sorted
+    array of 4 bytes per word, larger sets are split roaring style into
+    chunks by the high 16 bits of the id, each chunk a sorted array of low
+    bits or, once dense, a bitmap. Adding copies only the touched array, so
+    game states can keep sharing the rest. Words without an id, like ones
+    accepted by a vote, go to a small set of titles.
+    """
+
+    __slots__ = ("_ids", "_chunks", "_size", "extra")
+
+    def __init__(
+        self,
+        ids: Optional[array] = None,
+        chunks: Optional[dict[int, Chunk]] = None,
+        size: int = 0,
+        extra: frozenset[str] = frozenset(),
+    ):
+        self._ids = ids if ids is not None else array("I")
+        self._chunks = chunks
+        self._size = size if chunks is not None else len(self._ids)
+        self.extra = extra
+
+    @classmethod
+    def of(
+        cls, ids: Iterable[int] = (), titles: Iterable[str] = ()
+    ) -> "UsedWords":
+        used = cls(extra=frozenset(titles))
+        for word_id in ids:
+            used = used.add(word_id)
+        return used
+
+    def __len__(self) -> int:
+        return self._size + len(self.extra)
+
+    def __contains__(self, word: Union[int, str]) -> bool:
+        if isinstance(word, str):
+            return word in self.extra
+        return self.contains_id(word)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, UsedWords):
+            return NotImplemented
+        return self.extra == other.extra and list(self.ids()) == list(
+            other.ids()
+        )
+
+    def __hash__(self) -> int:
+        return hash((tuple(self.ids()), self.extra))
+
+    def __repr__(self) -> str:
+        return f"UsedWords(ids={list(self.ids())}, extra={set(self.extra)})"
+
+    def contains_id(self, word_id: int) -> bool:
+        if self._chunks is None:
+            ids = self._ids
+            i = bisect_left(ids, word_id)
+            return i < len(ids) and ids[i] == word_id
+        chunk = self._chunks.get(word_id >> CHUNK_BITS)
+        return chunk is not None and _chunk_contains(
+            chunk, word_id & CHUNK_MASK
+        )
+
+    def contains(self, word_id: Optional[int], title: str) -> bool:
+        if word_id is not None and self.contains_id(word_id):
+            return True
+        return title in self.extra
+
+    def ids(self) -> Iterator[int]:
+        if self._chunks is None:
+            yield from self._ids
+            return
+        for high in sorted(self._chunks):
+            for low in _chunk_values(self._chunks[high]):
+                yield high << CHUNK_BITS | low
+
+    def add(self, word_id: int) -> "UsedWords":
+        if self.contains_id(word_id):
+            return self
+        if self._chunks is None:
+            if len(self._ids) < ARRAY_LIMIT:
+                i = bisect_left(self._ids, word_id)
+                ids = self._ids[:i] + array("I", (word_id,)) + self._ids[i:]
+                return UsedWords(ids=ids, extra=self.extra)
+            chunks: dict[int, Chunk] = {}
+            for value in self._ids:
+                chunks.setdefault(value >> CHUNK_BITS, array("H")).append(
+                    value & CHUNK_MASK
+                )
+        else:
+            chunks = dict(self._chunks)
+        high = word_id >> CHUNK_BITS
+        chunks[high] = _chunk_add(chunks.get(high), word_id & CHUNK_MASK)
+        return UsedWords(chunks=chunks, size=self._size + 1, extra=self.extra)
+
+    def add_word(self, word_id: Optional[int], title: str) -> "UsedWords":
+        if word_id is not None:
+            return self.add(word_id)
+        if title in self.extra:
+            return self
+        return UsedWords(
+            ids=self._ids,
+            chunks=self._chunks,
+            size=self._size,
+            extra=self.extra | {title},
+        )
+
+    def memory_size(self) -> int:
+        size = self._ids.buffer_info()[1] * self._ids.itemsize
+        if self._chunks is not None:
+            for chunk in self._chunks.values():
+                size += len(chunk) * getattr(chunk, "itemsize", 1)
+        return size
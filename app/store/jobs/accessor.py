@@ -0,0 +1,225 @@
+import asyncio
+import typing
+from datetime import datetime, timedelta, timezone
+from time import monotonic
+from typing import Any, Awaitable, Callable, Optional
+
+from app.base.base_accessor import BaseAccessor
+from app.jobs.models import JOB_DONE, JOB_FAILED, JobModel
+from app.metrics.metrics import JOBS_FINISHED, observe_query
+from app.tracing.tracer import KIND_CLIENT, traced
+
+if typing.TYPE_CHECKING:
+    from app.store.storage.base import Storage
+    from app.web.app import Application
+
+JobHandler = Callable[["JobContext"], Awaitable[Optional[dict]]]
+
+
+class JobError(Exception):
+    pass
+
+
+class JobRegistry:
+    def __init__(self):
+        self.handlers: dict[str, JobHandler] = {}
+
+    def job(self, kind: str):
+        def decorator(handler: JobHandler) -> JobHandler:
+            if kind in self.handlers:
+                raise ValueError(f"job {kind} is already registered")
+            self.handlers[kind] = handler
+            return handler
+
+        return decorator
+
+    def get(self, kind: str) -> Optional[JobHandler]:
+        return self.handlers.get(kind)
+
+
+registry = JobRegistry()
+
+
+class JobContext:
+    def __init__(self, accessor: "JobsAccessor", job: JobModel):
+        self.accessor = accessor
+        self.app = accessor.app
+        self.job = job
+        self.params: dict[str, Any] = job.params or {}
+        self.done = 0
+        self.total: Optional[int] = None
+        self._reported_at = 0.0
+
+    async def progress(self, done: int, total: Optional[int] = None) -> None:
+        self.done = done
+        if total is not None:
+            self.total = total
+        # progress is only a hint for pollers, so writes are throttled
+        now = monotonic()
+        if now - self._reported_at < self.app.config.jobs.progress_interval:
+            return
+        self._reported_at = now
+        await self.accessor.set_progress(self.job.id, self.done, self.total)
+
+
+class JobsAccessor(BaseAccessor):
+    def __init__(self, app: "Application", *args, **kwargs):
+        super().__init__(app, *args, **kwargs)
+        from app.store.jobs import handlers  # noqa: F401 registers job kinds
+
+        self._workers: list[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._requeued_at = 0.0
+        app.on_shutdown.append(self.stop)
+
+    @property
+    def storage(self) -> "Storage":
+        return self.app.store.storage
+
+    async def connect(self, app: "Application"):
+        if not app.config.jobs.enabled:
+            return
+        await self._requeue_stale()
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._workers = [
+            asyncio.create_task(self._work())
+            for _ in range(app.config.jobs.workers)
+        ]
+
+    async def stop(self, app: "Application"):
+        if not self._workers:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        _, pending = await asyncio.wait(
+            self._workers, timeout=app.config.jobs.shutdown_timeout
+        )
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+        self._workers = []
+
+    async def _requeue_stale(self) -> None:
+        # shared by all worker tasks, the first one due does the requeue
+        self._requeued_at = monotonic()
+        try:
+            await self.requeue_stale()
+        except Exception as e:
+            self.logger.error("requeue of stale jobs failed", exc_info=e)
+
+    async def _work(self):
+        while not self._stopping:
+            self._wakeup.clear()
+            # a process that died mid job leaves it running, some other
+            # live process has to give it back to the queue
+            interval = self.app.config.jobs.requeue_interval
+            if monotonic() - self._requeued_at >= interval:
+                await self._requeue_stale()
+            try:
+                ran = await self.run_next()
+            except Exception as e:
+                self.logger.error("job worker failed", exc_info=e)
+                ran = False
+            if ran or self._stopping:
+                continue
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), self.app.config.jobs.poll_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_next(self) -> bool:
+        # a worker task lives for the whole process, so like a request every
+        # job gets its own read-your-writes scope, the claim stays outside
+        with self.app.database.scope():
+            job = await self.claim()
+        if job is None:
+            return False
+        with self.app.database.scope():
+            return await self._run(job)
+
+    async def _run(self, job: JobModel) -> bool:
+        context = JobContext(self, job)
+        try:
+            handler = registry.get(job.kind)
+            if handler is None:
+                raise JobError(f"unknown job kind {job.kind}")
+            result = await handler(context)
+        except asyncio.CancelledError:
+            await asyncio.shield(self.release(job.id))
+            raise
+        except Exception as e:
+            self.logger.error("job %s failed", job.id, exc_info=e)
+            JOBS_FINISHED.labels(job.kind, JOB_FAILED).inc()
+            await self.finish(
+                job.id, JOB_FAILED, context.done, context.total, error=str(e)
+            )
+            return True
+        JOBS_FINISHED.labels(job.kind, JOB_DONE).inc()
+        await self.finish(
+            job.id, JOB_DONE, context.done, context.total, result=result
+        )
+        return True
+
+    @observe_query("enqueue_job")
+    @traced("jobs.enqueue", KIND_CLIENT)
+    async def enqueue(
+        self, kind: str, params: Optional[dict] = None
+    ) -> JobModel:
+        if registry.get(kind) is None:
+            raise JobError(f"unknown job kind {kind}")
+        job = await self.storage.insert_job(kind, params or {})
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    @observe_query("claim_job")
+    @traced("jobs.claim", KIND_CLIENT)
+    async def claim(self) -> Optional[JobModel]:
+        return await self.storage.claim_job()
+
+    @observe_query("get_job")
+    @traced("jobs.get", KIND_CLIENT)
+    async def get(self, job_id: int) -> Optional[JobModel]:
+        return await self.storage.get_job(job_id)
+
+    @observe_query("job_progress")
+    @traced("jobs.set_progress", KIND_CLIENT)
+    async def set_progress(
+        self, job_id: int, done: int, total: Optional[int]
+    ) -> None:
+        await self.storage.set_job_progress(job_id, done, total)
+
+    @observe_query("finish_job")
+    @traced("jobs.finish", KIND_CLIENT)
+    async def finish(
+        self,
+        job_id: int,
+        status: str,
+        done: int,
+        total: Optional[int],
+        result: Optional[dict] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        await self.storage.finish_job(
+            job_id, status, done, total, result=result, error=error
+        )
+
+    @observe_query("release_job")
+    @traced("jobs.release", KIND_CLIENT)
+    async def release(self, job_id: int) -> None:
+        await self.storage.release_job(job_id)
+
+    @observe_query("requeue_stale_jobs")
+    @traced("jobs.requeue_stale", KIND_CLIENT)
+    async def requeue_stale(self) -> None:
+        stale = datetime.now(timezone.utc) - timedelta(
+            seconds=self.app.config.jobs.stale_after
+        )
+        await self.storage.requeue_stale_jobs(
+            stale, self.app.config.jobs.max_attempts
+        )
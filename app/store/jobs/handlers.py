@@ -0,0 +1,68 @@
+import asyncio
+import os
+from typing import Optional
+
+from app.store.jobs.accessor import JobContext, registry
+from app.words.export import ExportStream
+from app.words.normalize import clean, normalize_many
+
+
+@registry.job("words.import")
+async def import_words(context: JobContext) -> dict:
+    words = context.params.get("words", [])
+    batch_size = context.app.config.jobs.batch_size
+    unique = {}
+    canonicals = normalize_many(word["title"] for word in words)
+    for word, canonical in zip(words, canonicals):
+        if canonical not in unique:
+            unique[canonical] = {
+                "title": clean(word["title"]),
+                "canonical": canonical,
+                "is_correct": word["is_correct"],
+            }
+    rows = list(unique.values())
+    inserted = 0
+    await context.progress(0, len(rows))
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start : start + batch_size]
+        inserted += await context.app.store.words.import_words(batch)
+        await context.progress(start + len(batch))
+    return {"inserted": inserted, "skipped": len(words) - inserted}
+
+
+@registry.job("words.list")
+async def list_words(context: JobContext) -> dict:
+    is_correct: Optional[bool] = context.params.get("is_correct")
+    config = context.app.config
+    stream = ExportStream(
+        context.params.get("format", "csv"),
+        gzip=context.params.get("gzip", False),
+        level=config.words.export_gzip_level,
+    )
+    words_accessor = context.app.store.words
+    await context.progress(0, await words_accessor.count_words(is_correct))
+    # the dictionary can be large, so it goes to a file instead of the
+    # result column, which only gets the file name
+    filename = stream.filename(f"words-{context.job.id}")
+    path = os.path.join(config.jobs.result_dir, filename)
+    os.makedirs(config.jobs.result_dir, exist_ok=True)
+    done = 0
+    batches = words_accessor.stream_words(is_correct, config.jobs.batch_size)
+    try:
+        with open(f"{path}.part", "wb") as file:
+            await asyncio.to_thread(file.write, stream.header())
+            async for rows in batches:
+                await asyncio.to_thread(file.write, stream.encode(rows))
+                done += len(rows)
+                await context.progress(done)
+            tail = stream.finish()
+            if tail:
+                await asyncio.to_thread(file.write, tail)
+        os.replace(f"{path}.part", path)
+    except BaseException:
+        if os.path.exists(f"{path}.part"):
+            os.remove(f"{path}.part")
+        raise
+    finally:
+        await batches.aclose()
+    return {"file": filename, "count": done, "size": os.path.getsize(path)}
@@ -0,0 +1,166 @@
+import asyncio
+import typing
+from dataclasses import dataclass
+from typing import Optional
+
+from app.base.base_accessor import BaseAccessor
+from app.metrics.metrics import observe_query
+from app.store.storage.base import ScoreRow
+from app.tracing.tracer import KIND_CLIENT, traced
+
+if typing.TYPE_CHECKING:
+    from app.store.storage.base import Storage
+    from app.web.app import Application
+
+
+@dataclass
+class PendingScore:
+    score: int = 0
+    moves: int = 0
+
+
+class ScoresAccessor(BaseAccessor):
+    def __init__(self, app: "Application", *args, **kwargs):
+        super().__init__(app, *args, **kwargs)
+        self.pending: dict[tuple[int, int], PendingScore] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._flush_requested: Optional[asyncio.Event] = None
+        app.on_shutdown.append(self.stop)
+
+    @property
+    def storage(self) -> "Storage":
+        return self.app.store.storage
+
+    async def connect(self, app: "Application"):
+        self._flush_requested = asyncio.Event()
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self, app: "Application"):
+        if self._flush_task:
+            self._flush_task.cancel()
+            await asyncio.wait({self._flush_task})
+            self._flush_task = None
+        await self.flush()
+
+    def add_points(self, peer_id: int, user_id: int, points: int) -> None:
+        pending = self.pending.get((peer_id, user_id))
+        if pending is None:
+            pending = self.pending[(peer_id, user_id)] = PendingScore()
+        pending.score += points
+        pending.moves += 1
+        if (
+            self._flush_requested is not None
+            and len(self.pending) >= self.app.config.scores.flush_batch
+        ):
+            self._flush_requested.set()
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._flush_requested.wait(),
+                    self.app.config.scores.flush_interval,
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                self.logger.error("scores flush failed", exc_info=e)
+
+    def _lock(self) -> asyncio.Lock:
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        return self._flush_lock
+
+    @observe_query("flush_scores")
+    @traced("scores.flush", KIND_CLIENT)
+    async def flush(self) -> int:
+        async with self._lock():
+            if not self.pending:
+                return 0
+            batch, self.pending = self.pending, {}
+            try:
+                await self._upsert(batch)
+            except Exception:
+                self._restore(batch)
+                raise
+            return len(batch)
+
+    def _restore(self, batch: dict[tuple[int, int], PendingScore]) -> None:
+        for key, pending in batch.items():
+            current = self.pending.get(key)
+            if current is None:
+                self.pending[key] = pending
+            else:
+                current.score += pending.score
+                current.moves += pending.moves
+
+    async def _upsert(self, batch: dict[tuple[int, int], PendingScore]) -> None:
+        await self.storage.add_scores(
+            [
+                (peer_id, user_id, pending.score, pending.moves)
+                for (peer_id, user_id), pending in batch.items()
+            ],
+            [
+                (user_id, total.score, total.moves)
+                for user_id, total in self._totals(batch).items()
+            ],
+        )
+
+    @staticmethod
+    def _totals(
+        *batches: dict[tuple[int, int], PendingScore],
+        peer_id: Optional[int] = None,
+    ) -> dict[int, PendingScore]:
+        totals: dict[int, PendingScore] = {}
+        for batch in batches:
+            for (pending_peer_id, user_id), pending in batch.items():
+                if peer_id is not None and pending_peer_id != peer_id:
+                    continue
+                total = totals.get(user_id)
+                if total is None:
+                    total = totals[user_id] = PendingScore()
+                total.score += pending.score
+                total.moves += pending.moves
+        return totals
+
+    @staticmethod
+    def _merge_top(
+        rows: list[ScoreRow], pending: dict[int, PendingScore], limit: int
+    ) -> list[ScoreRow]:
+        scores = {user_id: (score, moves) for user_id, score, moves in rows}
+        for user_id, extra in pending.items():
+            score, moves = scores.get(user_id, (0, 0))
+            scores[user_id] = (score + extra.score, moves + extra.moves)
+        top = sorted(
+            (
+                (user_id, score, moves)
+                for user_id, (score, moves) in scores.items()
+            ),
+            key=lambda item: (-item[1], item[0]),
+        )
+        return top[:limit]
+
+    async def _top(self, peer_id: Optional[int], limit: int) -> list[ScoreRow]:
+        # reads wait for a running flush so its batch is counted exactly once
+        async with self._lock():
+            # a user without pending points can only be pushed down by users
+            # with pending points, so limit + len(pending) rows are enough
+            pending = self._totals(self.pending, peer_id=peer_id)
+            rows = await self.storage.top_scores(
+                peer_id, limit + len(pending), list(pending)
+            )
+        return self._merge_top(rows, pending, limit)
+
+    @observe_query("top_chat")
+    @traced("scores.top_chat", KIND_CLIENT)
+    async def top_chat(self, peer_id: int, limit: int = 10) -> list[ScoreRow]:
+        return await self._top(peer_id, limit)
+
+    @observe_query("top_global")
+    @traced("scores.top_global", KIND_CLIENT)
+    async def top_global(self, limit: int = 10) -> list[ScoreRow]:
+        return await self._top(None, limit)
@@ -0,0 +1,18 @@
+import typing
+
+if typing.TYPE_CHECKING:
+    from app.store.storage.base import Storage
+    from app.web.app import Application
+
+
+def create_storage(app: "Application") -> "Storage":
+    engine = app.config.storage.engine
+    if engine == "sql":
+        from app.store.storage.sql import SqlStorage
+
+        return SqlStorage(app)
+    if engine == "memory":
+        from app.store.storage.memory import MemoryStorage
+
+        return MemoryStorage(app)
+    raise ValueError(f"unknown storage engine {engine}")
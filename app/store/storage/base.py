@@ -0,0 +1,191 @@
+import typing
+from datetime import datetime
+from typing import AsyncIterator, Callable, Optional
+
+from app.admin.models import AdminModel
+from app.jobs.models import JobModel
+from app.words.models import SettingModel, WordModel
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+WordRow = tuple[int, str, bool]
+# (id, canonical, is_correct, title)
+DictionaryRow = tuple[int, str, bool, str]
+# (user_id, score, moves)
+ScoreRow = tuple[int, int, int]
+# (peer_id, conversation_message_id)
+UpdateKey = tuple[int, int]
+
+
+class Storage:
+    """Data access behind the words, admin, scores, jobs and dedup accessors.
+
+    Accessors keep normalization, caching, batching, metrics and tracing, an
+    engine only stores and finds rows. Unique violations are raised as
+    sqlalchemy IntegrityError with pgcode 23505 by every engine, so callers
+    handle conflicts the same way.
+    """
+
+    def __init__(self, app: "Application"):
+        self.app = app
+
+    def changed(self) -> None:
+        """Called by WordsAccessor whenever the dictionary changes."""
+
+    def version_seen(self) -> None:
+        """Called by WordsAccessor when it learns of a newer version."""
+
+    async def dictionary_version(self) -> int:
+        """Current version of words and settings, moved by every change."""
+        raise NotImplementedError
+
+    @property
+    def watching(self) -> bool:
+        """Whether versions are pushed through watch_version right now."""
+        return False
+
+    async def watch_version(self, callback: Callable[[int], None]) -> None:
+        """Report versions changed by other processes as they happen."""
+
+    async def unwatch_version(self) -> None:
+        pass
+
+    async def insert_word(
+        self, title: str, is_correct: bool, canonical: str
+    ) -> WordModel:
+        raise NotImplementedError
+
+    async def update_word(self, word_id: int, **values) -> Optional[WordModel]:
+        raise NotImplementedError
+
+    async def delete_word(self, word_id: int) -> None:
+        raise NotImplementedError
+
+    async def import_words(self, words: list[dict]) -> int:
+        """Insert rows with title, is_correct and canonical, skip duplicates."""
+        raise NotImplementedError
+
+    async def list_words(
+        self, is_correct: Optional[bool] = None
+    ) -> list[WordModel]:
+        raise NotImplementedError
+
+    def stream_words(
+        self, is_correct: Optional[bool] = None, batch_size: int = 5000
+    ) -> AsyncIterator[list[WordRow]]:
+        raise NotImplementedError
+
+    async def count_words(self, is_correct: Optional[bool] = None) -> int:
+        raise NotImplementedError
+
+    async def list_words_page(
+        self, after_id: int, limit: int, is_correct: Optional[bool] = None
+    ) -> list[WordModel]:
+        raise NotImplementedError
+
+    async def get_word_by_canonical(
+        self, canonical: str
+    ) -> Optional[WordModel]:
+        raise NotImplementedError
+
+    async def get_word_by_id(self, word_id: int) -> Optional[WordModel]:
+        raise NotImplementedError
+
+    async def dictionary_rows(self) -> list[DictionaryRow]:
+        """(id, canonical, is_correct, title) of every word."""
+        raise NotImplementedError
+
+    async def nearest_words(
+        self, canonical: str, max_distance: int, limit: int
+    ) -> list[str]:
+        """Canonical forms of correct words likely close to canonical."""
+        raise NotImplementedError
+
+    async def insert_setting(self, title: str, timeout: int) -> SettingModel:
+        raise NotImplementedError
+
+    async def update_setting(
+        self, setting_id: int, **values
+    ) -> Optional[SettingModel]:
+        raise NotImplementedError
+
+    async def delete_setting(self, setting_id: int) -> None:
+        raise NotImplementedError
+
+    async def list_settings(self) -> list[SettingModel]:
+        raise NotImplementedError
+
+    async def get_setting_by_title(self, title: str) -> Optional[SettingModel]:
+        raise NotImplementedError
+
+    async def get_setting_by_id(
+        self, setting_id: int
+    ) -> Optional[SettingModel]:
+        raise NotImplementedError
+
+    async def insert_admin(self, email: str, password: str) -> AdminModel:
+        raise NotImplementedError
+
+    async def get_admin_by_email(self, email: str) -> Optional[AdminModel]:
+        raise NotImplementedError
+
+    async def add_scores(
+        self,
+        chat_scores: list[tuple[int, int, int, int]],
+        global_scores: list[ScoreRow],
+    ) -> None:
+        """Add (peer_id, user_id, score, moves) and (user_id, score, moves)."""
+        raise NotImplementedError
+
+    async def top_scores(
+        self, peer_id: Optional[int], limit: int, user_ids: list[int]
+    ) -> list[ScoreRow]:
+        """Best limit rows of a chat, or of all chats without peer_id.
+
+        The rows of user_ids are added even when they are not among the best.
+        """
+        raise NotImplementedError
+
+    async def insert_job(self, kind: str, params: dict) -> JobModel:
+        raise NotImplementedError
+
+    async def claim_job(self) -> Optional[JobModel]:
+        """Mark the oldest queued job running, no job is handed out twice."""
+        raise NotImplementedError
+
+    async def get_job(self, job_id: int) -> Optional[JobModel]:
+        raise NotImplementedError
+
+    async def set_job_progress(
+        self, job_id: int, done: int, total: Optional[int]
+    ) -> None:
+        raise NotImplementedError
+
+    async def finish_job(
+        self,
+        job_id: int,
+        status: str,
+        done: int,
+        total: Optional[int],
+        result: Optional[dict] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        raise NotImplementedError
+
+    async def release_job(self, job_id: int) -> None:
+        """Put a running job back into the queue."""
+        raise NotImplementedError
+
+    async def requeue_stale_jobs(
+        self, started_before: datetime, max_attempts: int
+    ) -> None:
+        """Requeue jobs started before started_before, fail exhausted ones."""
+        raise NotImplementedError
+
+    async def claim_updates(self, keys: list[UpdateKey]) -> set[UpdateKey]:
+        """Remember keys, return the ones no process has claimed before."""
+        raise NotImplementedError
+
+    async def cleanup_updates(self, claimed_before: datetime) -> None:
+        raise NotImplementedError
@@ -0,0 +1,380 @@
+import random
+import uuid
+from dataclasses import replace
+from datetime import datetime, timezone
+from itertools import count, islice
+from typing import AsyncIterator, Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from app.admin.models import AdminModel
+from app.jobs.models import JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JobModel
+from app.store.storage.base import (
+    DictionaryRow,
+    ScoreRow,
+    Storage,
+    UpdateKey,
+    WordRow,
+)
+from app.store.words.suggest import bounded_distance
+from app.words.models import SettingModel, WordModel
+
+
+class UniqueViolation(Exception):
+    """Stands in for asyncpg's UniqueViolationError as IntegrityError.orig."""
+
+    pgcode = sqlstate = "23505"
+
+
+def unique_violation(table: str, column: str, value) -> IntegrityError:
+    return IntegrityError(
+        f"INSERT INTO {table}",
+        {column: value},
+        UniqueViolation(
+            "duplicate key value violates unique constraint"
+            f' "{table}_{column}_key"'
+        ),
+    )
+
+
+class MemoryStorage(Storage):
+    """Keeps every table in dicts with the same unique keys as the schema.
+
+    Nothing is shared between processes or kept across restarts. Meant for
+    tests and as a zero latency baseline when profiling the rest of the app.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        # id -> [title, is_correct, canonical], in insertion order
+        self.words: dict[int, list] = {}
+        self.word_titles: dict[str, int] = {}
+        self.word_canonicals: dict[str, int] = {}
+        self._word_ids = count(1)
+        self.settings: dict[int, list] = {}
+        self.setting_titles: dict[str, int] = {}
+        self._setting_ids = count(1)
+        self.admins: dict[str, AdminModel] = {}
+        # (peer_id, user_id) -> [score, moves] and user_id -> [score, moves]
+        self.chat_scores: dict[tuple[int, int], list] = {}
+        self.global_scores: dict[int, list] = {}
+        self.jobs: dict[int, JobModel] = {}
+        self._job_ids = count(1)
+        # (peer_id, conversation_message_id) -> claimed at
+        self.processed_updates: dict[UpdateKey, datetime] = {}
+        # a random start keeps etags of an earlier process from matching
+        self.version = random.getrandbits(40) << 20
+
+    def changed(self) -> None:
+        self.version += 1
+
+    async def dictionary_version(self) -> int:
+        return self.version
+
+    @staticmethod
+    def _word(word_id: int, row: list) -> WordModel:
+        word = WordModel(id=word_id, title=row[0], is_correct=row[1])
+        word.canonical = row[2]
+        return word
+
+    @staticmethod
+    def _setting(setting_id: int, row: list) -> SettingModel:
+        return SettingModel(id=setting_id, title=row[0], timeout=row[1])
+
+    def _check_word(self, title: str, canonical: str, word_id: int = None):
+        if self.word_titles.get(title, word_id) != word_id:
+            raise unique_violation("words", "title", title)
+        if self.word_canonicals.get(canonical, word_id) != word_id:
+            raise unique_violation("words", "canonical", canonical)
+
+    def _add_word(self, title: str, is_correct: bool, canonical: str) -> int:
+        word_id = next(self._word_ids)
+        self.words[word_id] = [title, is_correct, canonical]
+        self.word_titles[title] = word_id
+        self.word_canonicals[canonical] = word_id
+        return word_id
+
+    def _selected(self, is_correct: Optional[bool]):
+        for word_id, row in self.words.items():
+            if is_correct is None or row[1] == is_correct:
+                yield word_id, row
+
+    async def insert_word(
+        self, title: str, is_correct: bool, canonical: str
+    ) -> WordModel:
+        self._check_word(title, canonical)
+        word_id = self._add_word(title, is_correct, canonical)
+        return self._word(word_id, self.words[word_id])
+
+    async def update_word(self, word_id: int, **values) -> Optional[WordModel]:
+        row = self.words.get(word_id)
+        if row is None:
+            return None
+        title = values.get("title", row[0])
+        canonical = values.get("canonical", row[2])
+        self._check_word(title, canonical, word_id)
+        del self.word_titles[row[0]]
+        del self.word_canonicals[row[2]]
+        row[:] = [title, values.get("is_correct", row[1]), canonical]
+        self.word_titles[title] = word_id
+        self.word_canonicals[canonical] = word_id
+        return self._word(word_id, row)
+
+    async def delete_word(self, word_id: int) -> None:
+        row = self.words.pop(word_id, None)
+        if row is not None:
+            del self.word_titles[row[0]]
+            del self.word_canonicals[row[2]]
+
+    async def import_words(self, words: list[dict]) -> int:
+        inserted = 0
+        for word in words:
+            if (
+                word["title"] in self.word_titles
+                or word["canonical"] in self.word_canonicals
+            ):
+                continue
+            self._add_word(word["title"], word["is_correct"], word["canonical"])
+            inserted += 1
+        return inserted
+
+    async def list_words(
+        self, is_correct: Optional[bool] = None
+    ) -> list[WordModel]:
+        return [
+            self._word(word_id, row)
+            for word_id, row in self._selected(is_correct)
+        ]
+
+    async def stream_words(
+        self, is_correct: Optional[bool] = None, batch_size: int = 5000
+    ) -> AsyncIterator[list[WordRow]]:
+        rows = (
+            (word_id, row[0], row[1])
+            for word_id, row in sorted(self._selected(is_correct))
+        )
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return
+            yield batch
+
+    async def count_words(self, is_correct: Optional[bool] = None) -> int:
+        if is_correct is None:
+            return len(self.words)
+        return sum(1 for _ in self._selected(is_correct))
+
+    async def list_words_page(
+        self, after_id: int, limit: int, is_correct: Optional[bool] = None
+    ) -> list[WordModel]:
+        page = sorted(
+            (word_id, row)
+            for word_id, row in self._selected(is_correct)
+            if word_id > after_id
+        )[:limit]
+        return [self._word(word_id, row) for word_id, row in page]
+
+    async def get_word_by_canonical(
+        self, canonical: str
+    ) -> Optional[WordModel]:
+        word_id = self.word_canonicals.get(canonical)
+        if word_id is None:
+            return None
+        return self._word(word_id, self.words[word_id])
+
+    async def get_word_by_id(self, word_id: int) -> Optional[WordModel]:
+        row = self.words.get(word_id)
+        if row is None:
+            return None
+        return self._word(word_id, row)
+
+    async def dictionary_rows(self) -> list[DictionaryRow]:
+        return [
+            (word_id, row[2], row[1], row[0])
+            for word_id, row in self.words.items()
+        ]
+
+    async def nearest_words(
+        self, canonical: str, max_distance: int, limit: int
+    ) -> list[str]:
+        found = []
+        for _, row in self._selected(True):
+            distance = bounded_distance(canonical, row[2], max_distance)
+            if distance is not None:
+                found.append((distance, row[2]))
+        found.sort()
+        return [title for _, title in found[:limit]]
+
+    async def insert_setting(self, title: str, timeout: int) -> SettingModel:
+        if title in self.setting_titles:
+            raise unique_violation("settings", "title", title)
+        setting_id = next(self._setting_ids)
+        self.settings[setting_id] = [title, timeout]
+        self.setting_titles[title] = setting_id
+        return self._setting(setting_id, self.settings[setting_id])
+
+    async def update_setting(
+        self, setting_id: int, **values
+    ) -> Optional[SettingModel]:
+        row = self.settings.get(setting_id)
+        if row is None:
+            return None
+        title = values.get("title", row[0])
+        if self.setting_titles.get(title, setting_id) != setting_id:
+            raise unique_violation("settings", "title", title)
+        del self.setting_titles[row[0]]
+        row[:] = [title, values.get("timeout", row[1])]
+        self.setting_titles[title] = setting_id
+        return self._setting(setting_id, row)
+
+    async def delete_setting(self, setting_id: int) -> None:
+        row = self.settings.pop(setting_id, None)
+        if row is not None:
+            del self.setting_titles[row[0]]
+
+    async def list_settings(self) -> list[SettingModel]:
+        return [
+            self._setting(setting_id, row)
+            for setting_id, row in self.settings.items()
+        ]
+
+    async def get_setting_by_title(self, title: str) -> Optional[SettingModel]:
+        setting_id = self.setting_titles.get(title)
+        if setting_id is None:
+            return None
+        return self._setting(setting_id, self.settings[setting_id])
+
+    async def get_setting_by_id(
+        self, setting_id: int
+    ) -> Optional[SettingModel]:
+        row = self.settings.get(setting_id)
+        if row is None:
+            return None
+        return self._setting(setting_id, row)
+
+    async def insert_admin(self, email: str, password: str) -> AdminModel:
+        if email in self.admins:
+            raise unique_violation("admins", "email", email)
+        admin = AdminModel(email=email, id=uuid.uuid4(), password=password)
+        self.admins[email] = admin
+        return AdminModel(email=email, id=admin.id, password=password)
+
+    async def get_admin_by_email(self, email: str) -> Optional[AdminModel]:
+        admin = self.admins.get(email)
+        if admin is None:
+            return None
+        return AdminModel(
+            email=admin.email, id=admin.id, password=admin.password
+        )
+
+    async def add_scores(
+        self,
+        chat_scores: list[tuple[int, int, int, int]],
+        global_scores: list[ScoreRow],
+    ) -> None:
+        for peer_id, user_id, score, moves in chat_scores:
+            row = self.chat_scores.setdefault((peer_id, user_id), [0, 0])
+            row[0] += score
+            row[1] += moves
+        for user_id, score, moves in global_scores:
+            row = self.global_scores.setdefault(user_id, [0, 0])
+            row[0] += score
+            row[1] += moves
+
+    async def top_scores(
+        self, peer_id: Optional[int], limit: int, user_ids: list[int]
+    ) -> list[ScoreRow]:
+        if peer_id is None:
+            rows = [
+                (user_id, row[0], row[1])
+                for user_id, row in self.global_scores.items()
+            ]
+        else:
+            rows = [
+                (user_id, row[0], row[1])
+                for (row_peer_id, user_id), row in self.chat_scores.items()
+                if row_peer_id == peer_id
+            ]
+        top = sorted(rows, key=lambda row: -row[1])[:limit]
+        wanted = set(user_ids)
+        return top + [row for row in rows if row[0] in wanted]
+
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone.utc)
+
+    async def insert_job(self, kind: str, params: dict) -> JobModel:
+        job_id = next(self._job_ids)
+        self.jobs[job_id] = JobModel(
+            id=job_id, kind=kind, params=params, created_at=self._now()
+        )
+        return replace(self.jobs[job_id])
+
+    async def claim_job(self) -> Optional[JobModel]:
+        for job in self.jobs.values():
+            if job.status == JOB_QUEUED:
+                job.status = JOB_RUNNING
+                job.started_at = self._now()
+                job.attempts += 1
+                return replace(job)
+        return None
+
+    async def get_job(self, job_id: int) -> Optional[JobModel]:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        return replace(job)
+
+    async def set_job_progress(
+        self, job_id: int, done: int, total: Optional[int]
+    ) -> None:
+        job = self.jobs.get(job_id)
+        if job is not None:
+            job.done, job.total = done, total
+
+    async def finish_job(
+        self,
+        job_id: int,
+        status: str,
+        done: int,
+        total: Optional[int],
+        result: Optional[dict] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        job = self.jobs.get(job_id)
+        if job is not None:
+            job.status, job.done, job.total = status, done, total
+            job.result, job.error = result, error
+            job.finished_at = self._now()
+
+    async def release_job(self, job_id: int) -> None:
+        job = self.jobs.get(job_id)
+        if job is not None and job.status == JOB_RUNNING:
+            job.status, job.started_at = JOB_QUEUED, None
+
+    async def requeue_stale_jobs(
+        self, started_before: datetime, max_attempts: int
+    ) -> None:
+        for job in self.jobs.values():
+            if job.status != JOB_RUNNING or job.started_at >= started_before:
+                continue
+            if job.attempts >= max_attempts:
+                job.status, job.error = JOB_FAILED, "abandoned by worker"
+                job.finished_at = self._now()
+            else:
+                job.status, job.started_at = JOB_QUEUED, None
+
+    async def claim_updates(self, keys: list[UpdateKey]) -> set[UpdateKey]:
+        claimed = set()
+        for key in keys:
+            if key not in self.processed_updates:
+                self.processed_updates[key] = self._now()
+                claimed.add(key)
+        return claimed
+
+    async def cleanup_updates(self, claimed_before: datetime) -> None:
+        self.processed_updates = {
+            key: claimed_at
+            for key, claimed_at in self.processed_updates.items()
+            if claimed_at >= claimed_before
+        }
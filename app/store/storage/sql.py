@@ -0,0 +1,487 @@
+from datetime import datetime
+from time import monotonic
+from typing import AsyncIterator, Callable, Optional
+
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.admin.models import AdminModel
+from app.bot.models import ProcessedUpdateModel
+from app.game.models import GlobalScoreModel, ScoreModel
+from app.jobs.models import JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JobModel
+from app.store.database.database import Listener
+from app.store.storage.base import (
+    DictionaryRow,
+    ScoreRow,
+    Storage,
+    UpdateKey,
+    WordRow,
+)
+from app.words.models import DictionaryVersionModel, SettingModel, WordModel
+
+VERSION_CHANNEL = "dictionary_version"
+
+words_table = WordModel.__table__
+settings_table = SettingModel.__table__
+# shared statements, so the write batcher can group them, inserts return
+# the title to match the rows of a batch to its writes
+INSERT_WORD = insert(words_table).returning(
+    words_table.c.id, words_table.c.title
+)
+DELETE_WORD = delete(words_table).where(
+    words_table.c.id == bindparam("word_id")
+)
+INSERT_SETTING = insert(settings_table).returning(
+    settings_table.c.id, settings_table.c.title
+)
+DELETE_SETTING = delete(settings_table).where(
+    settings_table.c.id == bindparam("setting_id")
+)
+
+
+class SqlStorage(Storage):
+    def __init__(self, app):
+        super().__init__(app)
+        self._changed_at: Optional[float] = None
+        self._listener: Optional[Listener] = None
+
+    def changed(self) -> None:
+        self._changed_at = monotonic()
+
+    def version_seen(self) -> None:
+        # a change of another process reaches the replicas no sooner than it
+        # reaches us through NOTIFY or polling
+        self._changed_at = monotonic()
+
+    def _read_session(self):
+        # right after a change a replica may still serve the old rows, which
+        # would then be cached under the new version
+        lag = self.app.config.database.replica_lag
+        recent = (
+            self._changed_at is not None
+            and monotonic() - self._changed_at < lag
+        )
+        return self.app.database.read_session(primary=recent)
+
+    async def dictionary_version(self) -> int:
+        # bumped by triggers on words and settings, see DictionaryVersionModel
+        query = select(DictionaryVersionModel.version).where(
+            DictionaryVersionModel.id == 1
+        )
+        async with self.app.database.session() as session:
+            response = await session.execute(query)
+            return response.scalar() or 0
+
+    @property
+    def watching(self) -> bool:
+        return self._listener is not None and self._listener.connected
+
+    async def watch_version(self, callback: Callable[[int], None]) -> None:
+        # the version trigger sends NOTIFY on commit, see DictionaryVersionModel
+        async def on_connect():
+            callback(await self.dictionary_version())
+
+        self._listener = self.app.database.listen(
+            VERSION_CHANNEL, lambda payload: callback(int(payload)), on_connect
+        )
+
+    async def unwatch_version(self) -> None:
+        if self._listener is not None:
+            await self._listener.stop()
+            self._listener = None
+
+    async def insert_word(
+        self, title: str, is_correct: bool, canonical: str
+    ) -> WordModel:
+        row = await self.app.store.writes.execute(
+            INSERT_WORD,
+            {"title": title, "is_correct": is_correct, "canonical": canonical},
+            key="title",
+        )
+        return WordModel(id=row.id, title=title, is_correct=is_correct)
+
+    async def update_word(self, word_id: int, **values) -> Optional[WordModel]:
+        query = select(WordModel).where(WordModel.id == word_id)
+        async with self.app.database.session() as session:
+            result = await session.execute(query)
+            word = result.scalar()
+            if word:
+                for name, value in values.items():
+                    setattr(word, name, value)
+                await session.commit()
+        return word
+
+    async def delete_word(self, word_id: int) -> None:
+        await self.app.store.writes.execute(DELETE_WORD, {"word_id": word_id})
+
+    async def import_words(self, words: list[dict]) -> int:
+        query = (
+            insert(WordModel)
+            .values(words)
+            .on_conflict_do_nothing()
+            .returning(WordModel.id)
+        )
+        async with self.app.database.session() as session:
+            response = await session.execute(query)
+            inserted = len(response.all())
+            await session.commit()
+        return inserted
+
+    async def list_words(
+        self, is_correct: Optional[bool] = None
+    ) -> list[WordModel]:
+        query = select(WordModel)
+        if is_correct is not None:
+            query = query.where(WordModel.is_correct == is_correct)
+        async with self._read_session() as session:
+            response = await session.execute(query)
+            return list(response.scalars().unique())
+
+    async def stream_words(
+        self, is_correct: Optional[bool] = None, batch_size: int = 5000
+    ) -> AsyncIterator[list[WordRow]]:
+        query = (
+            select(WordModel.id, WordModel.title, WordModel.is_correct)
+            .order_by(WordModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if is_correct is not None:
+            query = query.where(WordModel.is_correct == is_correct)
+        async with self._read_session() as session:
+            result = await session.stream(query)
+            async for rows in result.partitions(batch_size):
+                yield rows
+
+    async def count_words(self, is_correct: Optional[bool] = None) -> int:
+        query = select(func.count(WordModel.id))
+        if is_correct is not None:
+            query = query.where(WordModel.is_correct == is_correct)
+        async with self._read_session() as session:
+            response = await session.execute(query)
+            return response.scalar()
+
+    async def list_words_page(
+        self, after_id: int, limit: int, is_correct: Optional[bool] = None
+    ) -> list[WordModel]:
+        query = (
+            select(WordModel)
+            .where(WordModel.id > after_id)
+            .order_by(WordModel.id)
+            .limit(limit)
+        )
+        if is_correct is not None:
+            query = query.where(WordModel.is_correct == is_correct)
+        async with self._read_session() as session:
+            response = await session.execute(query)
+            return list(response.scalars())
+
+    async def get_word_by_canonical(
+        self, canonical: str
+    ) -> Optional[WordModel]:
+        query = select(WordModel).where(WordModel.canonical == canonical)
+        async with self._read_session() as session:
+            response = await session.execute(query)
+            return response.scalar()
+
+    async def get_word_by_id(self, word_id: int) -> Optional[WordModel]:
+        query = select(WordModel).where(WordModel.id == word_id)
+        async with self._read_session() as session:
+            response = await session.execute(query)
+            return response.scalar()
+
+    async def dictionary_rows(self) -> list[DictionaryRow]:
+        # the game reads the dictionary from the primary, a replica could
+        # hand out a dictionary older than its version
+        query = select(
+            WordModel.id,
+            WordModel.canonical,
+            WordModel.is_correct,
+            WordModel.title,
+        )
+        async with self.app.database.session() as session:
+            response = await session.execute(query)
+            return response.all()
+
+    async def nearest_words(
+        self, canonical: str, max_distance: int, limit: int
+    ) -> list[str]:
+        # <-> is answered by the gist trigram index in nearest first order,
+        # the edit distance is checked on the short list it returns
+        query = (
+            select(WordModel.canonical)
+            .where(
+                WordModel.is_correct,
+                func.length(WordModel.canonical).between(
+                    len(canonical) - max_distance, len(canonical) + max_distance
+                ),
+            )
+            .order_by(WordModel.canonical.op("<->")(canonical))
+            .limit(limit)
+        )
+        async with self._read_session() as session:
+            response = await session.execute(query)
+            return response.scalars().all()
+
+    async def insert_setting(self, title: str, timeout: int) -> SettingModel:
+        row = await self.app.store.writes.execute(
+            INSERT_SETTING, {"title": title, "timeout": timeout}, key="title"
+        )
+        return SettingModel(id=row.id, title=title, timeout=timeout)
+
+    async def update_setting(
+        self, setting_id: int, **values
+    ) -> Optional[SettingModel]:
+        query = select(SettingModel).where(SettingModel.id == setting_id)
+        async with self.app.database.session() as session:
+            result = await session.execute(query)
+            setting = result.scalar()
+            if setting:
+                for name, value in values.items():
+                    setattr(setting, name, value)
+                await session.commit()
+        return setting
+
+    async def delete_setting(self, setting_id: int) -> None:
+        await self.app.store.writes.execute(
+            DELETE_SETTING, {"setting_id": setting_id}
+        )
+
+    async def list_settings(self) -> list[SettingModel]:
+        query = select(SettingModel)
+        async with self._read_session() as session:
+            response = await session.execute(query)
+            return list(response.scalars().unique())
+
+    async def get_setting_by_title(self, title: str) -> Optional[SettingModel]:
+        query = select(SettingModel).where(SettingModel.title == title)
+        async with self._read_session() as session:
+            response = await session.execute(query)
+            return response.scalar()
+
+    async def get_setting_by_id(
+        self, setting_id: int
+    ) -> Optional[SettingModel]:
+        query = select(SettingModel).where(SettingModel.id == setting_id)
+        async with self._read_session() as session:
+            response = await session.execute(query)
+            return response.scalar()
+
+    async def insert_admin(self, email: str, password: str) -> AdminModel:
+        admin = AdminModel(email=email, password=password)
+        async with self.app.database.session() as session:
+            session.add(admin)
+            await session.commit()
+        return admin
+
+    async def get_admin_by_email(self, email: str) -> Optional[AdminModel]:
+        query = select(AdminModel).where(AdminModel.email == email)
+        async with self.app.database.read_session() as session:
+            response = await session.execute(query)
+            return response.scalar()
+
+    async def add_scores(
+        self,
+        chat_scores: list[tuple[int, int, int, int]],
+        global_scores: list[ScoreRow],
+    ) -> None:
+        chat_query = insert(ScoreModel)
+        chat_query = chat_query.on_conflict_do_update(
+            index_elements=[ScoreModel.peer_id, ScoreModel.user_id],
+            set_={
+                "score": ScoreModel.score + chat_query.excluded.score,
+                "moves": ScoreModel.moves + chat_query.excluded.moves,
+            },
+        )
+        global_query = insert(GlobalScoreModel)
+        global_query = global_query.on_conflict_do_update(
+            index_elements=[GlobalScoreModel.user_id],
+            set_={
+                "score": GlobalScoreModel.score + global_query.excluded.score,
+                "moves": GlobalScoreModel.moves + global_query.excluded.moves,
+            },
+        )
+        # rows are sorted so concurrent flushes from several workers lock
+        # them in the same order
+        async with self.app.database.session() as session:
+            await session.execute(
+                chat_query,
+                [
+                    {
+                        "peer_id": peer_id,
+                        "user_id": user_id,
+                        "score": score,
+                        "moves": moves,
+                    }
+                    for peer_id, user_id, score, moves in sorted(chat_scores)
+                ],
+            )
+            await session.execute(
+                global_query,
+                [
+                    {"user_id": user_id, "score": score, "moves": moves}
+                    for user_id, score, moves in sorted(global_scores)
+                ],
+            )
+            await session.commit()
+
+    async def top_scores(
+        self, peer_id: Optional[int], limit: int, user_ids: list[int]
+    ) -> list[ScoreRow]:
+        if peer_id is None:
+            model, conditions = GlobalScoreModel, []
+        else:
+            model, conditions = ScoreModel, [ScoreModel.peer_id == peer_id]
+        columns = (model.user_id, model.score, model.moves)
+        query = (
+            select(*columns)
+            .where(*conditions)
+            .order_by(model.score.desc())
+            .limit(limit)
+        )
+        async with self.app.database.session() as session:
+            rows = list(await session.execute(query))
+            if user_ids:
+                rows += list(
+                    await session.execute(
+                        select(*columns).where(
+                            *conditions, model.user_id.in_(user_ids)
+                        )
+                    )
+                )
+        return [tuple(row) for row in rows]
+
+    async def insert_job(self, kind: str, params: dict) -> JobModel:
+        job = JobModel(kind=kind, params=params)
+        async with self.app.database.session() as session:
+            session.add(job)
+            await session.commit()
+            await session.refresh(job)
+        return job
+
+    async def claim_job(self) -> Optional[JobModel]:
+        # SKIP LOCKED lets every worker of every process poll the same
+        # table without handing one job out twice
+        queued = (
+            select(JobModel.id)
+            .where(JobModel.status == JOB_QUEUED)
+            .order_by(JobModel.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        query = (
+            update(JobModel)
+            .where(JobModel.id == queued)
+            .values(
+                status=JOB_RUNNING,
+                started_at=func.now(),
+                attempts=JobModel.attempts + 1,
+            )
+            .returning(*JobModel.__table__.columns)
+        )
+        async with self.app.database.session() as session:
+            result = await session.execute(
+                select(JobModel)
+                .from_statement(query)
+                .execution_options(populate_existing=True)
+            )
+            job = result.scalar()
+            await session.commit()
+        return job
+
+    async def get_job(self, job_id: int) -> Optional[JobModel]:
+        query = select(JobModel).where(JobModel.id == job_id)
+        async with self.app.database.session() as session:
+            response = await session.execute(query)
+            return response.scalar()
+
+    async def _update_job(self, *conditions, **values) -> None:
+        query = update(JobModel).where(*conditions).values(**values)
+        async with self.app.database.session() as session:
+            await session.execute(query)
+            await session.commit()
+
+    async def set_job_progress(
+        self, job_id: int, done: int, total: Optional[int]
+    ) -> None:
+        await self._update_job(JobModel.id == job_id, done=done, total=total)
+
+    async def finish_job(
+        self,
+        job_id: int,
+        status: str,
+        done: int,
+        total: Optional[int],
+        result: Optional[dict] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        await self._update_job(
+            JobModel.id == job_id,
+            status=status,
+            done=done,
+            total=total,
+            result=result,
+            error=error,
+            finished_at=func.now(),
+        )
+
+    async def release_job(self, job_id: int) -> None:
+        await self._update_job(
+            JobModel.id == job_id,
+            JobModel.status == JOB_RUNNING,
+            status=JOB_QUEUED,
+            started_at=None,
+        )
+
+    async def requeue_stale_jobs(
+        self, started_before: datetime, max_attempts: int
+    ) -> None:
+        running = (
+            JobModel.status == JOB_RUNNING,
+            JobModel.started_at < started_before,
+        )
+        async with self.app.database.session() as session:
+            await session.execute(
+                update(JobModel)
+                .where(*running, JobModel.attempts >= max_attempts)
+                .values(
+                    status=JOB_FAILED,
+                    error="abandoned by worker",
+                    finished_at=func.now(),
+                )
+            )
+            await session.execute(
+                update(JobModel)
+                .where(*running)
+                .values(status=JOB_QUEUED, started_at=None)
+            )
+            await session.commit()
+
+    async def claim_updates(self, keys: list[UpdateKey]) -> set[UpdateKey]:
+        query = (
+            insert(ProcessedUpdateModel)
+            .values(
+                [
+                    {"peer_id": peer_id, "conversation_message_id": message_id}
+                    for peer_id, message_id in keys
+                ]
+            )
+            .on_conflict_do_nothing()
+            .returning(
+                ProcessedUpdateModel.peer_id,
+                ProcessedUpdateModel.conversation_message_id,
+            )
+        )
+        async with self.app.database.session() as session:
+            result = await session.execute(query)
+            claimed = {tuple(row) for row in result}
+            await session.commit()
+        return claimed
+
+    async def cleanup_updates(self, claimed_before: datetime) -> None:
+        query = delete(ProcessedUpdateModel).where(
+            ProcessedUpdateModel.created_at < claimed_before
+        )
+        async with self.app.database.session() as session:
+            await session.execute(query)
+            await session.commit()
@@ -1,18 +1,31 @@
+import json
 import random
 import typing
+from time import perf_counter
 from typing import Optional, List
+from urllib.parse import urlencode
 
 from aiohttp import TCPConnector
 from aiohttp.client import ClientSession
 
 from app.base.base_accessor import BaseAccessor
+from app.metrics.metrics import VK_API_ERRORS, VK_API_REQUEST_SECONDS
 from app.store.vk_api.dataclasses import Message, Update, UpdateObject, Player
 from app.store.vk_api.poller import Poller
+from app.tracing.tracer import KIND_CLIENT, TRACER
 
 if typing.TYPE_CHECKING:
     from app.web.app import Application
 
-API_PATH = "https://api.vk.com/method/"
+
+def parse_payload(raw: Optional[str]) -> Optional[dict]:
+    if not raw:
+        return None
+    try:
+        payload = json.loads(raw)
+    except ValueError:
+        return None
+    return payload if isinstance(payload, dict) else None
 
 
 class VkApiAccessor(BaseAccessor):
@@ -23,9 +36,12 @@ class VkApiAccessor(BaseAccessor):
         self.server: Optional[str] = None
         self.poller: Optional[Poller] = None
         self.ts: Optional[int] = None
+        app.on_shutdown.append(self.stop_polling)
 
     async def connect(self, app: "Application"):
         self.session = ClientSession(connector=TCPConnector(verify_ssl=False))
+        if app.worker_id != 0:
+            return
         try:
             await self._get_long_poll_service()
         except Exception as e:
@@ -34,105 +50,136 @@ class VkApiAccessor(BaseAccessor):
         self.logger.info("start polling")
         await self.poller.start()
 
-    async def disconnect(self, app: "Application"):
+    async def stop_polling(self, app: "Application"):
         if self.poller:
-            await self.poller.stop()
+            self.logger.info("stop polling")
+            await self.poller.stop(app.config.server.shutdown_timeout)
+            self.poller = None
+
+    async def disconnect(self, app: "Application"):
+        await self.stop_polling(app)
         if self.session:
             await self.session.close()
 
     @staticmethod
     def _build_query(host: str, method: str, params: dict) -> str:
-        url = host + method + "?"
         if "v" not in params:
             params["v"] = "5.131"
-        url += "&".join([f"{k}={v}" for k, v in params.items()])
-        return url
+        return host + method + "?" + urlencode(params)
+
+    async def _call(
+        self, name: str, host: str, method: str, params: dict
+    ) -> dict:
+        started = perf_counter()
+        try:
+            with TRACER.span(f"vk {name}", KIND_CLIENT):
+                async with self.session.get(
+                    self._build_query(host=host, method=method, params=params)
+                ) as resp:
+                    data = await resp.json()
+        except Exception:
+            VK_API_ERRORS.labels(name, "transport").inc()
+            raise
+        finally:
+            VK_API_REQUEST_SECONDS.labels(name).observe(
+                perf_counter() - started
+            )
+        if "error" in data:
+            VK_API_ERRORS.labels(
+                name, str(data["error"].get("error_code"))
+            ).inc()
+        elif "failed" in data:
+            VK_API_ERRORS.labels(name, f"failed_{data['failed']}").inc()
+        return data
 
     async def _get_long_poll_service(self):
-        async with self.session.get(
-            self._build_query(
-                host=API_PATH,
+        data = (
+            await self._call(
+                "groups.getLongPollServer",
+                host=self.app.config.bot.api_path,
                 method="groups.getLongPollServer",
                 params={
                     "group_id": self.app.config.bot.group_id,
                     "access_token": self.app.config.bot.token,
                 },
             )
-        ) as resp:
-            data = (await resp.json())["response"]
-            self.logger.info(data)
-            self.key = data["key"]
-            self.server = data["server"]
-            self.ts = data["ts"]
-            self.logger.info(self.server)
-
-    async def poll(self):
-        async with self.session.get(
-            self._build_query(
-                host=self.server,
-                method="",
-                params={
-                    "act": "a_check",
-                    "key": self.key,
-                    "ts": self.ts,
-                    "wait": 5,
-                },
-            )
-        ) as resp:
-            data = await resp.json()
-            self.logger.info(data)
-            self.ts = data["ts"]
-            raw_updates = data.get("updates", [])
-            updates = []
-            for update in raw_updates:
-                updates.append(
-                    Update(
-                        type=update["type"],
-                        object=UpdateObject(
-                            peer_id=update["object"]["message"]["peer_id"],
-                            user_id=update["object"]["message"]["from_id"],
-                            body=update["object"]["message"]["text"],
+        )["response"]
+        self.logger.info(data)
+        self.key = data["key"]
+        self.server = data["server"]
+        self.ts = data["ts"]
+        self.logger.info(self.server)
+
+    async def poll(self) -> list[Update]:
+        data = await self._call(
+            "a_check",
+            host=self.server,
+            method="",
+            params={
+                "act": "a_check",
+                "key": self.key,
+                "ts": self.ts,
+                "wait": 5,
+            },
+        )
+        self.logger.info(data)
+        self.ts = data["ts"]
+        raw_updates = data.get("updates", [])
+        updates = []
+        for update in raw_updates:
+            message = update["object"]["message"]
+            updates.append(
+                Update(
+                    type=update["type"],
+                    object=UpdateObject(
+                        peer_id=message["peer_id"],
+                        user_id=message["from_id"],
+                        body=message["text"],
+                        conversation_message_id=message.get(
+                            "conversation_message_id"
                         ),
-                    )
+                        payload=parse_payload(message.get("payload")),
+                    ),
                 )
-        print(updates)
-        await self.app.store.bots_manager.handle_updates(updates)
+            )
+        return updates
 
     async def send_message(self, message: Message) -> None:
-        async with self.session.get(
-            self._build_query(
-                API_PATH,
-                "messages.send",
-                params={
-                    "random_id": random.randint(1, 2**32),
-                    "peer_id": message.peer_id,
-                    "message": message.text,
-                    "access_token": self.app.config.bot.token,
-                },
-            )
-        ) as resp:
-            data = await resp.json()
-            self.logger.info(data)
+        params = {
+            "random_id": random.randint(1, 2**32),
+            "peer_id": message.peer_id,
+            "message": message.text,
+            "access_token": self.app.config.bot.token,
+        }
+        if message.keyboard is not None:
+            params["keyboard"] = message.keyboard
+        data = await self._call(
+            "messages.send",
+            self.app.config.bot.api_path,
+            "messages.send",
+            params=params,
+        )
+        self.logger.info(data)
 
     async def get_players(self, peer_id) -> List[Player]:
-        async with self.session.get(
-            self._build_query(
-                API_PATH,
+        data = (
+            await self._call(
+                "messages.getConversationMembers",
+                self.app.config.bot.api_path,
                 "messages.getConversationMembers",
                 params={
                     "peer_id": peer_id,
                     "access_token": self.app.config.bot.token,
                 },
             )
-        ) as resp:
-            data = (await resp.json())["response"]
-            self.logger.info(data)
-            players = [
-                Player(
-                    user_id=value["id"],
-                    online=value["online"],
-                    name=f"{value['first_name']} {value['last_name']}",
-                )
-                for value in data["profiles"]
-            ]
-            return players
+        )["response"]
+        self.logger.info(data)
+        players = [
+            Player(
+                user_id=value["id"],
+                online=value["online"],
+                name=f"{value['first_name']} {value['last_name']}",
+            )
+            for value in data["profiles"]
+        ]
+        return players
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass
@@ -6,6 +7,8 @@ class UpdateObject:
     peer_id: int
     user_id: int
     body: str
+    conversation_message_id: Optional[int] = None
+    payload: Optional[dict] = None
 
 
 @dataclass
@@ -18,6 +21,7 @@ class Update:
 class Message:
     peer_id: int
     text: str
+    keyboard: Optional[str] = None
 
 
 @dataclass
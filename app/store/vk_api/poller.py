@@ -1,7 +1,10 @@
 import asyncio
+import logging
 from asyncio import Task
+from time import perf_counter
 from typing import Optional
 
+from app.metrics.metrics import VK_POLL_CYCLE_SECONDS, VK_POLL_UPDATES
 from app.store import Store
 
 
@@ -9,17 +12,38 @@ class Poller:
     def __init__(self, store: Store):
         self.store = store
         self.is_running = False
+        self.is_handling = False
         self.poll_task: Optional[Task] = None
+        self._cycle = VK_POLL_CYCLE_SECONDS.labels()
+        self._batch = VK_POLL_UPDATES.labels()
+        self.logger = logging.getLogger("poller")
 
     async def start(self):
         self.is_running = True
         self.poll_task = asyncio.create_task(self.poll())
 
-    async def stop(self):
+    async def stop(self, timeout: Optional[float] = None):
         self.is_running = False
-        await self.poll_task
+        if self.poll_task is None:
+            return
+        if not self.is_handling:
+            self.poll_task.cancel()
+        _, pending = await asyncio.wait({self.poll_task}, timeout=timeout)
+        if pending:
+            self.poll_task.cancel()
+            await asyncio.wait(pending)
 
     async def poll(self):
         while self.is_running:
+            started = perf_counter()
             updates = await self.store.vk_api.poll()
-            await self.store.bots_manager.handle_updates(updates)
+            self._batch.observe(len(updates))
+            self.is_handling = True
+            try:
+                await self.store.bots_manager.handle_updates(updates)
+            except Exception as e:
+                # one broken batch must not stop the bot
+                self.logger.error("update batch failed", exc_info=e)
+            finally:
+                self.is_handling = False
+            self._cycle.observe(perf_counter() - started)
@@ -1,114 +1,300 @@
-from typing import Optional
-
-from sqlalchemy import select, delete
+import asyncio
+import typing
+from time import monotonic
+from typing import AsyncIterator, Collection, Container, Optional
 
 from app.base.base_accessor import BaseAccessor
+from app.metrics.metrics import observe_query
+from app.store.words.compact import CompactDictionary
+from app.store.words.snapshot import SharedSnapshot
+from app.store.words.suggest import SuggestionIndex, rank
+from app.tracing.tracer import KIND_CLIENT, traced
 from app.words.models import (
     WordModel, SettingModel,
 )
+from app.words.normalize import normalize
+
+if typing.TYPE_CHECKING:
+    from app.store.storage.base import Storage
+    from app.web.app import Application
 
 
 class WordsAccessor(BaseAccessor):
+    def __init__(self, app: "Application", *args, **kwargs):
+        super().__init__(app, *args, **kwargs)
+        self.version = 0
+        self._version_stale = True
+        self._version_checked_at = 0.0
+        self._index: Optional[CompactDictionary] = None
+        self._index_version: Optional[int] = None
+        self._index_lock: Optional[asyncio.Lock] = None
+        self.snapshot: Optional[SharedSnapshot] = None
+        self._suggestions: Optional[SuggestionIndex] = None
+        self._suggestions_task: Optional[asyncio.Task] = None
+        self._suggestions_lock: Optional[asyncio.Lock] = None
+
+    async def connect(self, app: "Application"):
+        if app.config.words.snapshot_path:
+            self.snapshot = SharedSnapshot(
+                app.config.words.snapshot_path,
+                check_interval=app.config.words.snapshot_check_interval,
+            )
+            self.snapshot.refresh()
+        await self.storage.watch_version(self._on_version)
+
+    async def disconnect(self, app: "Application"):
+        await self.storage.unwatch_version()
+
+    def _on_version(self, version: int) -> None:
+        if version > self.version:
+            self.version = version
+            self.storage.version_seen()
+        self._version_checked_at = monotonic()
+
+    @property
+    def storage(self) -> "Storage":
+        return self.app.store.storage
+
+    def bump_version(self) -> None:
+        # the storage moves the shared version together with the write, the
+        # local copy only has to be read again
+        self._version_stale = True
+        self.storage.changed()
+
+    async def get_version(self) -> int:
+        """Dictionary version shared by every process of the deployment.
+
+        Writes of other processes are pushed by the storage when it can watch
+        the version, otherwise they are noticed within version_check_interval.
+        """
+        now = monotonic()
+        interval = self.app.config.words.version_check_interval
+        if self._version_stale or (
+            not self.storage.watching
+            and now - self._version_checked_at >= interval
+        ):
+            self._version_stale = False
+            self._version_checked_at = now
+            version = await self.storage.dictionary_version()
+            if version != self.version:
+                self.version = version
+                self.storage.version_seen()
+        return self.version
+
+    def clear(self) -> None:
+        self.version = 0
+        self._version_stale = True
+        self._index = None
+        self._index_version = None
+        self._suggestions = None
+
+    @observe_query("create_word")
+    @traced("words.create_word", KIND_CLIENT)
     async def create_word(self, title: str, is_correct: bool) -> WordModel:
-        new_word = WordModel(title=title, is_correct=is_correct)
-        async with self.app.database.session() as session:
-            session.add(new_word)
-            await session.commit()
-        return new_word
+        word = await self.storage.insert_word(
+            title, is_correct, normalize(title)
+        )
+        self.bump_version()
+        return word
 
+    @observe_query("delete_word")
+    @traced("words.delete_word", KIND_CLIENT)
     async def delete_word(self, word_id: int) -> int:
-        query = delete(WordModel).where(WordModel.id == word_id)
-        async with self.app.database.session() as session:
-            await session.execute(query)
-            await session.commit()
+        await self.storage.delete_word(word_id)
+        self.bump_version()
         return word_id
 
+    @observe_query("patch_word")
+    @traced("words.patch_word", KIND_CLIENT)
     async def patch_word(self, word_id, title: str = None, is_correct: bool = None) -> WordModel:
-        query = select(WordModel).where(WordModel.id == word_id)
-        async with self.app.database.session() as session:
-            result = await session.execute(query)
-            word = result.scalar()
-            if word:
-                if title is not None:
-                    word.title = title
-                if is_correct is not None:
-                    word.is_correct = is_correct
-                await session.commit()
+        values = {}
+        if title is not None:
+            values.update(title=title, canonical=normalize(title))
+        if is_correct is not None:
+            values["is_correct"] = is_correct
+        word = await self.storage.update_word(word_id, **values)
+        if word:
+            self.bump_version()
         return word
 
+    @observe_query("list_words")
+    @traced("words.list_words", KIND_CLIENT)
     async def list_words(self, is_correct: Optional[bool] = None) -> list[WordModel]:
-        query = select(WordModel)
-        if is_correct is not None:
-            query = query.where(WordModel.is_correct == is_correct)
-        async with self.app.database.session() as session:
-            response = await session.execute(query)
-            return list(response.scalars().unique())
+        return await self.storage.list_words(is_correct)
+
+    def stream_words(
+        self, is_correct: Optional[bool] = None, batch_size: int = 5000
+    ) -> AsyncIterator[list[tuple[int, str, bool]]]:
+        return self.storage.stream_words(is_correct, batch_size)
+
+    @observe_query("count_words")
+    @traced("words.count_words", KIND_CLIENT)
+    async def count_words(self, is_correct: Optional[bool] = None) -> int:
+        return await self.storage.count_words(is_correct)
+
+    @observe_query("list_words_page")
+    @traced("words.list_words_page", KIND_CLIENT)
+    async def list_words_page(
+        self, after_id: int, limit: int, is_correct: Optional[bool] = None
+    ) -> list[WordModel]:
+        return await self.storage.list_words_page(after_id, limit, is_correct)
 
+    @observe_query("import_words")
+    @traced("words.import_words", KIND_CLIENT)
+    async def import_words(self, words: list[dict]) -> int:
+        inserted = await self.storage.import_words(words)
+        if inserted:
+            self.bump_version()
+        return inserted
+
+    @observe_query("get_word_by_title")
+    @traced("words.get_word_by_title", KIND_CLIENT)
     async def get_word_by_title(self, title: str) -> Optional[WordModel]:
-        query = select(WordModel).where(WordModel.title == title)
-        async with self.app.database.session() as session:
-            response = await session.execute(query)
-            word = response.scalar()
-        if word is None:
-            return
-        return word
+        return await self.storage.get_word_by_canonical(normalize(title))
 
+    @observe_query("get_word_by_id")
+    @traced("words.get_word_by_id", KIND_CLIENT)
     async def get_word_by_id(self, word_id: int) -> Optional[WordModel]:
-        query = select(WordModel).where(WordModel.id == word_id)
-        async with self.app.database.session() as session:
-            response = await session.execute(query)
-            word = response.scalar()
-        if word is None:
+        return await self.storage.get_word_by_id(word_id)
+
+    async def get_index(self) -> CompactDictionary:
+        if self.snapshot is not None:
+            return self.snapshot.get()
+        version = await self.get_version()
+        if self._index_version != version:
+            if self._index_lock is None:
+                self._index_lock = asyncio.Lock()
+            async with self._index_lock:
+                if self._index_version != version:
+                    self._index = await self.load_dictionary()
+                    self._index_version = version
+        return self._index
+
+    @observe_query("load_dictionary")
+    @traced("words.load_dictionary", KIND_CLIENT)
+    async def load_dictionary(self) -> CompactDictionary:
+        return CompactDictionary.from_words(
+            await self.storage.dictionary_rows()
+        )
+
+    async def build_suggestions(self) -> SuggestionIndex:
+        if self._suggestions_lock is None:
+            self._suggestions_lock = asyncio.Lock()
+        async with self._suggestions_lock:
+            index = await self.get_index()
+            suggestions = self._suggestions
+            if suggestions is None or suggestions.dictionary is not index:
+                config = self.app.config.words
+                # a million words take seconds to index, so the loop keeps
+                # serving while a worker thread builds it
+                suggestions = await asyncio.get_running_loop().run_in_executor(
+                    None,
+                    SuggestionIndex.build,
+                    index,
+                    config.suggest_max_distance,
+                    config.suggest_prefix_length,
+                )
+                self._suggestions = suggestions
+        return suggestions
+
+    async def _rebuild_suggestions(self):
+        try:
+            await self.build_suggestions()
+        except Exception as e:
+            self.logger.error("suggestion index build failed", exc_info=e)
+
+    async def suggest(
+        self,
+        title: str,
+        limit: Optional[int] = None,
+        first_letter: Optional[str] = None,
+        exclude: Optional[Container] = None,
+    ) -> list[tuple[str, int]]:
+        index = await self.get_index()
+        suggestions = self._suggestions
+        if suggestions is None or suggestions.dictionary is not index:
+            # never wait for a build, a stale index still gives useful hints
+            if self._suggestions_task is None or self._suggestions_task.done():
+                self._suggestions_task = asyncio.create_task(
+                    self._rebuild_suggestions()
+                )
+            if suggestions is None:
+                return []
+        return suggestions.lookup(
+            normalize(title),
+            limit or self.app.config.words.suggest_limit,
+            first_letter=first_letter,
+            exclude=exclude,
+        )
+
+    @observe_query("suggest_words")
+    @traced("words.suggest_words", KIND_CLIENT)
+    async def suggest_from_database(
+        self, title: str, limit: Optional[int] = None
+    ) -> list[tuple[str, int]]:
+        canonical = normalize(title)
+        limit = limit or self.app.config.words.suggest_limit
+        max_distance = self.app.config.words.suggest_max_distance
+        titles = await self.storage.nearest_words(
+            canonical, max_distance, limit * 10
+        )
+        return rank(canonical, titles, max_distance, limit)
+
+    async def get_random_word(
+        self,
+        first_letter: Optional[str] = None,
+        exclude: Optional[Collection[str]] = None,
+    ) -> Optional[WordModel]:
+        index = await self.get_index()
+        if first_letter is not None:
+            first_letter = normalize(first_letter)
+        if exclude:
+            exclude = {normalize(title) for title in exclude}
+        position = index.random_correct(first_letter, exclude)
+        if position is None:
             return
-        return word
+        return WordModel(
+            id=index.ids[position], title=index.title(position), is_correct=True
+        )
 
+    @observe_query("create_setting")
+    @traced("words.create_setting", KIND_CLIENT)
     async def create_setting(self, title: str, timeout: int) -> SettingModel:
-        new_setting = SettingModel(title=title, timeout=timeout)
-        async with self.app.database.session() as session:
-            session.add(new_setting)
-            await session.commit()
-        return new_setting
+        setting = await self.storage.insert_setting(title, timeout)
+        self.bump_version()
+        return setting
 
+    @observe_query("delete_setting")
+    @traced("words.delete_setting", KIND_CLIENT)
     async def delete_setting(self, setting_id: int) -> int:
-        query = delete(SettingModel).where(SettingModel.id == setting_id)
-        async with self.app.database.session() as session:
-            await session.execute(query)
-            await session.commit()
+        await self.storage.delete_setting(setting_id)
+        self.bump_version()
         return setting_id
 
+    @observe_query("patch_setting")
+    @traced("words.patch_setting", KIND_CLIENT)
     async def patch_setting(self, setting_id, title: str = None, timeout: bool = None) -> SettingModel:
-        query = select(SettingModel).where(SettingModel.id == setting_id)
-        async with self.app.database.session() as session:
-            result = await session.execute(query)
-            setting = result.scalar()
-            if setting:
-                if title is not None:
-                    setting.title = title
-                if timeout is not None:
-                    setting.timeout = timeout
-                await session.commit()
+        values = {}
+        if title is not None:
+            values["title"] = title
+        if timeout is not None:
+            values["timeout"] = timeout
+        setting = await self.storage.update_setting(setting_id, **values)
+        if setting:
+            self.bump_version()
         return setting
 
+    @observe_query("list_settings")
+    @traced("words.list_settings", KIND_CLIENT)
     async def list_settings(self) -> list[SettingModel]:
-        query = select(SettingModel)
-        async with self.app.database.session() as session:
-            response = await session.execute(query)
-            return list(response.scalars().unique())
+        return await self.storage.list_settings()
 
+    @observe_query("get_setting_by_title")
+    @traced("words.get_setting_by_title", KIND_CLIENT)
     async def get_setting_by_title(self, title: str) -> Optional[SettingModel]:
-        query = select(SettingModel).where(SettingModel.title == title)
-        async with self.app.database.session() as session:
-            response = await session.execute(query)
-            setting = response.scalar()
-        if setting is None:
-            return
-        return setting
+        return await self.storage.get_setting_by_title(title)
 
+    @observe_query("get_setting_by_id")
+    @traced("words.get_setting_by_id", KIND_CLIENT)
     async def get_setting_by_id(self, setting_id: int) -> Optional[SettingModel]:
-        query = select(SettingModel).where(SettingModel.id == setting_id)
-        async with self.app.database.session() as session:
-            response = await session.execute(query)
-            setting = response.scalar()
-        if setting is None:
-            return
-        return setting
+        return await self.storage.get_setting_by_id(setting_id)
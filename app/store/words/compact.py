@@ -0,0 +1,174 @@
+import random
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Collection, Iterable, Iterator, Optional, Sequence
+
+REJECTION_ATTEMPTS = 8
+
+
+class CompactDictionary:
+    """Canonical titles sorted by their UTF-8 bytes and joined into one blob.
+
+    Exact lookup is a binary search, every prefix is a contiguous range.
+    Display titles that differ from the canonical one, like "Ёж" for "еж",
+    are kept in a second blob, an empty range there means they are equal.
+    """
+
+    def __init__(
+        self,
+        blob: bytes,
+        offsets: Sequence[int],
+        ids: Sequence[int],
+        correct_bits: bytes,
+        correct: Sequence[int],
+        titles: bytes = b"",
+        title_offsets: Optional[Sequence[int]] = None,
+    ):
+        self.blob = blob
+        self.offsets = offsets
+        self.ids = ids
+        self.correct_bits = correct_bits
+        self.correct = correct
+        self.titles = titles
+        self.title_offsets = (
+            title_offsets
+            if title_offsets is not None
+            else array("I", [0]) * (len(ids) + 1)
+        )
+
+    @classmethod
+    def from_words(cls, words: Iterable[tuple]) -> "CompactDictionary":
+        """Build from (id, canonical, is_correct[, title]) rows."""
+        entries = sorted(
+            (canonical.encode("utf-8"), word_id, is_correct, title)
+            for word_id, canonical, is_correct, *title in words
+        )
+        offsets = array("I", [0])
+        ids = array("I")
+        correct = array("I")
+        correct_bits = bytearray((len(entries) + 7) // 8)
+        title_offsets = array("I", [0])
+        chunks = []
+        title_chunks = []
+        position = 0
+        title_position = 0
+        for i, (key, word_id, is_correct, title) in enumerate(entries):
+            chunks.append(key)
+            position += len(key)
+            offsets.append(position)
+            ids.append(word_id)
+            if is_correct:
+                correct_bits[i >> 3] |= 1 << (i & 7)
+                correct.append(i)
+            if title and title[0].encode("utf-8") != key:
+                title_key = title[0].encode("utf-8")
+                title_chunks.append(title_key)
+                title_position += len(title_key)
+            title_offsets.append(title_position)
+        return cls(
+            b"".join(chunks),
+            offsets,
+            ids,
+            bytes(correct_bits),
+            correct,
+            b"".join(title_chunks),
+            title_offsets,
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, title: str) -> bool:
+        return self.find(title) is not None
+
+    def _key(self, i: int) -> bytes:
+        return bytes(self.blob[self.offsets[i] : self.offsets[i + 1]])
+
+    def canonical(self, i: int) -> str:
+        return self._key(i).decode("utf-8")
+
+    def title(self, i: int) -> str:
+        start, stop = self.title_offsets[i], self.title_offsets[i + 1]
+        if start == stop:
+            return self.canonical(i)
+        return bytes(self.titles[start:stop]).decode("utf-8")
+
+    def is_correct(self, i: int) -> bool:
+        return bool(self.correct_bits[i >> 3] & (1 << (i & 7)))
+
+    def _lower_bound(self, key: bytes) -> int:
+        lo, hi = 0, len(self.ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find(self, title: str) -> Optional[int]:
+        key = title.encode("utf-8")
+        i = self._lower_bound(key)
+        if i < len(self.ids) and self._key(i) == key:
+            return i
+        return None
+
+    def get(self, title: str) -> Optional[tuple[int, bool]]:
+        i = self.find(title)
+        if i is None:
+            return None
+        return self.ids[i], self.is_correct(i)
+
+    def prefix_range(self, prefix: str) -> tuple[int, int]:
+        key = prefix.encode("utf-8")
+        # 0xff never occurs in UTF-8, so it bounds every key with this prefix
+        return self._lower_bound(key), self._lower_bound(key + b"\xff")
+
+    def iter_prefix(self, prefix: str) -> Iterator[str]:
+        lo, hi = self.prefix_range(prefix)
+        for i in range(lo, hi):
+            yield self.title(i)
+
+    def random_correct(
+        self,
+        first_letter: Optional[str] = None,
+        exclude: Optional[Collection[str]] = None,
+        rng: random.Random = random,
+    ) -> Optional[int]:
+        if first_letter is None:
+            start, stop = 0, len(self.correct)
+        else:
+            lo, hi = self.prefix_range(first_letter)
+            start = bisect_left(self.correct, lo)
+            stop = bisect_right(self.correct, hi - 1)
+        count = stop - start
+        if count <= 0:
+            return None
+
+        for _ in range(REJECTION_ATTEMPTS):
+            i = self.correct[start + int(rng.random() * count)]
+            if not exclude or self.canonical(i) not in exclude:
+                return i
+
+        left = [
+            self.correct[j]
+            for j in range(start, stop)
+            if self.canonical(self.correct[j]) not in exclude
+        ]
+        if not left:
+            return None
+        return rng.choice(left)
+
+    def memory_size(self) -> int:
+        return sum(
+            len(part) * getattr(part, "itemsize", 1)
+            for part in (
+                self.blob,
+                self.offsets,
+                self.ids,
+                self.correct_bits,
+                self.correct,
+                self.titles,
+                self.title_offsets,
+            )
+        )
@@ -0,0 +1,182 @@
+import argparse
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from typing import Optional
+
+from app.store.words.compact import CompactDictionary
+
+MAGIC = b"WVKSNAP2"
+HEADER = struct.Struct("<8sQIIQQ")
+
+logger = logging.getLogger("snapshot")
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def write_snapshot(
+    path: str, dictionary: CompactDictionary, version: Optional[int] = None
+) -> int:
+    if sys.byteorder != "little":
+        raise SnapshotError("snapshots are written in little-endian order")
+    if version is None:
+        version = time.time_ns()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(
+            HEADER.pack(
+                MAGIC,
+                version,
+                len(dictionary),
+                len(dictionary.correct),
+                len(dictionary.blob),
+                len(dictionary.titles),
+            )
+        )
+        for part in (
+            dictionary.offsets,
+            dictionary.ids,
+            dictionary.correct,
+            dictionary.title_offsets,
+        ):
+            f.write(array("I", part).tobytes())
+        f.write(bytes(dictionary.correct_bits))
+        f.write(bytes(dictionary.blob))
+        f.write(bytes(dictionary.titles))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return version
+
+
+def load_snapshot(path: str) -> tuple[CompactDictionary, int, mmap.mmap]:
+    with open(path, "rb") as f:
+        # mmap refuses empty files with ValueError
+        if os.fstat(f.fileno()).st_size < HEADER.size:
+            raise SnapshotError(f"{path} is too short")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    (
+        magic,
+        version,
+        count,
+        correct_count,
+        blob_len,
+        titles_len,
+    ) = HEADER.unpack_from(mapped)
+    size = (
+        HEADER.size
+        + (count + 1) * 4
+        + count * 4
+        + correct_count * 4
+        + (count + 1) * 4
+        + (count + 7) // 8
+        + blob_len
+        + titles_len
+    )
+    # checked before any view into the mapping exists, so it can be closed
+    if magic != MAGIC:
+        mapped.close()
+        raise SnapshotError(f"{path} is not a words snapshot")
+    if size != mapped.size():
+        mapped.close()
+        raise SnapshotError(f"{path} has unexpected size")
+
+    view = memoryview(mapped)
+    position = HEADER.size
+
+    def take(size: int) -> memoryview:
+        nonlocal position
+        part = view[position : position + size]
+        position += size
+        return part
+
+    offsets = take((count + 1) * 4).cast("I")
+    ids = take(count * 4).cast("I")
+    correct = take(correct_count * 4).cast("I")
+    title_offsets = take((count + 1) * 4).cast("I")
+    correct_bits = take((count + 7) // 8)
+    blob = take(blob_len)
+    titles = take(titles_len)
+    dictionary = CompactDictionary(
+        blob, offsets, ids, correct_bits, correct, titles, title_offsets
+    )
+    return dictionary, version, mapped
+
+
+class SharedSnapshot:
+    def __init__(self, path: str, check_interval: float = 5.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.dictionary: Optional[CompactDictionary] = None
+        self.version: Optional[int] = None
+        self._mapped: Optional[mmap.mmap] = None
+        self._stat: Optional[tuple[int, int]] = None
+        self._checked_at = 0.0
+
+    def _file_id(self) -> tuple[int, int]:
+        stat = os.stat(self.path)
+        return stat.st_ino, stat.st_mtime_ns
+
+    def refresh(self) -> bool:
+        self._checked_at = time.monotonic()
+        file_id = self._file_id()
+        if file_id == self._stat:
+            return False
+        dictionary, version, mapped = load_snapshot(self.path)
+        # readers holding the previous dictionary keep its mapping alive
+        self.dictionary, self.version, self._mapped = (
+            dictionary,
+            version,
+            mapped,
+        )
+        self._stat = file_id
+        return True
+
+    def get(self) -> CompactDictionary:
+        if (
+            self.dictionary is None
+            or time.monotonic() - self._checked_at > self.check_interval
+        ):
+            try:
+                self.refresh()
+            except (OSError, SnapshotError) as e:
+                # a file being replaced or a bad export must not take the
+                # bot down, the last good mapping is still valid
+                if self.dictionary is None:
+                    raise
+                logger.error("snapshot %s reload failed", self.path, exc_info=e)
+        return self.dictionary
+
+
+async def export(config_path: str, output: str) -> int:
+    from app.web.app import setup_app
+
+    app = setup_app(config_path)
+    await app.database.connect()
+    try:
+        dictionary = await app.store.words.load_dictionary()
+    finally:
+        await app.database.disconnect()
+    return write_snapshot(output, dictionary)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export the words table to a binary snapshot"
+    )
+    parser.add_argument("--config", default="config.yml")
+    parser.add_argument("--output", default="words.snapshot")
+    args = parser.parse_args()
+    version = asyncio.run(export(args.config, args.output))
+    print(f"{args.output}: version {version}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+from array import array
+from bisect import bisect_left
+from typing import Container, Iterable, Iterator, Optional
+
+from app.store.words.compact import CompactDictionary
+
+HASH_MASK = 0xFFFFFFFF
+
+
+def bounded_distance(a: str, b: str, max_distance: int) -> Optional[int]:
+    """Optimal string alignment distance, or None once it exceeds the bound."""
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    if a == b:
+        return 0
+    previous_row = None
+    row = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        best = i
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            value = min(row[j] + 1, current[j - 1] + 1, row[j - 1] + cost)
+            if (
+                previous_row is not None
+                and j > 1
+                and a[i - 1] == b[j - 2]
+                and a[i - 2] == b[j - 1]
+            ):
+                value = min(value, previous_row[j - 2] + 1)
+            current[j] = value
+            best = min(best, value)
+        if best > max_distance:
+            return None
+        previous_row, row = row, current
+    distance = row[-1]
+    return distance if distance <= max_distance else None
+
+
+def deletes(word: str, max_distance: int) -> set[str]:
+    variants = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {
+            variant[:i] + variant[i + 1 :]
+            for variant in frontier
+            for i in range(len(variant))
+        }
+        variants |= frontier
+    return variants
+
+
+class SuggestionIndex:
+    """Symmetric delete index over the correct words of a dictionary.
+
+    Every word is filed under the hashes of its prefix with up to
+    max_distance characters deleted. A query generates the same deletes, so
+    candidates are found with a few binary searches instead of a scan, and
+    only those candidates have their real edit distance computed.
+    Entries are packed as (hash << 32 | position) into one sorted array.
+    """
+
+    def __init__(
+        self,
+        dictionary: CompactDictionary,
+        entries: array,
+        max_distance: int,
+        prefix_length: int,
+    ):
+        self.dictionary = dictionary
+        self.entries = entries
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+
+    @classmethod
+    def build(
+        cls,
+        dictionary: CompactDictionary,
+        max_distance: int = 1,
+        prefix_length: int = 7,
+    ) -> "SuggestionIndex":
+        packed = array("Q")
+        for position in dictionary.correct:
+            canonical = dictionary.canonical(position)
+            for variant in deletes(canonical[:prefix_length], max_distance):
+                packed.append((hash(variant) & HASH_MASK) << 32 | position)
+        entries = array("Q", sorted(packed))
+        return cls(dictionary, entries, max_distance, prefix_length)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _positions(self, variant: str) -> Iterator[int]:
+        key = (hash(variant) & HASH_MASK) << 32
+        entries = self.entries
+        i = bisect_left(entries, key)
+        while i < len(entries) and entries[i] >> 32 == key >> 32:
+            yield entries[i] & HASH_MASK
+            i += 1
+
+    def lookup(
+        self,
+        word: str,
+        limit: int = 5,
+        max_distance: Optional[int] = None,
+        first_letter: Optional[str] = None,
+        exclude: Optional[Container] = None,
+    ) -> list[tuple[str, int]]:
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+        seen = set()
+        candidates = []
+        for variant in deletes(word[: self.prefix_length], max_distance):
+            for position in self._positions(variant):
+                if position in seen:
+                    continue
+                seen.add(position)
+                title = self.dictionary.canonical(position)
+                if first_letter and not title.startswith(first_letter):
+                    continue
+                # exclude may hold word ids, titles or both
+                if exclude is not None and (
+                    self.dictionary.ids[position] in exclude or title in exclude
+                ):
+                    continue
+                candidates.append(title)
+        return rank(word, candidates, max_distance, limit)
+
+    def memory_size(self) -> int:
+        return len(self.entries) * self.entries.itemsize
+
+
+def rank(
+    word: str, titles: Iterable[str], max_distance: int, limit: int
+) -> list[tuple[str, int]]:
+    found = []
+    for title in titles:
+        distance = bounded_distance(word, title, max_distance)
+        if distance is not None and distance > 0:
+            found.append((distance, title))
+    found.sort()
+    return [(title, distance) for distance, title in found[:limit]]
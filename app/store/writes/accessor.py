@@ -0,0 +1,186 @@
+import asyncio
+import typing
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from sqlalchemy.sql.dml import Insert, UpdateBase
+
+from app.base.base_accessor import BaseAccessor
+from app.metrics.metrics import WRITE_BATCH_FALLBACKS, WRITE_BATCH_SIZE
+from app.tracing.tracer import KIND_CLIENT, traced
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+
+class BatchMismatch(Exception):
+    pass
+
+
+@dataclass
+class PendingWrite:
+    statement: UpdateBase
+    params: dict
+    future: asyncio.Future = field(repr=False)
+    key: Optional[str] = None
+
+    def resolve(self, result: Any) -> None:
+        if not self.future.done():
+            self.future.set_result(result)
+
+    def fail(self, error: BaseException) -> None:
+        if not self.future.done():
+            self.future.set_exception(error)
+
+
+class WritesAccessor(BaseAccessor):
+    """Collects small writes from many coroutines into shared transactions.
+
+    Writes submitted within `window` seconds are grouped by statement. Every
+    INSERT group becomes one multi-row INSERT, other statements run as one
+    executemany, and the whole batch commits once. PostgreSQL does not
+    promise RETURNING rows in VALUES order, so an INSERT that returns rows
+    is only grouped when its writes name a unique key column to match rows
+    by, otherwise it runs once per write. If the batch fails, it is
+    replayed with a savepoint per write, so only the writes that really fail
+    get the error and the rest still commit together.
+    Callers get their own result or exception through a future.
+    """
+
+    def __init__(self, app: "Application", *args, **kwargs):
+        super().__init__(app, *args, **kwargs)
+        self.pending: list[PendingWrite] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+        self._flush_lock: Optional[asyncio.Lock] = None
+        app.on_shutdown.append(self.stop)
+
+    async def stop(self, app: "Application"):
+        await self.flush()
+
+    async def execute(
+        self, statement: UpdateBase, params: dict, key: Optional[str] = None
+    ) -> Any:
+        """Queue a write and wait for its batch.
+
+        Returns the RETURNING row of an insert, or None. key is a unique
+        column that is both in params and in the RETURNING clause.
+        """
+        loop = asyncio.get_running_loop()
+        write = PendingWrite(statement, params, loop.create_future(), key)
+        self.pending.append(write)
+        if len(self.pending) >= self.app.config.writes.max_batch:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(
+                self.app.config.writes.window, self._start_flush
+            )
+        result = await write.future
+        # the batch ran in another task, so this request has to be told
+        # about the write to keep reading from the primary
+        self.app.database.mark_written()
+        return result
+
+    async def flush(self) -> None:
+        self._start_flush()
+        if self._tasks:
+            await asyncio.wait(set(self._tasks))
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, []
+        task = asyncio.create_task(self._flush(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _lock(self) -> asyncio.Lock:
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        return self._flush_lock
+
+    async def _flush(self, batch: list[PendingWrite]) -> None:
+        # batches are written one at a time, in the order they were queued
+        async with self._lock():
+            WRITE_BATCH_SIZE.observe(len(batch))
+            try:
+                await self._write(batch)
+            except Exception as e:
+                self.logger.error("write batch failed", exc_info=e)
+                for write in batch:
+                    write.fail(e)
+
+    @traced("writes.batch", KIND_CLIENT)
+    async def _write(self, batch: list[PendingWrite]) -> None:
+        groups: dict[tuple, list[PendingWrite]] = {}
+        for write in batch:
+            groups.setdefault((write.statement, write.key), []).append(write)
+        async with self.app.database.session() as session:
+            connection = await session.connection()
+            # the batch itself runs in a savepoint, so a failure leaves the
+            # transaction usable for the replay
+            try:
+                async with session.begin_nested():
+                    results = []
+                    for (statement, key), writes in groups.items():
+                        rows = await self._execute_group(
+                            connection, statement, key, writes
+                        )
+                        results += zip(writes, rows)
+            except Exception:
+                WRITE_BATCH_FALLBACKS.inc()
+                results = []
+                for write in batch:
+                    try:
+                        async with session.begin_nested():
+                            result = await self._execute_one(connection, write)
+                    except Exception as e:
+                        write.fail(e)
+                    else:
+                        results.append((write, result))
+            await session.commit()
+        for write, result in results:
+            write.resolve(result)
+
+    @classmethod
+    async def _execute_group(
+        cls,
+        connection,
+        statement: UpdateBase,
+        key: Optional[str],
+        writes: list[PendingWrite],
+    ) -> list:
+        if not isinstance(statement, Insert):
+            params = [write.params for write in writes]
+            await connection.execute(statement, params)
+            return [None] * len(writes)
+        if statement.exported_columns and key is None:
+            return [
+                await cls._execute_one(connection, write) for write in writes
+            ]
+        result = await connection.execute(
+            statement.values([write.params for write in writes])
+        )
+        if not result.returns_rows:
+            return [None] * len(writes)
+        rows = {row._mapping[key]: row for row in result}
+        # ON CONFLICT DO NOTHING returns fewer rows, those writes are then
+        # replayed one by one to tell which of them were skipped
+        if len(rows) != len(writes):
+            raise BatchMismatch(
+                f"{len(writes)} rows sent, {len(rows)} returned"
+            )
+        return [rows[write.params[key]] for write in writes]
+
+    @staticmethod
+    async def _execute_one(connection, write: PendingWrite) -> Any:
+        if isinstance(write.statement, Insert):
+            result = await connection.execute(
+                write.statement.values(write.params)
+            )
+        else:
+            result = await connection.execute(write.statement, write.params)
+        return result.first() if result.returns_rows else None
@@ -0,0 +1,22 @@
+import typing
+
+from app.tracing.exporters import OtlpJsonFileExporter, RingBufferExporter
+from app.tracing.tracer import TRACER
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+
+def setup_tracing(app: "Application"):
+    config = app.config.tracing
+    if config.exporter == "file":
+        exporter = OtlpJsonFileExporter(config.path)
+    else:
+        exporter = RingBufferExporter(config.buffer_size)
+    TRACER.configure(config.sample_rate, exporter)
+    app.tracer = TRACER
+
+    async def close_tracer(_: "Application"):
+        TRACER.close()
+
+    app.on_cleanup.append(close_tracer)
@@ -0,0 +1,89 @@
+import json
+from collections import deque
+from typing import Optional, TextIO
+
+from app.tracing.tracer import Span
+
+SERVICE_NAME = "words_vk"
+
+
+def _attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+def span_to_otlp(span: Span) -> dict:
+    data = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "parentSpanId": span.parent_id or "",
+        "name": span.name,
+        "kind": span.kind,
+        "startTimeUnixNano": str(span.start),
+        "endTimeUnixNano": str(span.end),
+        "attributes": [
+            _attribute(key, value) for key, value in span.attributes.items()
+        ],
+        "status": {"code": 0},
+    }
+    if span.error:
+        data["status"] = {"code": 2, "message": span.error}
+    return data
+
+
+def trace_to_otlp(spans: list[Span]) -> dict:
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [_attribute("service.name", SERVICE_NAME)]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "app.tracing"},
+                        "spans": [span_to_otlp(span) for span in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class RingBufferExporter:
+    def __init__(self, size: int = 1000):
+        self.traces: deque[list[Span]] = deque(maxlen=size)
+
+    def export(self, spans: list[Span]) -> None:
+        self.traces.append(spans)
+
+    def dump(self, limit: Optional[int] = None) -> list[dict]:
+        traces = list(self.traces)
+        if limit is not None:
+            traces = traces[-limit:]
+        return [trace_to_otlp(spans) for spans in traces]
+
+    def close(self) -> None:
+        return
+
+
+class OtlpJsonFileExporter:
+    def __init__(self, path: str):
+        self.path = path
+        self._file: Optional[TextIO] = None
+
+    def export(self, spans: list[Span]) -> None:
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(trace_to_otlp(spans)) + "\n")
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,10 @@
+import typing
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+
+def setup_routes(app: "Application"):
+    from app.tracing.views import TraceListView
+
+    app.router.add_view("/tracing.list_traces", TraceListView)
@@ -0,0 +1,5 @@
+from marshmallow import Schema, fields, validate
+
+
+class TraceListQuerySchema(Schema):
+    limit = fields.Int(required=False, validate=validate.Range(min=1))
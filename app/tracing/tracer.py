@@ -0,0 +1,155 @@
+import random
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Optional
+
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar(
+    "current_span", default=None
+)
+
+
+class NoopSpan:
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NOOP_SPAN = NoopSpan()
+
+
+class Span:
+    __slots__ = (
+        "tracer",
+        "trace",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "name",
+        "kind",
+        "start",
+        "end",
+        "attributes",
+        "error",
+        "_token",
+    )
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        kind: int,
+        parent: Optional["Span"],
+        attributes: Optional[dict],
+    ):
+        self.tracer = tracer
+        self.name = name
+        self.kind = kind
+        self.span_id = f"{random.getrandbits(64):016x}"
+        if parent is None:
+            self.trace = []
+            self.trace_id = f"{random.getrandbits(128):032x}"
+            self.parent_id = None
+        else:
+            self.trace = parent.trace
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+        self.attributes = attributes or {}
+        self.error: Optional[str] = None
+        self.start = 0
+        self.end = 0
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def __enter__(self):
+        self.start = time.time_ns()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.time_ns()
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+        self.trace.append(self)
+        if self.parent_id is None:
+            self.tracer.export(self.trace)
+        return False
+
+
+class Tracer:
+    def __init__(self, sample_rate: float = 0.0, exporter=None):
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+
+    def configure(self, sample_rate: float, exporter) -> None:
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+
+    def should_sample(self) -> bool:
+        return (
+            self.exporter is not None
+            and self.sample_rate > 0
+            and random.random() < self.sample_rate
+        )
+
+    def start_trace(
+        self,
+        name: str,
+        kind: int = KIND_SERVER,
+        attributes: Optional[dict] = None,
+    ) -> Span:
+        return Span(self, name, kind, _current_span.get(), attributes)
+
+    def span(
+        self,
+        name: str,
+        kind: int = KIND_INTERNAL,
+        attributes: Optional[dict] = None,
+    ):
+        parent = _current_span.get()
+        if parent is None:
+            return NOOP_SPAN
+        return Span(self, name, kind, parent, attributes)
+
+    def export(self, spans: list[Span]) -> None:
+        if self.exporter is not None:
+            self.exporter.export(spans)
+
+    def close(self) -> None:
+        if self.exporter is not None:
+            self.exporter.close()
+
+
+TRACER = Tracer()
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def traced(name: str, kind: int = KIND_INTERNAL):
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return await func(*args, **kwargs)
+            with TRACER.span(name, kind):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,25 @@
+from aiohttp_apispec import docs, querystring_schema
+
+from app.tracing.exporters import RingBufferExporter
+from app.tracing.schemes import TraceListQuerySchema
+from app.web.app import View
+from app.web.mixins import AuthRequiredMixin
+from app.web.utils import json_response
+
+
+class TraceListView(AuthRequiredMixin, View):
+    @docs(
+        tags=["tracing"],
+        summary="Recent traces",
+        description=(
+            "Sampled traces from the in-memory ring buffer in OTLP-JSON"
+        ),
+    )
+    @querystring_schema(TraceListQuerySchema)
+    async def get(self):
+        limit = self.request["querystring"].get("limit", None)
+        exporter = self.request.app.tracer.exporter
+        traces = []
+        if isinstance(exporter, RingBufferExporter):
+            traces = exporter.dump(limit)
+        return json_response(data={"traces": traces})
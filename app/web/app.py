@@ -1,4 +1,5 @@
 import asyncio
+import sys
 from typing import Optional, TYPE_CHECKING
 
 from aiohttp.web import (
@@ -6,28 +7,34 @@ from aiohttp.web import (
     Request as AiohttpRequest,
     View as AiohttpView,
 )
-from aiohttp_apispec import setup_aiohttp_apispec
-from aiohttp_session import setup as session_setup
-from aiohttp_session.cookie_storage import EncryptedCookieStorage
 
-from app.admin.models import AdminModel
+from app.tracing.tracer import TRACER, current_span
 
-from app.store import Store, setup_store
-from app.store.database.database import Database, setup_database
-from app.web.config import Config, setup_config
-from app.web.logger import setup_logging
-from app.web.middlewares import setup_middlewares
-from app.web.routes import setup_routes
+if TYPE_CHECKING:
+    from app.admin.models import AdminModel
+    from app.metrics import LoopLagMonitor, LoopWatchdog
+    from app.store import Store
+    from app.store.database.database import Database
+    from app.tracing.tracer import Tracer
+    from app.web.cache import ResponseCache
+    from app.web.config import Config
 
 
 class Application(AiohttpApplication):
-    config: Optional[Config] = None
-    store: Optional[Store] = None
-    database: Optional[Database] = None
+    config: Optional["Config"] = None
+    store: Optional["Store"] = None
+    database: Optional["Database"] = None
+    cache: Optional["ResponseCache"] = None
+    loop_monitor: Optional["LoopLagMonitor"] = None
+    watchdog: Optional["LoopWatchdog"] = None
+    tracer: Optional["Tracer"] = None
+    worker_id: int = 0
+    # unix socket of worker 0 when several workers share the port
+    bot_socket: Optional[str] = None
 
 
 class Request(AiohttpRequest):
-    admin: Optional[AdminModel] = None
+    admin: Optional["AdminModel"] = None
 
     @property
     def app(self) -> Application:
@@ -35,6 +42,12 @@ class Request(AiohttpRequest):
 
 
 class View(AiohttpView):
+    async def _iter(self):
+        if current_span() is None:
+            return await super()._iter()
+        with TRACER.span(f"view {type(self).__name__}.{self.request.method}"):
+            return await super()._iter()
+
     @property
     def request(self) -> Request:
         return super().request
@@ -44,7 +57,7 @@ class View(AiohttpView):
         return self.request.app.database
 
     @property
-    def store(self) -> Store:
+    def store(self) -> "Store":
         return self.request.app.store
 
     @property
@@ -52,19 +65,63 @@ class View(AiohttpView):
         return self.request.get("data", {})
 
 
-app = Application()
-asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+def setup_event_loop_policy():
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
 
-def setup_app(config_path: str) -> Application:
-    setup_logging(app)
-    setup_config(app, config_path)
+def setup_session(app: Application):
+    from aiohttp_session import setup as session_setup
+    from aiohttp_session.cookie_storage import EncryptedCookieStorage
+
     session_setup(app, EncryptedCookieStorage(app.config.session.key))
-    setup_routes(app)
+
+
+def setup_apispec(app: Application):
+    from aiohttp_apispec import setup_aiohttp_apispec
+
+    docs = app.config.docs
+    # validation_middleware needs the parser registered either way, only
+    # the spec and swagger routes depend on docs being enabled. Routes are
+    # set up by now, so an enabled spec is built here rather than on startup.
+    startup = list(app.on_startup)
     setup_aiohttp_apispec(
-        app, title="Vk Words Bot", url="/docs/json", swagger_path="/docs"
+        app,
+        title="Vk Words Bot",
+        url=f"{docs.path}/json" if docs.enabled else None,
+        swagger_path=docs.path if docs.enabled else None,
+        in_place=docs.enabled,
     )
+    if not docs.enabled:
+        # nothing serves the spec, so the build queued for startup is dropped
+        for hook in list(app.on_startup):
+            if hook not in startup:
+                app.on_startup.remove(hook)
+
+
+def setup_app(config_path: str, worker_id: int = 0) -> Application:
+    from app.metrics import setup_metrics
+    from app.store import setup_store
+    from app.store.database.database import setup_database
+    from app.tracing import setup_tracing
+    from app.web.cache import setup_cache
+    from app.web.config import setup_config
+    from app.web.logger import setup_logging
+    from app.web.middlewares import setup_middlewares
+    from app.web.routes import setup_routes
+
+    setup_event_loop_policy()
+    app = Application()
+    app.worker_id = worker_id
+    setup_logging(app)
+    setup_config(app, config_path)
+    setup_session(app)
+    setup_routes(app)
+    setup_apispec(app)
     setup_middlewares(app)
     setup_database(app)
     setup_store(app)
+    setup_cache(app)
+    setup_metrics(app)
+    setup_tracing(app)
     return app
@@ -0,0 +1,31 @@
+import typing
+from typing import Optional
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+
+class ResponseCache:
+    def __init__(self):
+        self._entries: dict[str, tuple[int, bytes]] = {}
+
+    def etag(self, key: str, version: int) -> str:
+        # versions come from the storage and are shared by all workers, so
+        # is the etag
+        return f"{key}-{version}"
+
+    def get(self, key: str, version: int) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            return None
+        return entry[1]
+
+    def set(self, key: str, version: int, body: bytes) -> None:
+        self._entries[key] = (version, body)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def setup_cache(app: "Application"):
+    app.cache = ResponseCache()
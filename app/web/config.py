@@ -1,5 +1,6 @@
 import typing
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
 
 import yaml
 
@@ -22,6 +23,8 @@ class AdminConfig:
 class BotConfig:
     token: str
     group_id: int
+    api_path: str = "https://api.vk.com/method/"
+    locale: str = "ru"
 
 
 @dataclass
@@ -31,6 +34,106 @@ class DatabaseConfig:
     user: str = "postgres"
     password: str = "postgres"
     database: str = "project"
+    replicas: list[str] = field(default_factory=list)
+    replica_lag: float = 1.0
+
+
+@dataclass
+class StorageConfig:
+    # sql or memory
+    engine: str = "sql"
+
+
+@dataclass
+class ServerConfig:
+    host: str = "0.0.0.0"
+    port: int = 8080
+    workers: int = 1
+    shutdown_timeout: float = 60.0
+    uvloop: bool = True
+    backlog: int = 128
+    # worker 0 also listens here, other workers forward game requests to it
+    bot_socket: Optional[str] = None
+
+
+@dataclass
+class DocsConfig:
+    enabled: bool = True
+    path: str = "/docs"
+
+
+@dataclass
+class WordsConfig:
+    snapshot_path: Optional[str] = None
+    snapshot_check_interval: float = 5.0
+    version_check_interval: float = 1.0
+    export_batch_size: int = 5000
+    export_gzip_level: int = 6
+    suggest_max_distance: int = 1
+    suggest_prefix_length: int = 7
+    suggest_limit: int = 3
+
+
+@dataclass
+class RateLimitConfig:
+    enabled: bool = True
+    policy: str = "drop"
+    user_rate: float = 0.5
+    user_burst: float = 5
+    peer_rate: float = 2.0
+    peer_burst: float = 20
+
+
+@dataclass
+class DedupConfig:
+    window: int = 10000
+    shared: bool = False
+    retention: float = 3600.0
+
+
+@dataclass
+class ScoresConfig:
+    flush_interval: float = 5.0
+    flush_batch: int = 500
+    leaderboard_limit: int = 10
+
+
+@dataclass
+class JobsConfig:
+    enabled: bool = True
+    workers: int = 2
+    poll_interval: float = 1.0
+    progress_interval: float = 1.0
+    stale_after: float = 600.0
+    requeue_interval: float = 60.0
+    max_attempts: int = 3
+    shutdown_timeout: float = 30.0
+    batch_size: int = 1000
+    # files of words.list jobs, the job result keeps only the file name
+    result_dir: str = "job_results"
+
+
+@dataclass
+class WritesConfig:
+    window: float = 0.005
+    max_batch: int = 500
+
+
+@dataclass
+class MetricsConfig:
+    loop_lag_interval: float = 0.5
+    watchdog: bool = False
+    watchdog_threshold: float = 0.1
+    watchdog_max_stalls: int = 50
+    asyncio_debug: bool = False
+
+
+@dataclass
+class TracingConfig:
+    sample_rate: float = 0.0
+    exporter: str = "memory"
+    path: str = "traces.jsonl"
+    buffer_size: int = 1000
 
 
 @dataclass
@@ -39,13 +142,24 @@ class Config:
     session: SessionConfig = None
     bot: BotConfig = None
     database: DatabaseConfig = None
+    storage: StorageConfig = None
+    server: ServerConfig = None
+    docs: DocsConfig = None
+    words: WordsConfig = None
+    scores: ScoresConfig = None
+    rate_limit: RateLimitConfig = None
+    dedup: DedupConfig = None
+    jobs: JobsConfig = None
+    writes: WritesConfig = None
+    metrics: MetricsConfig = None
+    tracing: TracingConfig = None
 
 
-def setup_config(app: "Application", config_path: str):
+def load_config(config_path: str) -> Config:
     with open(config_path, "r") as f:
         raw_config = yaml.safe_load(f)
 
-    app.config = Config(
+    return Config(
         session=SessionConfig(
             key=raw_config["session"]["key"],
         ),
@@ -53,9 +167,21 @@ def setup_config(app: "Application", config_path: str):
             email=raw_config["admin"]["email"],
             password=raw_config["admin"]["password"],
         ),
-        bot=BotConfig(
-            token=raw_config["bot"]["token"],
-            group_id=raw_config["bot"]["group_id"],
-        ),
+        bot=BotConfig(**raw_config["bot"]),
         database=DatabaseConfig(**raw_config["database"]),
+        storage=StorageConfig(**raw_config.get("storage", {})),
+        server=ServerConfig(**raw_config.get("server", {})),
+        docs=DocsConfig(**raw_config.get("docs", {})),
+        words=WordsConfig(**raw_config.get("words", {})),
+        scores=ScoresConfig(**raw_config.get("scores", {})),
+        rate_limit=RateLimitConfig(**raw_config.get("rate_limit", {})),
+        dedup=DedupConfig(**raw_config.get("dedup", {})),
+        jobs=JobsConfig(**raw_config.get("jobs", {})),
+        writes=WritesConfig(**raw_config.get("writes", {})),
+        metrics=MetricsConfig(**raw_config.get("metrics", {})),
+        tracing=TracingConfig(**raw_config.get("tracing", {})),
     )
+
+
+def setup_config(app: "Application", config_path: str):
+    app.config = load_config(config_path)
@@ -1,5 +1,6 @@
 import json
 import typing
+from time import perf_counter
 
 from aiohttp.web_exceptions import HTTPException, HTTPUnprocessableEntity
 from aiohttp.web_middlewares import middleware
@@ -7,6 +8,8 @@ from aiohttp_apispec import validation_middleware
 from aiohttp_session import get_session
 
 from app.admin.models import AdminModel
+from app.metrics.metrics import HTTP_MIDDLEWARE_SECONDS, HTTP_REQUEST_SECONDS
+from app.tracing.tracer import TRACER
 from app.web.utils import error_json_response
 
 if typing.TYPE_CHECKING:
@@ -15,7 +18,8 @@ if typing.TYPE_CHECKING:
 
 @middleware
 async def auth_middleware(request: "Request", handler: callable):
-    session = await get_session(request)
+    with TRACER.span("session.load"):
+        session = await get_session(request)
     if session:
         request.admin = AdminModel.from_session(session)
     return await handler(request)
@@ -29,6 +33,7 @@ HTTP_ERROR_CODES = {
     405: "not_implemented",
     409: "conflict",
     500: "internal_server_error",
+    503: "service_unavailable",
 }
 
 
@@ -57,7 +62,75 @@ async def error_handling_middleware(request: "Request", handler):
         )
 
 
+@middleware
+async def metrics_middleware(request: "Request", handler):
+    started = perf_counter()
+    status = 500
+    try:
+        response = await handler(request)
+        status = response.status
+        return response
+    except HTTPException as e:
+        status = e.status
+        raise
+    finally:
+        route = request.match_info.route.resource
+        HTTP_REQUEST_SECONDS.labels(
+            route.canonical if route else "unmatched", str(status)
+        ).observe(perf_counter() - started)
+
+
+@middleware
+async def tracing_middleware(request: "Request", handler):
+    if not TRACER.should_sample():
+        return await handler(request)
+    route = request.match_info.route.resource
+    with TRACER.start_trace(
+        f"{request.method} {route.canonical if route else 'unmatched'}",
+        attributes={"http.method": request.method, "http.target": request.path},
+    ) as span:
+        response = await handler(request)
+        span.set_attribute("http.status_code", response.status)
+        return response
+
+
+@middleware
+async def database_middleware(request: "Request", handler):
+    with request.app.database.scope():
+        return await handler(request)
+
+
+def timed_middleware(handler_middleware):
+    name = handler_middleware.__name__
+    span_name = f"middleware {name}"
+    child = HTTP_MIDDLEWARE_SECONDS.labels(name)
+
+    @middleware
+    async def wrapper(request: "Request", handler):
+        downstream = 0.0
+
+        async def timed_handler(request: "Request"):
+            nonlocal downstream
+            started = perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                downstream += perf_counter() - started
+
+        started = perf_counter()
+        try:
+            with TRACER.span(span_name):
+                return await handler_middleware(request, timed_handler)
+        finally:
+            child.observe(perf_counter() - started - downstream)
+
+    return wrapper
+
+
 def setup_middlewares(app: "Application"):
-    app.middlewares.append(auth_middleware)
-    app.middlewares.append(error_handling_middleware)
-    app.middlewares.append(validation_middleware)
+    app.middlewares.append(tracing_middleware)
+    app.middlewares.append(metrics_middleware)
+    app.middlewares.append(database_middleware)
+    app.middlewares.append(timed_middleware(auth_middleware))
+    app.middlewares.append(timed_middleware(error_handling_middleware))
+    app.middlewares.append(timed_middleware(validation_middleware))
@@ -1,5 +1,9 @@
+from aiohttp import ClientError, ClientSession, UnixConnector
 from aiohttp.abc import StreamResponse
-from aiohttp.web_exceptions import HTTPUnauthorized
+from aiohttp.web import Response
+from aiohttp.web_exceptions import HTTPServiceUnavailable, HTTPUnauthorized
+
+FORWARDED_HEADERS = ("Content-Type", "Cookie")
 
 
 class AuthRequiredMixin:
@@ -7,3 +11,41 @@ class AuthRequiredMixin:
         if not getattr(self.request, "admin", None):
             raise HTTPUnauthorized
         return await super(AuthRequiredMixin, self)._iter()
+
+
+class BotWorkerMixin:
+    """Runs the view in the worker that polls VK.
+
+    State such as running games lives only in that process, so the other
+    workers pass the request on over its unix socket and return the answer
+    as is.
+    """
+
+    async def _iter(self) -> StreamResponse:
+        app = self.request.app
+        if app.worker_id == 0 or app.bot_socket is None:
+            return await super(BotWorkerMixin, self)._iter()
+        headers = {
+            name: self.request.headers[name]
+            for name in FORWARDED_HEADERS
+            if name in self.request.headers
+        }
+        try:
+            async with ClientSession(
+                connector=UnixConnector(path=app.bot_socket)
+            ) as session:
+                async with session.request(
+                    self.request.method,
+                    f"http://bot{self.request.path_qs}",
+                    headers=headers,
+                    data=await self.request.read(),
+                ) as resp:
+                    return Response(
+                        status=resp.status,
+                        body=await resp.read(),
+                        content_type=resp.content_type,
+                        charset=resp.charset,
+                    )
+        except ClientError as e:
+            app.logger.error("bot worker is unavailable", exc_info=e)
+            raise HTTPServiceUnavailable
@@ -3,7 +3,15 @@ from aiohttp.web_app import Application
 
 def setup_routes(app: Application):
     from app.admin.routes import setup_routes as admin_setup_routes
+    from app.game.routes import setup_routes as game_setup_routes
+    from app.jobs.routes import setup_routes as jobs_setup_routes
+    from app.metrics.routes import setup_routes as metrics_setup_routes
+    from app.tracing.routes import setup_routes as tracing_setup_routes
     from app.words.routes import setup_routes as words_setup_routes
 
     admin_setup_routes(app)
     words_setup_routes(app)
+    game_setup_routes(app)
+    jobs_setup_routes(app)
+    metrics_setup_routes(app)
+    tracing_setup_routes(app)
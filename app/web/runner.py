@@ -0,0 +1,151 @@
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import tempfile
+from typing import Optional
+
+from aiohttp.web import run_app
+
+logger = logging.getLogger("runner")
+
+
+def install_uvloop() -> bool:
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+def run_worker(
+    config_path: str,
+    worker_id: int = 0,
+    reuse_port: bool = False,
+    bot_socket: Optional[str] = None,
+) -> None:
+    from app.web.app import setup_app
+
+    app = setup_app(config_path, worker_id=worker_id)
+    app.bot_socket = bot_socket
+    config = app.config.server
+    if config.uvloop and install_uvloop():
+        logger.info("worker %s: using uvloop", worker_id)
+    run_app(
+        app,
+        host=config.host,
+        port=config.port,
+        backlog=config.backlog,
+        reuse_port=reuse_port,
+        path=bot_socket if worker_id == 0 else None,
+        shutdown_timeout=config.shutdown_timeout,
+        print=None,
+    )
+
+
+class Supervisor:
+    def __init__(
+        self,
+        config_path: str,
+        workers: int,
+        shutdown_timeout: float,
+        bot_socket: str,
+    ):
+        self.config_path = config_path
+        self.workers = workers
+        self.shutdown_timeout = shutdown_timeout
+        self.bot_socket = bot_socket
+        self.processes: list[multiprocessing.Process] = []
+        self._stopping = False
+
+    def _spawn(self, worker_id: int) -> multiprocessing.Process:
+        process = multiprocessing.Process(
+            target=run_worker,
+            args=(self.config_path, worker_id, True, self.bot_socket),
+            name=f"worker-{worker_id}",
+        )
+        process.start()
+        logger.info("started worker %s (pid %s)", worker_id, process.pid)
+        return process
+
+    def _stop(self, signum, _frame):
+        if self._stopping:
+            return
+        self._stopping = True
+        logger.info(
+            "received %s, stopping workers", signal.Signals(signum).name
+        )
+        for process in self.processes:
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGTERM)
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        self.processes = [self._spawn(i) for i in range(self.workers)]
+
+        while not self._stopping:
+            for worker_id, process in enumerate(self.processes):
+                process.join(timeout=0.5)
+                if self._stopping:
+                    break
+                if not process.is_alive():
+                    logger.error(
+                        "worker %s exited with %s, restarting",
+                        worker_id,
+                        process.exitcode,
+                    )
+                    self.processes[worker_id] = self._spawn(worker_id)
+
+        exit_code = 0
+        # workers drain their own requests and handlers within shutdown_timeout
+        for process in self.processes:
+            process.join(self.shutdown_timeout + 5)
+            if process.is_alive():
+                logger.error("worker %s did not stop, killing", process.pid)
+                process.kill()
+                process.join()
+            exit_code = exit_code or process.exitcode
+        return exit_code
+
+
+def run(config_path: str, workers: Optional[int] = None) -> int:
+    from app.web.config import load_config
+
+    config = load_config(config_path)
+    workers = workers or config.server.workers
+    if workers > 1 and config.storage.engine == "memory":
+        # every process would get its own dictionary and admins
+        raise ValueError("the memory storage engine supports only one worker")
+    if workers > 1 and not hasattr(socket, "SO_REUSEPORT"):
+        logger.warning("SO_REUSEPORT is not supported, running one worker")
+        workers = 1
+
+    if workers == 1:
+        run_worker(config_path)
+        return 0
+
+    logging.basicConfig(level=logging.INFO)
+    # games live in worker 0, the others reach it through this socket
+    bot_socket = config.server.bot_socket or os.path.join(
+        tempfile.gettempdir(), f"words_vk-{config.server.port}.sock"
+    )
+    return Supervisor(
+        config_path, workers, config.server.shutdown_timeout, bot_socket
+    ).run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the words bot")
+    parser.add_argument("--config", default="config.yml")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    raise SystemExit(run(args.config, args.workers))
+
+
+if __name__ == "__main__":
+    main()
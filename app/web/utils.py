@@ -1,8 +1,12 @@
-from typing import Any, Optional
+import json
+from typing import Any, Awaitable, Callable, Optional, TYPE_CHECKING
 
 from aiohttp.web import json_response as aiohttp_json_response
 from aiohttp.web_response import Response
 
+if TYPE_CHECKING:
+    from app.web.app import Request
+
 
 def json_response(data: Any = None, status: str = "ok") -> Response:
     if data is None:
@@ -31,3 +35,37 @@ def error_json_response(
             "data": data,
         },
     )
+
+
+def etag_matches(request: "Request", etag: str) -> bool:
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    for value in header.split(","):
+        value = value.strip()
+        if value == "*":
+            return True
+        if value.startswith("W/"):
+            value = value[2:]
+        if value.strip('"') == etag:
+            return True
+    return False
+
+
+async def cached_json_response(
+    request: "Request",
+    key: str,
+    version: int,
+    build: Callable[[], Awaitable[Any]],
+) -> Response:
+    cache = request.app.cache
+    etag = cache.etag(key, version)
+    headers = {"ETag": f'"{etag}"', "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status=304, headers=headers)
+    body = cache.get(key, version)
+    if body is None:
+        data = await build()
+        body = json.dumps({"status": "ok", "data": data}).encode("utf-8")
+        cache.set(key, version, body)
+    return Response(body=body, content_type="application/json", headers=headers)
@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+import zlib
+from typing import Iterable, Optional
+
+ExportRow = tuple[int, str, bool]
+
+
+class CsvEncoder:
+    content_type = "text/csv"
+    extension = "csv"
+
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+
+    def _flush(self) -> bytes:
+        data = self._buffer.getvalue().encode()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+    def header(self) -> bytes:
+        self._writer.writerow(("id", "title", "is_correct"))
+        return self._flush()
+
+    def encode(self, rows: Iterable[ExportRow]) -> bytes:
+        self._writer.writerows(
+            (id_, title, "true" if is_correct else "false")
+            for id_, title, is_correct in rows
+        )
+        return self._flush()
+
+
+class JsonLinesEncoder:
+    content_type = "application/x-ndjson"
+    extension = "jsonl"
+
+    def __init__(self):
+        self._dumps = json.JSONEncoder(
+            ensure_ascii=False, separators=(",", ":")
+        ).encode
+
+    def header(self) -> bytes:
+        return b""
+
+    def encode(self, rows: Iterable[ExportRow]) -> bytes:
+        dumps = self._dumps
+        return "".join(
+            [
+                dumps({"id": id_, "title": title, "is_correct": is_correct})
+                + "\n"
+                for id_, title, is_correct in rows
+            ]
+        ).encode()
+
+
+ENCODERS = {
+    "csv": CsvEncoder,
+    "jsonl": JsonLinesEncoder,
+}
+
+
+class ExportStream:
+    def __init__(self, export_format: str, gzip: bool = False, level: int = 6):
+        self.encoder = ENCODERS[export_format]()
+        # wbits=31 produces a gzip container rather than a raw zlib stream
+        self._compressor = (
+            zlib.compressobj(level, zlib.DEFLATED, 31) if gzip else None
+        )
+
+    @property
+    def content_type(self) -> str:
+        if self._compressor is not None:
+            return "application/gzip"
+        return f"{self.encoder.content_type}; charset=utf-8"
+
+    def filename(self, name: str) -> str:
+        filename = f"{name}.{self.encoder.extension}"
+        if self._compressor is not None:
+            filename += ".gz"
+        return filename
+
+    def _compress(self, data: bytes) -> bytes:
+        if self._compressor is None:
+            return data
+        return self._compressor.compress(data)
+
+    def header(self) -> bytes:
+        return self._compress(self.encoder.header())
+
+    def encode(self, rows: Iterable[ExportRow]) -> bytes:
+        return self._compress(self.encoder.encode(rows))
+
+    def finish(self) -> Optional[bytes]:
+        if self._compressor is None:
+            return None
+        return self._compressor.flush()
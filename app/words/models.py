@@ -1,9 +1,14 @@
 from dataclasses import dataclass, field
 from typing import Optional, List
 
-from sqlalchemy import Column, Integer, String, Boolean
+from sqlalchemy import BigInteger, Column, Index, Integer, String, Boolean
 
 from app.store.database.sqlalchemy_base import db, mapper_registry
+from app.words.normalize import normalize
+
+
+def canonical_default(context) -> str:
+    return normalize(context.get_current_parameters()["title"])
 
 
 @mapper_registry.mapped
@@ -11,6 +16,14 @@ from app.store.database.sqlalchemy_base import db, mapper_registry
 class WordModel:
     __tablename__ = "words"
     __sa_dataclass_metadata_key__ = "sa"
+    __table_args__ = (
+        Index(
+            "ix_words_canonical_trgm",
+            "canonical",
+            postgresql_using="gist",
+            postgresql_ops={"canonical": "gist_trgm_ops"},
+        ),
+    )
 
     title: str = field(
         metadata={"sa": Column(String, nullable=False, unique=True)}
@@ -19,6 +32,15 @@ class WordModel:
     id: Optional[int] = field(
         default=None, metadata={"sa": Column(Integer, primary_key=True)}
     )
+    # kept out of the dataclass fields, so it is not part of the constructor
+    # or of the API payloads and is filled from title on insert
+    canonical = Column(
+        String,
+        nullable=False,
+        unique=True,
+        index=True,
+        default=canonical_default,
+    )
 
 
 @mapper_registry.mapped
@@ -41,3 +63,24 @@ class SettingModel:
     id: Optional[int] = field(
         default=None, metadata={"sa": Column(Integer, primary_key=True)}
     )
+
+
+@mapper_registry.mapped
+@dataclass
+class DictionaryVersionModel:
+    """Single row bumped by triggers on words and settings.
+
+    The bump happens in the transaction of the write, so every process sees
+    a new version exactly when it can see the new rows.
+    """
+
+    __tablename__ = "dictionary_version"
+    __sa_dataclass_metadata_key__ = "sa"
+
+    version: int = field(
+        default=0,
+        metadata={"sa": Column(BigInteger, nullable=False, server_default="0")},
+    )
+    id: int = field(
+        default=1, metadata={"sa": Column(Integer, primary_key=True)}
+    )
@@ -0,0 +1,47 @@
+import re
+import unicodedata
+from typing import Iterable
+
+# latin letters that look like cyrillic ones once lowercased
+HOMOGLYPHS = str.maketrans("abcehkmoptxy", "авсенкмортху")
+SEPARATOR = "\x00"
+
+_whitespace = re.compile(r"\s")
+_cyrillic = re.compile("[а-я]")
+_latin = re.compile("[a-z]")
+
+
+def _fold_homoglyphs(title: str) -> str:
+    # only mixed script words are folded, a purely latin word is left alone
+    if _latin.search(title) and _cyrillic.search(title):
+        return title.translate(HOMOGLYPHS)
+    return title
+
+
+def clean(title: str) -> str:
+    title = unicodedata.normalize("NFC", title).lower()
+    return " ".join(title.split())
+
+
+def normalize(title: str) -> str:
+    title = unicodedata.normalize("NFC", title).lower().replace("ё", "е")
+    return _fold_homoglyphs(" ".join(title.split()))
+
+
+def normalize_many(titles: Iterable[str]) -> list[str]:
+    titles = list(titles)
+    if not titles:
+        return []
+    # the separator is a starter and neither a letter nor whitespace, so the
+    # whole batch goes through each step at once with the same result as
+    # normalizing the titles one by one
+    text = SEPARATOR.join(titles)
+    if text.count(SEPARATOR) != len(titles) - 1:
+        return [normalize(title) for title in titles]
+    text = unicodedata.normalize("NFC", text).lower().replace("ё", "е")
+    titles = text.split(SEPARATOR)
+    if _whitespace.search(text):
+        titles = [" ".join(title.split()) for title in titles]
+    if _latin.search(text):
+        titles = [_fold_homoglyphs(title) for title in titles]
+    return titles
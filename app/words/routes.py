@@ -1,17 +1,33 @@
 import typing
 
-from app.words.views import (
-
-    WordAddView, WordListView, SettingAddView, SettingListView, SettingGetView, SettingPatchView, WordPatchView,
-    WordDeleteView, WordGetView, SettingDeleteView)
-
 if typing.TYPE_CHECKING:
     from app.web.app import Application
 
 
 def setup_routes(app: "Application"):
+    from app.words.views import (
+        SettingAddView,
+        SettingDeleteView,
+        SettingGetView,
+        SettingListView,
+        SettingPatchView,
+        WordAddView,
+        WordDeleteView,
+        WordExportView,
+        WordGetView,
+        WordSuggestView,
+        WordImportView,
+        WordListJobView,
+        WordListView,
+        WordPatchView,
+    )
+
     app.router.add_view("/words.add_word", WordAddView)
     app.router.add_view("/words.list_words", WordListView)
+    app.router.add_view("/words.export", WordExportView)
+    app.router.add_view("/words.suggest", WordSuggestView)
+    app.router.add_view("/words.list_words_job", WordListJobView)
+    app.router.add_view("/words.import_words", WordImportView)
     app.router.add_view("/words.patch_word", WordPatchView)
     app.router.add_view("/words.delete_word", WordDeleteView)
     app.router.add_view("/words.get_word", WordGetView)
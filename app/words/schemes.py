@@ -15,6 +15,23 @@ class WordIsCorrectSchema(Schema):
     is_correct = fields.Bool(required=False)
 
 
+class WordImportSchema(Schema):
+    words = fields.List(
+        fields.Nested(WordSchema(only=("title", "is_correct"))),
+        required=True,
+        validate=validate.Length(min=1),
+    )
+
+
+class WordExportSchema(WordIsCorrectSchema):
+    format = fields.Str(
+        required=False,
+        load_default="csv",
+        validate=validate.OneOf(["csv", "jsonl"]),
+    )
+    gzip = fields.Bool(required=False, load_default=False)
+
+
 class WordIdSchema(Schema):
     id = fields.Int(required=True)
 
@@ -23,6 +40,28 @@ class WordTitleSchema(Schema):
     title = fields.Str(validate=validate.Length(min=1), required=True)
 
 
+class WordSuggestQuerySchema(WordTitleSchema):
+    limit = fields.Int(
+        required=False,
+        load_default=None,
+        validate=validate.Range(min=1, max=50),
+    )
+    source = fields.Str(
+        required=False,
+        load_default="memory",
+        validate=validate.OneOf(["memory", "db"]),
+    )
+
+
+class WordSuggestionSchema(Schema):
+    title = fields.Str(required=True)
+    distance = fields.Int(required=True)
+
+
+class WordSuggestionListSchema(Schema):
+    suggestions = fields.Nested(WordSuggestionSchema, many=True)
+
+
 class PatchWordSchema(WordIdSchema):
     title = fields.Str(required=False)
     is_correct = fields.Bool(required=False)
@@ -1,3 +1,4 @@
+from aiohttp.web import StreamResponse
 from aiohttp.web_exceptions import HTTPConflict, HTTPNotFound
 from aiohttp_apispec import (
     querystring_schema,
@@ -7,11 +8,29 @@ from aiohttp_apispec import (
 )
 from sqlalchemy.exc import IntegrityError
 
+from app.jobs.schemes import JobSchema
 from app.web.app import View
 from app.web.mixins import AuthRequiredMixin
-from app.web.utils import json_response
-from app.words.schemes import WordSchema, WordListSchema, SettingSchema, WordIsCorrectSchema, SettingListSchema, \
-    SettingTitleSchema, PatchSettingSchema, PatchWordSchema, WordIdSchema, WordTitleSchema, SettingIdSchema
+from app.web.utils import json_response, cached_json_response
+from app.words.schemes import (
+    WordSchema,
+    WordListSchema,
+    SettingSchema,
+    WordIsCorrectSchema,
+    SettingListSchema,
+    SettingTitleSchema,
+    PatchSettingSchema,
+    PatchWordSchema,
+    WordIdSchema,
+    WordTitleSchema,
+    SettingIdSchema,
+    WordImportSchema,
+    WordExportSchema,
+    WordSuggestQuerySchema,
+    WordSuggestionListSchema,
+)
+from app.words.export import ExportStream
+from app.words.normalize import clean
 
 
 class WordGetView(AuthRequiredMixin, View):
@@ -21,7 +40,7 @@ class WordGetView(AuthRequiredMixin, View):
     @querystring_schema(WordTitleSchema)
     @response_schema(WordSchema)
     async def get(self):
-        title = self.request["querystring"]["title"].lower()
+        title = clean(self.request["querystring"]["title"])
         word = await self.store.words.get_word_by_title(title)
         if word is None:
             raise HTTPNotFound
@@ -33,7 +52,7 @@ class WordAddView(AuthRequiredMixin, View):
     @request_schema(WordSchema)
     @response_schema(WordSchema)
     async def post(self):
-        title = self.data["title"].lower()
+        title = clean(self.data["title"])
         is_correct = self.data["is_correct"]
         try:
             word = await self.store.words.create_word(title, is_correct)
@@ -52,9 +71,17 @@ class WordPatchView(AuthRequiredMixin, View):
         id = self.data["id"]
         title = self.data.get("title", None)
         if title:
-            title = title.lower()
+            title = clean(title)
         is_correct = self.data.get("is_correct", None)
-        word = await self.store.words.patch_word(id, title=title, is_correct=is_correct)
+        try:
+            word = await self.store.words.patch_word(
+                id, title=title, is_correct=is_correct
+            )
+        except IntegrityError as e:
+            # the new title normalizes to the one of another word
+            if e.orig.pgcode == "23505":
+                raise HTTPConflict
+            raise
         if word is None:
             raise HTTPNotFound
         word_out = WordSchema().dump(word)
@@ -83,8 +110,134 @@ class WordListView(AuthRequiredMixin, View):
     @response_schema(WordListSchema)
     async def get(self):
         is_correct = self.request["querystring"].get("is_correct", None)
-        words = await self.store.words.list_words(is_correct)
-        return json_response(data=WordListSchema().dump({"words": words}))
+
+        async def build():
+            words = await self.store.words.list_words(is_correct)
+            return WordListSchema().dump({"words": words})
+
+        return await cached_json_response(
+            self.request,
+            key=f"words-{is_correct}",
+            version=await self.store.words.get_version(),
+            build=build,
+        )
+
+
+class WordSuggestView(AuthRequiredMixin, View):
+    @docs(
+        tags=["words"],
+        summary="suggest words",
+        description="closest correct words within the configured edit distance",
+    )
+    @querystring_schema(WordSuggestQuerySchema)
+    @response_schema(WordSuggestionListSchema)
+    async def get(self):
+        query = self.request["querystring"]
+        if query["source"] == "db":
+            suggestions = await self.store.words.suggest_from_database(
+                query["title"], query["limit"]
+            )
+        else:
+            await self.store.words.build_suggestions()
+            suggestions = await self.store.words.suggest(
+                query["title"], query["limit"]
+            )
+        return json_response(
+            data=WordSuggestionListSchema().dump(
+                {
+                    "suggestions": [
+                        {"title": title, "distance": distance}
+                        for title, distance in suggestions
+                    ]
+                }
+            )
+        )
+
+
+class WordExportView(AuthRequiredMixin, View):
+    @docs(
+        tags=["words"],
+        summary="export words",
+        description=(
+            "stream the dictionary as csv or json lines, optionally gzipped"
+        ),
+    )
+    @querystring_schema(WordExportSchema)
+    async def get(self):
+        query = self.request["querystring"]
+        config = self.request.app.config.words
+        stream = ExportStream(
+            query["format"], gzip=query["gzip"], level=config.export_gzip_level
+        )
+        response = StreamResponse(
+            headers={
+                "Content-Type": stream.content_type,
+                "Content-Disposition": (
+                    f'attachment; filename="{stream.filename("words")}"'
+                ),
+            }
+        )
+        response.enable_chunked_encoding()
+        batches = self.store.words.stream_words(
+            query.get("is_correct"), config.export_batch_size
+        )
+        await response.prepare(self.request)
+        try:
+            await response.write(stream.header())
+            async for rows in batches:
+                await response.write(stream.encode(rows))
+            tail = stream.finish()
+            if tail:
+                await response.write(tail)
+        except Exception as e:
+            # headers are already sent, so the only way to report the failure
+            # is to drop the connection before the terminating chunk
+            self.request.app.logger.error("words export failed", exc_info=e)
+            if self.request.transport is not None:
+                self.request.transport.close()
+            return response
+        finally:
+            await batches.aclose()
+        await response.write_eof()
+        return response
+
+
+class WordImportView(AuthRequiredMixin, View):
+    @docs(
+        tags=["words"],
+        summary="import words",
+        description="enqueue a bulk import, progress is available at /jobs.get",
+    )
+    @request_schema(WordImportSchema)
+    @response_schema(JobSchema)
+    async def post(self):
+        job = await self.store.jobs.enqueue(
+            "words.import", {"words": self.data["words"]}
+        )
+        return json_response(data=JobSchema().dump(job))
+
+
+class WordListJobView(AuthRequiredMixin, View):
+    @docs(
+        tags=["words"],
+        summary="list words in background",
+        description=(
+            "enqueue a full dictionary export to a file, "
+            "download it from /jobs.result"
+        ),
+    )
+    @request_schema(WordExportSchema)
+    @response_schema(JobSchema)
+    async def post(self):
+        job = await self.store.jobs.enqueue(
+            "words.list",
+            {
+                "is_correct": self.data.get("is_correct"),
+                "format": self.data["format"],
+                "gzip": self.data["gzip"],
+            },
+        )
+        return json_response(data=JobSchema().dump(job))
 
 
 class SettingGetView(AuthRequiredMixin, View):
@@ -156,8 +309,13 @@ class SettingListView(AuthRequiredMixin, View):
     )
     @response_schema(SettingListSchema)
     async def get(self):
-        settings = await self.store.words.list_settings()
-        return json_response(data=SettingListSchema().dump({"settings": settings}))
-
-
+        async def build():
+            settings = await self.store.words.list_settings()
+            return SettingListSchema().dump({"settings": settings})
 
+        return await cached_json_response(
+            self.request,
+            key="settings",
+            version=await self.store.words.get_version(),
+            build=build,
+        )
@@ -0,0 +1,201 @@
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import resource
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from typing import Optional
+
+from aiohttp import web
+
+from app.web.app import setup_app
+from benchmarks.fake_vk import CHAT_PEER_OFFSET, FakeVkServer
+from benchmarks.stats import latency_summary
+
+DEFAULT_CONFIG = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "..", "config.yml"
+)
+
+WORDS = ("арбуз", "зебра", "апельсин", "нос", "сова", "абрикос", "слон")
+
+
+class ScenarioDriver:
+    def __init__(
+        self,
+        fake_vk: FakeVkServer,
+        chats: int,
+        messages: int,
+        players: int,
+        think_time: float,
+        reply_timeout: float,
+        seed: Optional[int] = None,
+    ):
+        self.fake_vk = fake_vk
+        self.chats = chats
+        self.messages = messages
+        self.players = players
+        self.think_time = think_time
+        self.reply_timeout = reply_timeout
+        self.random = random.Random(seed)
+
+        self.latencies: list[float] = []
+        self.timeouts = 0
+        self._pending: dict[int, deque] = defaultdict(deque)
+        fake_vk.on_send = self._on_send
+
+    def _on_send(self, peer_id: int, text: str) -> None:
+        pending = self._pending.get(peer_id)
+        while pending:
+            sent_at, waiter = pending.popleft()
+            if not waiter.done():
+                self.latencies.append(time.perf_counter() - sent_at)
+                waiter.set_result(text)
+                return
+
+    async def _say(self, peer_id: int, user_id: int, text: str) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        self._pending[peer_id].append((time.perf_counter(), waiter))
+        self.fake_vk.push_message(peer_id, user_id, text)
+        try:
+            await asyncio.wait_for(waiter, self.reply_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+
+    async def _play_chat(self, chat: int) -> None:
+        peer_id = CHAT_PEER_OFFSET + chat
+        users = [peer_id * 10 + i for i in range(self.players)]
+        await self._say(peer_id, users[0], "старт")
+        for i in range(self.messages):
+            if self.think_time:
+                await asyncio.sleep(self.random.uniform(0, self.think_time))
+            await self._say(
+                peer_id, users[i % len(users)], self.random.choice(WORDS)
+            )
+
+    async def run(self) -> float:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(self._play_chat(chat) for chat in range(1, self.chats + 1))
+        )
+        return time.perf_counter() - started
+
+
+async def run_scenario(
+    config_path: str = DEFAULT_CONFIG,
+    chats: int = 10,
+    messages: int = 20,
+    players: int = 3,
+    think_time: float = 0.0,
+    reply_timeout: float = 5.0,
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    trace_memory: bool = False,
+    seed: Optional[int] = None,
+) -> dict:
+    if trace_memory:
+        tracemalloc.start()
+    fake_vk = FakeVkServer(
+        latency=latency,
+        error_rate={
+            "messages.send": error_rate,
+            "messages.getConversationMembers": error_rate,
+            "execute": error_rate,
+        },
+        members_count=players,
+        members_online=players,
+        seed=seed,
+    )
+    await fake_vk.start()
+
+    app = setup_app(config_path)
+    app.config.bot.api_path = fake_vk.api_path
+    runner = web.AppRunner(app)
+    await runner.setup()
+
+    gc.collect()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    driver = ScenarioDriver(
+        fake_vk,
+        chats=chats,
+        messages=messages,
+        players=players,
+        think_time=think_time,
+        reply_timeout=reply_timeout,
+        seed=seed,
+    )
+    try:
+        elapsed = await driver.run()
+    finally:
+        await runner.cleanup()
+        await fake_vk.stop()
+
+    report = {
+        "chats": chats,
+        "messages_per_chat": messages,
+        "elapsed_sec": elapsed,
+        "updates": fake_vk.delivered,
+        "updates_per_sec": fake_vk.delivered / elapsed if elapsed else None,
+        "replies": len(driver.latencies),
+        "timeouts": driver.timeouts,
+        "vk_calls": fake_vk.calls,
+        "vk_errors": fake_vk.errors,
+        "latency_ms": latency_summary(driver.latencies),
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "rss_growth_kb": (
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+        ),
+    }
+    if trace_memory:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        report["tracemalloc_kb"] = {
+            "current": current // 1024,
+            "peak": peak // 1024,
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Drive the bot pipeline against a fake VK server"
+    )
+    parser.add_argument("--config", default=DEFAULT_CONFIG)
+    parser.add_argument("--chats", type=int, default=10)
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--players", type=int, default=3)
+    parser.add_argument("--think-time", type=float, default=0.0)
+    parser.add_argument("--reply-timeout", type=float, default=5.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--tracemalloc", action="store_true")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", dest="json_path", default=None)
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run_scenario(
+            config_path=args.config,
+            chats=args.chats,
+            messages=args.messages,
+            players=args.players,
+            think_time=args.think_time,
+            reply_timeout=args.reply_timeout,
+            latency=args.latency,
+            error_rate=args.error_rate,
+            trace_memory=args.tracemalloc,
+            seed=args.seed,
+        )
+    )
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+from dataclasses import dataclass
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer, loop_context
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.store import Store
+from app.store.storage import create_storage
+from app.store.storage.memory import MemoryStorage
+from app.words.normalize import normalize_many
+from tests.fixtures.common import server  # noqa: F401
+
+WORD_PREFIX = "бенч"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--bench-sizes",
+        default="1000,100000,1000000",
+        help="comma separated dictionary sizes to seed",
+    )
+    parser.addoption(
+        "--bench-storage",
+        default="sql",
+        choices=("sql", "memory"),
+        help="storage engine behind the words and admin accessors",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    sizes = metafunc.config.getoption("bench_sizes").split(",")
+    if "dictionary_size" in metafunc.fixturenames:
+        metafunc.parametrize(
+            "dictionary_size",
+            [int(size) for size in sizes],
+            ids=[f"words={size}" for size in sizes],
+        )
+    if "dataset" in metafunc.fixturenames:
+        metafunc.parametrize(
+            "dataset",
+            [int(size) for size in sizes],
+            indirect=True,
+            scope="session",
+            ids=[f"words={size}" for size in sizes],
+        )
+
+
+@dataclass
+class Dataset:
+    size: int
+
+    def title(self, i: int) -> str:
+        return f"{WORD_PREFIX}{i:07d}"
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    with loop_context() as _loop:
+        yield _loop
+
+
+@pytest.fixture(scope="session")
+def cli(request, event_loop, server) -> TestClient:
+    engine = request.config.getoption("bench_storage")
+    if engine != server.config.storage.engine:
+        server.config.storage.engine = engine
+        server.store.storage = create_storage(server)
+    client = TestClient(TestServer(server), loop=event_loop)
+    event_loop.run_until_complete(client.start_server())
+    yield client
+    event_loop.run_until_complete(client.close())
+
+
+@pytest.fixture(scope="session")
+def store(cli) -> Store:
+    return cli.server.app.store
+
+
+@pytest.fixture(scope="session")
+def run(event_loop):
+    def _run(coro):
+        return event_loop.run_until_complete(coro)
+
+    return _run
+
+
+async def seed_words(conn, size: int):
+    titles = [f"{WORD_PREFIX}{i:07d}" for i in range(size)]
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        "words",
+        records=(
+            (title, canonical, i % 10 != 0)
+            for i, (title, canonical) in enumerate(
+                zip(titles, normalize_many(titles))
+            )
+        ),
+        columns=["title", "canonical", "is_correct"],
+    )
+
+
+async def seed_memory(storage: MemoryStorage, size: int):
+    titles = [f"{WORD_PREFIX}{i:07d}" for i in range(size)]
+    await storage.import_words(
+        [
+            {"title": title, "canonical": canonical, "is_correct": i % 10 != 0}
+            for i, (title, canonical) in enumerate(
+                zip(titles, normalize_many(titles))
+            )
+        ]
+    )
+
+
+@pytest.fixture(scope="session")
+def dataset(request, run, cli, store: Store) -> Dataset:
+    if isinstance(store.storage, MemoryStorage):
+        storage = store.storage
+        admins = storage.admins
+        run(seed_memory(storage, request.param))
+        store.words.bump_version()
+        yield Dataset(size=request.param)
+        store.storage = MemoryStorage(cli.server.app)
+        store.storage.admins = admins
+        store.words.bump_version()
+        return
+    database = cli.server.app.database
+    conn = run(database._engine.connect())
+    transaction = run(conn.begin())
+    run(seed_words(conn, request.param))
+    real_session = database.session
+    database.session = sessionmaker(
+        bind=conn, expire_on_commit=False, class_=AsyncSession
+    )
+    store.words.bump_version()
+    yield Dataset(size=request.param)
+    database.session = real_session
+    run(transaction.rollback())
+    run(conn.close())
+    store.words.bump_version()
+
+
+@pytest.fixture(scope="session")
+def authed_cli(run, cli, server) -> TestClient:
+    run(
+        cli.post(
+            "/admin.login",
+            json={
+                "email": server.config.admin.email,
+                "password": server.config.admin.password,
+            },
+        )
+    )
+    return cli
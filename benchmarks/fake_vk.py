@@ -0,0 +1,180 @@
+import asyncio
+import json
+import random
+import re
+import time
+from collections import deque
+from typing import Callable, Optional, Union
+
+from aiohttp import web
+
+CHAT_PEER_OFFSET = 2000000000
+
+EXECUTE_SEND_RE = re.compile(r"API\.messages\.send\((\{.*?\})\)")
+
+
+class FakeVkServer:
+    def __init__(
+        self,
+        latency: Union[float, dict[str, float]] = 0.0,
+        error_rate: Union[float, dict[str, float]] = 0.0,
+        members_count: int = 3,
+        members_online: int = 3,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.members_count = members_count
+        self.members_online = members_online
+        self.random = random.Random(seed)
+
+        self.on_send: Optional[Callable[[int, str], None]] = None
+        self.calls: dict[str, int] = {}
+        self.errors: dict[str, int] = {}
+        self.sent = 0
+        self.delivered = 0
+
+        self._events: deque[dict] = deque()
+        self._events_offset = 0
+        self._new_events = asyncio.Event()
+        self._message_id = 0
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url: Optional[str] = None
+
+        self.app = web.Application()
+        self.app.router.add_get("/method/{method}", self.handle_method)
+        self.app.router.add_get("/lp", self.handle_long_poll)
+
+    @property
+    def api_path(self) -> str:
+        return f"{self.base_url}/method/"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+    def push_message(
+        self,
+        peer_id: int,
+        from_id: int,
+        text: str,
+    ) -> None:
+        self._message_id += 1
+        self._events.append(
+            {
+                "type": "message_new",
+                "object": {
+                    "message": {
+                        "peer_id": peer_id,
+                        "from_id": from_id,
+                        "text": text,
+                        "conversation_message_id": self._message_id,
+                        "date": int(time.time()),
+                    }
+                },
+            }
+        )
+        self._new_events.set()
+
+    def _option(self, option: Union[float, dict[str, float]], method: str):
+        if isinstance(option, dict):
+            return option.get(method, 0.0)
+        return option
+
+    async def handle_method(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        self.calls[method] = self.calls.get(method, 0) + 1
+        latency = self._option(self.latency, method)
+        if latency:
+            await asyncio.sleep(latency)
+        if self.random.random() < self._option(self.error_rate, method):
+            self.errors[method] = self.errors.get(method, 0) + 1
+            return web.json_response(
+                {
+                    "error": {
+                        "error_code": 6,
+                        "error_msg": "Too many requests per second",
+                    }
+                }
+            )
+        handler = {
+            "groups.getLongPollServer": self._get_long_poll_server,
+            "messages.send": self._send,
+            "messages.getConversationMembers": self._get_members,
+            "execute": self._execute,
+        }.get(method)
+        if handler is None:
+            return web.json_response(
+                {"error": {"error_code": 3, "error_msg": "Unknown method"}}
+            )
+        return web.json_response({"response": handler(request.query)})
+
+    def _get_long_poll_server(self, params) -> dict:
+        return {
+            "key": "fake",
+            "server": f"{self.base_url}/lp",
+            "ts": self._events_offset + len(self._events),
+        }
+
+    def _record_send(self, peer_id: int, text: str) -> int:
+        self.sent += 1
+        self._message_id += 1
+        if self.on_send:
+            self.on_send(peer_id, text)
+        return self._message_id
+
+    def _send(self, params) -> int:
+        return self._record_send(int(params["peer_id"]), params.get("message"))
+
+    def _get_members(self, params) -> dict:
+        peer_id = int(params["peer_id"])
+        profiles = [
+            {
+                "id": peer_id * 10 + i,
+                "first_name": "Игрок",
+                "last_name": str(i),
+                "online": int(i < self.members_online),
+            }
+            for i in range(self.members_count)
+        ]
+        return {
+            "count": len(profiles),
+            "items": [{"member_id": p["id"]} for p in profiles],
+            "profiles": profiles,
+        }
+
+    def _execute(self, params) -> list:
+        response = []
+        for call in EXECUTE_SEND_RE.findall(params.get("code", "")):
+            args = json.loads(call)
+            response.append(
+                self._record_send(int(args["peer_id"]), args.get("message"))
+            )
+        return response
+
+    async def handle_long_poll(self, request: web.Request) -> web.Response:
+        ts = int(request.query["ts"])
+        wait = float(request.query.get("wait", 25))
+        available = self._events_offset + len(self._events)
+        if ts >= available:
+            self._new_events.clear()
+            try:
+                await asyncio.wait_for(self._new_events.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+            available = self._events_offset + len(self._events)
+        while self._events_offset < ts and self._events:
+            self._events.popleft()
+            self._events_offset += 1
+        updates = list(self._events)[max(ts - self._events_offset, 0) :]
+        self.delivered += len(updates)
+        return web.json_response({"ts": available, "updates": updates})
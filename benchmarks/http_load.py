@@ -0,0 +1,117 @@
+import argparse
+import asyncio
+import json
+import time
+from typing import Optional
+
+from aiohttp import ClientSession
+
+from benchmarks.stats import latency_summary
+
+SCENARIOS = {
+    "current": ("GET", "/admin.current"),
+    "list_words": ("GET", "/words.list_words"),
+    "list_settings": ("GET", "/words.list_settings"),
+    "get_word": ("GET", "/words.get_word?title={title}"),
+}
+
+
+async def login(session: ClientSession, url: str, email: str, password: str):
+    async with session.post(
+        f"{url}/admin.login", json={"email": email, "password": password}
+    ) as resp:
+        resp.raise_for_status()
+
+
+async def worker(
+    session: ClientSession,
+    method: str,
+    url: str,
+    deadline: float,
+    latencies: list[float],
+    statuses: dict[int, int],
+    etag: bool,
+):
+    headers = {}
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        async with session.request(method, url, headers=headers) as resp:
+            await resp.read()
+            if etag and "ETag" in resp.headers:
+                headers["If-None-Match"] = resp.headers["ETag"]
+        latencies.append(time.perf_counter() - started)
+        statuses[resp.status] = statuses.get(resp.status, 0) + 1
+
+
+async def run_load(
+    url: str,
+    scenario: str,
+    email: str,
+    password: str,
+    concurrency: int = 10,
+    duration: float = 10.0,
+    title: Optional[str] = None,
+    etag: bool = False,
+) -> dict:
+    method, path = SCENARIOS[scenario]
+    target = url + path.format(title=title or "")
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    async with ClientSession() as session:
+        await login(session, url, email, password)
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(
+            *(
+                worker(
+                    session, method, target, deadline, latencies, statuses, etag
+                )
+                for _ in range(concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - started
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "etag": etag,
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "statuses": statuses,
+        "latency_ms": latency_summary(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load the admin HTTP API")
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--scenario", choices=SCENARIOS, default="list_words")
+    parser.add_argument("--email", default="admin@admin.com")
+    parser.add_argument("--password", default="admin")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--title", default=None)
+    parser.add_argument("--etag", action="store_true")
+    parser.add_argument("--json", dest="json_path", default=None)
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run_load(
+            url=args.url,
+            scenario=args.scenario,
+            email=args.email,
+            password=args.password,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            title=args.title,
+            etag=args.etag,
+        )
+    )
+    output = json.dumps(report, indent=2)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+SCENARIOS = {
+    "import": "import app.web.app",
+    "setup": "from app.web.app import setup_app; setup_app({config!r})",
+}
+
+
+def parse_importtime(output: str) -> list[tuple[str, int, int, int]]:
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return modules
+
+
+def measure(scenario: str, config_path: str) -> dict:
+    code = SCENARIOS[scenario].format(config=config_path)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = parse_importtime(result.stderr)
+    top_level = [m for m in modules if m[3] == 0]
+    return {
+        "scenario": scenario,
+        "total_ms": sum(m[2] for m in top_level) / 1000,
+        "modules": len(modules),
+        "slowest": [
+            {"module": name, "cumulative_ms": cumulative / 1000}
+            for name, _, cumulative, _ in sorted(
+                top_level, key=lambda m: m[2], reverse=True
+            )[:15]
+        ],
+    }
+
+
+def best_of(
+    scenario: str, config_path: str, repeat: int, budget_ms: Optional[float]
+) -> dict:
+    runs = [measure(scenario, config_path) for _ in range(repeat)]
+    report = min(runs, key=lambda r: r["total_ms"])
+    report["budget_ms"] = budget_ms
+    report["within_budget"] = (
+        budget_ms is None or report["total_ms"] <= budget_ms
+    )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure cold start with python -X importtime"
+    )
+    parser.add_argument("--scenario", choices=SCENARIOS, default="setup")
+    parser.add_argument("--config", default=os.path.join(ROOT, "config.yml"))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--json", dest="json_path", default=None)
+    args = parser.parse_args()
+
+    report = best_of(args.scenario, args.config, args.repeat, args.budget_ms)
+    output = json.dumps(report, indent=2)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            f.write(output)
+    print(output)
+    if not report["within_budget"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+from typing import Optional
+
+
+def percentile(values: list[float], p: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    k = (len(values) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def latency_summary(latencies: list[float]) -> dict:
+    return {
+        name: (percentile(latencies, p) * 1000 if latencies else None)
+        for name, p in (("p50", 50), ("p90", 90), ("p99", 99), ("max", 100))
+    }
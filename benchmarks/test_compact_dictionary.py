@@ -0,0 +1,94 @@
+import random
+import tracemalloc
+
+import pytest
+
+from app.store.words.compact import CompactDictionary
+from app.store.words.suggest import SuggestionIndex
+from app.words.models import WordModel
+
+ALPHABET = "абвгдежзийклмнопрстуфхцчшщъыьэюя"
+
+
+def generate_words(size: int) -> list[tuple[int, str, bool]]:
+    rng = random.Random(size)
+    titles = set()
+    while len(titles) < size:
+        titles.add(
+            "".join(rng.choice(ALPHABET) for _ in range(rng.randint(4, 12)))
+        )
+    return [
+        (i, title, i % 10 != 0) for i, title in enumerate(sorted(titles), 1)
+    ]
+
+
+def traced_size(build) -> tuple[object, int]:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+@pytest.fixture(scope="module")
+def words(dictionary_size) -> list[tuple[int, str, bool]]:
+    return generate_words(dictionary_size)
+
+
+def build_models(words) -> dict[str, WordModel]:
+    models = {}
+    for word_id, title, is_correct in words:
+        # a fresh copy, as if the title had been read from the database
+        title = title.encode("utf-8").decode("utf-8")
+        models[title] = WordModel(
+            id=word_id, title=title, is_correct=is_correct
+        )
+    return models
+
+
+class TestMemory:
+    def test_dict_of_dataclasses(self, benchmark, words, dictionary_size):
+        models, size = traced_size(lambda: build_models(words))
+        benchmark.extra_info["memory_bytes"] = size
+        benchmark.extra_info["bytes_per_word"] = size / dictionary_size
+        titles = [
+            title for _, title, _ in words[:: max(dictionary_size // 1000, 1)]
+        ]
+        benchmark(lambda: [models.get(title) for title in titles])
+
+    def test_compact(self, benchmark, words, dictionary_size):
+        compact, size = traced_size(lambda: CompactDictionary.from_words(words))
+        benchmark.extra_info["memory_bytes"] = size
+        benchmark.extra_info["bytes_per_word"] = size / dictionary_size
+        benchmark.extra_info["packed_bytes"] = compact.memory_size()
+        titles = [
+            title for _, title, _ in words[:: max(dictionary_size // 1000, 1)]
+        ]
+        found = benchmark(lambda: [compact.get(title) for title in titles])
+        assert all(found)
+
+
+class TestPrefix:
+    def test_compact_first_letter(self, benchmark, words):
+        compact = CompactDictionary.from_words(words)
+        benchmark(lambda: compact.random_correct(first_letter="к"))
+
+    def test_compact_prefix_iteration(self, benchmark, words):
+        compact = CompactDictionary.from_words(words)
+        benchmark(lambda: sum(1 for _ in compact.iter_prefix("ко")))
+
+
+class TestSuggestions:
+    def test_lookup(self, benchmark, words, dictionary_size):
+        compact = CompactDictionary.from_words(words)
+        index, size = traced_size(lambda: SuggestionIndex.build(compact))
+        benchmark.extra_info["memory_bytes"] = size
+        benchmark.extra_info["bytes_per_word"] = size / dictionary_size
+        rng = random.Random(dictionary_size)
+        typos = []
+        for _, title, _ in rng.sample(words, 1000):
+            i = rng.randrange(len(title))
+            typos.append(title[:i] + rng.choice(ALPHABET) + title[i + 1 :])
+        typos = iter(typos * 1000)
+        benchmark(lambda: index.lookup(next(typos)))
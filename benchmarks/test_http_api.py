@@ -0,0 +1,163 @@
+from itertools import count
+
+import pytest
+from aiohttp.test_utils import TestClient
+
+from app.store import Store
+from benchmarks.conftest import Dataset
+
+
+def request(run, cli: TestClient, method: str, path: str, **kwargs) -> int:
+    async def _request():
+        resp = await cli.request(method, path, **kwargs)
+        await resp.read()
+        return resp.status
+
+    return run(_request())
+
+
+class TestAuth:
+    def test_login(self, benchmark, run, cli: TestClient, server):
+        status = benchmark(
+            request,
+            run,
+            cli,
+            "POST",
+            "/admin.login",
+            json={
+                "email": server.config.admin.email,
+                "password": server.config.admin.password,
+            },
+        )
+        assert status == 200
+
+    def test_session_middleware(self, benchmark, run, authed_cli: TestClient):
+        status = benchmark(request, run, authed_cli, "GET", "/admin.current")
+        assert status == 200
+
+
+class TestWordsApi:
+    def test_get_word(
+        self, benchmark, run, authed_cli: TestClient, dataset: Dataset
+    ):
+        status = benchmark(
+            request,
+            run,
+            authed_cli,
+            "GET",
+            "/words.get_word",
+            params={"title": dataset.title(dataset.size // 2)},
+        )
+        assert status == 200
+
+    def test_list_words_cold(
+        self,
+        benchmark,
+        run,
+        authed_cli: TestClient,
+        store: Store,
+        dataset: Dataset,
+    ):
+        def cold_request():
+            authed_cli.server.app.cache.clear()
+            return request(run, authed_cli, "GET", "/words.list_words")
+
+        status = benchmark.pedantic(cold_request, rounds=3, iterations=1)
+        assert status == 200
+
+    def test_list_words_cached(
+        self, benchmark, run, authed_cli: TestClient, dataset: Dataset
+    ):
+        request(run, authed_cli, "GET", "/words.list_words")
+        status = benchmark(request, run, authed_cli, "GET", "/words.list_words")
+        assert status == 200
+
+    def test_list_words_not_modified(
+        self, benchmark, run, authed_cli: TestClient, dataset: Dataset
+    ):
+        async def get_etag():
+            resp = await authed_cli.get("/words.list_words")
+            await resp.read()
+            return resp.headers["ETag"]
+
+        etag = run(get_etag())
+        status = benchmark(
+            request,
+            run,
+            authed_cli,
+            "GET",
+            "/words.list_words",
+            headers={"If-None-Match": etag},
+        )
+        assert status == 304
+
+    def test_add_and_delete_word(
+        self, benchmark, run, authed_cli: TestClient, dataset: Dataset
+    ):
+        counter = count()
+
+        async def add_and_delete():
+            resp = await authed_cli.post(
+                "/words.add_word",
+                json={
+                    "title": f"новоеслово{next(counter)}",
+                    "is_correct": True,
+                },
+            )
+            data = await resp.json()
+            resp = await authed_cli.post(
+                "/words.delete_word", json={"id": data["data"]["id"]}
+            )
+            return resp.status
+
+        status = benchmark(lambda: run(add_and_delete()))
+        assert status == 200
+
+    def test_patch_word(
+        self,
+        benchmark,
+        run,
+        authed_cli: TestClient,
+        store: Store,
+        dataset: Dataset,
+    ):
+        word = run(store.words.get_word_by_title(dataset.title(1)))
+        flags = count()
+
+        def patch():
+            return request(
+                run,
+                authed_cli,
+                "POST",
+                "/words.patch_word",
+                json={"id": word.id, "is_correct": bool(next(flags) % 2)},
+            )
+
+        status = benchmark(patch)
+        assert status == 200
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"format": "csv"},
+            {"format": "jsonl"},
+            {"format": "csv", "gzip": "true"},
+        ],
+        ids=["csv", "jsonl", "csv-gzip"],
+    )
+    def test_export(
+        self, benchmark, run, authed_cli: TestClient, dataset: Dataset, params
+    ):
+        async def export():
+            resp = await authed_cli.get("/words.export", params=params)
+            async for _ in resp.content.iter_chunked(1 << 16):
+                pass
+            return resp.status
+
+        status = benchmark.pedantic(
+            lambda: run(export()), rounds=3, iterations=1
+        )
+        assert status == 200
+        benchmark.extra_info["rows_per_minute"] = (
+            dataset.size * 60 / benchmark.stats.stats.mean
+        )
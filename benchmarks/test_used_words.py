@@ -0,0 +1,71 @@
+import random
+import tracemalloc
+
+import pytest
+
+from app.store.game.used_words import UsedWords
+
+GAMES = 10_000
+DICTIONARY_SIZE = 1_000_000
+ALPHABET = "абвгдежзийклмнопрстуфхцчшщъыьэюя"
+
+
+def traced_size(build) -> tuple[object, int]:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def title(word_id: int) -> str:
+    rng = random.Random(word_id)
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(4, 12)))
+
+
+@pytest.fixture(scope="module", params=[20, 100], ids=["moves=20", "moves=100"])
+def games(request) -> list[list[int]]:
+    rng = random.Random(request.param)
+    return [
+        rng.sample(range(DICTIONARY_SIZE), request.param) for _ in range(GAMES)
+    ]
+
+
+def build_title_sets(games) -> list[frozenset]:
+    # every move adds a title parsed from a fresh message, as the bot did
+    result = []
+    for ids in games:
+        used = frozenset()
+        for word_id in ids:
+            used = used | {title(word_id)}
+        result.append(used)
+    return result
+
+
+def build_used_words(games) -> list[UsedWords]:
+    result = []
+    for ids in games:
+        used = UsedWords()
+        for word_id in ids:
+            used = used.add(word_id)
+        result.append(used)
+    return result
+
+
+class TestConcurrentGames:
+    def test_title_sets(self, benchmark, games):
+        sets, size = traced_size(lambda: build_title_sets(games))
+        benchmark.extra_info["memory_bytes"] = size
+        benchmark.extra_info["bytes_per_game"] = size / GAMES
+        probes = [(used, title(ids[0])) for used, ids in zip(sets, games)]
+        benchmark(lambda: [word in used for used, word in probes])
+
+    def test_used_words(self, benchmark, games):
+        sets, size = traced_size(lambda: build_used_words(games))
+        benchmark.extra_info["memory_bytes"] = size
+        benchmark.extra_info["bytes_per_game"] = size / GAMES
+        probes = [(used, ids[0]) for used, ids in zip(sets, games)]
+        benchmark(
+            lambda: [used.contains_id(word_id) for used, word_id in probes]
+        )
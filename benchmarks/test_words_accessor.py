@@ -0,0 +1,62 @@
+from itertools import count
+
+from app.store import Store
+from benchmarks.conftest import Dataset
+
+
+class TestWordsAccessor:
+    def test_get_word_by_title(
+        self, benchmark, run, store: Store, dataset: Dataset
+    ):
+        title = dataset.title(dataset.size // 2)
+        word = benchmark(lambda: run(store.words.get_word_by_title(title)))
+        assert word.title == title
+
+    def test_get_word_by_id(
+        self, benchmark, run, store: Store, dataset: Dataset
+    ):
+        word = run(
+            store.words.get_word_by_title(dataset.title(dataset.size // 2))
+        )
+        found = benchmark(lambda: run(store.words.get_word_by_id(word.id)))
+        assert found.id == word.id
+
+    def test_list_words(self, benchmark, run, store: Store, dataset: Dataset):
+        words = benchmark.pedantic(
+            lambda: run(store.words.list_words()), rounds=3, iterations=1
+        )
+        assert len(words) >= dataset.size
+
+    def test_list_correct_words(
+        self, benchmark, run, store: Store, dataset: Dataset
+    ):
+        words = benchmark.pedantic(
+            lambda: run(store.words.list_words(is_correct=True)),
+            rounds=3,
+            iterations=1,
+        )
+        assert all(word.is_correct for word in words)
+
+    def test_create_and_delete_word(
+        self, benchmark, run, store: Store, dataset: Dataset
+    ):
+        counter = count()
+
+        async def create_and_delete():
+            word = await store.words.create_word(
+                f"новоеслово{next(counter)}", True
+            )
+            await store.words.delete_word(word.id)
+
+        benchmark(lambda: run(create_and_delete()))
+
+    def test_patch_word(self, benchmark, run, store: Store, dataset: Dataset):
+        word = run(store.words.get_word_by_title(dataset.title(1)))
+        flags = count()
+        benchmark(
+            lambda: run(
+                store.words.patch_word(
+                    word.id, is_correct=bool(next(flags) % 2)
+                )
+            )
+        )
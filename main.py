@@ -1,11 +1,10 @@
 import os
 
-from app.web.app import setup_app
-from aiohttp.web import run_app
+from app.web.runner import run
 
 if __name__ == "__main__":
-    run_app(
-        setup_app(
+    raise SystemExit(
+        run(
             config_path=os.path.join(
                 os.path.dirname(os.path.realpath(__file__)), "config.yml"
             )
@@ -23,3 +23,21 @@ class TestHandleUpdates:
         message: Message = store.vk_api.send_message.mock_calls[0].args[0]
         assert message.peer_id == 1
         assert message.text
+
+    async def test_writes_do_not_pin_later_updates(
+        self, server, store, monkeypatch
+    ):
+        wrote = []
+
+        async def handle_update(update):
+            wrote.append(server.database.wrote)
+            server.database.mark_written()
+
+        monkeypatch.setattr(store.bots_manager, "handle_update", handle_update)
+        update = Update(
+            type="message_new",
+            object=UpdateObject(peer_id=1, user_id=1, body=""),
+        )
+        await store.bots_manager.handle_updates([update, update])
+        assert wrote == [False, False]
+        assert server.database.wrote is False
@@ -0,0 +1,61 @@
+from app.store import Store
+from app.store.dedup.accessor import DedupWindow
+from app.store.vk_api.dataclasses import Update, UpdateObject
+from app.web.config import Config
+
+
+def message(peer_id: int, message_id: int, body: str = "привет") -> Update:
+    return Update(
+        type="message_new",
+        object=UpdateObject(
+            peer_id=peer_id,
+            user_id=1,
+            body=body,
+            conversation_message_id=message_id,
+        ),
+    )
+
+
+class TestDedupWindow:
+    def test_bounded(self):
+        window = DedupWindow(size=2)
+        assert window.add((1, 1))
+        assert not window.add((1, 1))
+        assert window.add((1, 2))
+        assert window.add((1, 3))
+        assert len(window) == 2
+        assert (1, 1) not in window
+
+
+class TestDedupAccessor:
+    async def test_in_memory(self, store: Store):
+        updates = [message(1, 1), message(1, 1), message(2, 1)]
+        fresh = await store.dedup.filter(updates)
+        assert [u.object.peer_id for u in fresh] == [1, 2]
+        assert await store.dedup.filter([message(1, 1)]) == []
+
+    async def test_without_message_id(self, store: Store):
+        update = Update(
+            type="message_new",
+            object=UpdateObject(peer_id=1, user_id=1, body="привет"),
+        )
+        assert await store.dedup.filter([update, update]) == [update, update]
+
+    async def test_shared(self, store: Store, config: Config, monkeypatch):
+        monkeypatch.setattr(config.dedup, "shared", True)
+        assert (
+            len(await store.dedup.filter([message(1, 1), message(1, 2)])) == 2
+        )
+
+        # another process already handled (1, 2)
+        store.dedup.clear()
+        fresh = await store.dedup.filter([message(1, 2), message(1, 3)])
+        assert [u.object.conversation_message_id for u in fresh] == [3]
+
+
+class TestHandleDuplicates:
+    async def test_duplicate_is_not_answered(self, store: Store):
+        calls = store.vk_api.send_message.call_count
+        await store.bots_manager.handle_updates([message(1, 7)])
+        await store.bots_manager.handle_updates([message(1, 7)])
+        assert store.vk_api.send_message.call_count - calls == 1
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from app.store.bot.messages import MessageCatalog, Template, get_catalog
+from app.store.vk_api.dataclasses import Update, UpdateObject
+
+
+class TestTemplate:
+    def test_render(self):
+        template = Template("{name}, слово на «{letter}»")
+        assert template.render(name="Вася", letter="а") == "Вася, слово на «а»"
+
+    def test_static(self):
+        assert Template("Счёт: {{}}").render() == "Счёт: {}"
+
+    def test_format_spec_rejected(self):
+        with pytest.raises(ValueError):
+            Template("{score:>3}")
+
+
+class TestMessageCatalog:
+    def test_cached_per_locale(self):
+        assert get_catalog("ru") is get_catalog("ru")
+
+    def test_keyboard_is_serialized_once(self):
+        catalog = MessageCatalog("ru")
+        keyboard = catalog.keyboard("vote")
+        assert keyboard is catalog.keyboard("vote")
+        data = json.loads(keyboard)
+        assert data["inline"] is True
+        assert [b["action"]["label"] for b in data["buttons"][0]] == [
+            "Да",
+            "Нет",
+        ]
+        assert json.loads(data["buttons"][0][0]["action"]["payload"]) == {
+            "command": "yes"
+        }
+
+    def test_scoreboard(self):
+        catalog = MessageCatalog("ru")
+        text = catalog.scoreboard([("Вася", 10), ("Петя", 3)])
+        assert text == "Счёт:\n1. Вася — 10\n2. Петя — 3"
+        assert catalog.scoreboard([("Петя", 1)]) == "Счёт:\n1. Петя — 1"
+        assert catalog.scoreboard([]) == "Пока никто не набрал очков"
+
+
+class TestBotMessages:
+    async def test_echo(self, store):
+        await store.bots_manager.handle_updates(
+            [
+                Update(
+                    type="message_new",
+                    object=UpdateObject(peer_id=1, user_id=1, body="привет"),
+                )
+            ]
+        )
+        message = store.vk_api.send_message.call_args.args[0]
+        assert message.text == "И тебе привет"
+        assert message.keyboard is None
@@ -0,0 +1,77 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.store.vk_api.poller import Poller
+
+
+def make_poller(poll, handle_updates) -> Poller:
+    return Poller(
+        SimpleNamespace(
+            vk_api=SimpleNamespace(poll=poll),
+            bots_manager=SimpleNamespace(handle_updates=handle_updates),
+        )
+    )
+
+
+async def quick_poll():
+    await asyncio.sleep(0.01)
+    return ["update"]
+
+
+class TestPollerStop:
+    async def test_drains_handlers(self):
+        handled = []
+
+        async def handle_updates(updates):
+            await asyncio.sleep(0.1)
+            handled.append(updates)
+
+        poller = make_poller(quick_poll, handle_updates)
+        await poller.start()
+        await asyncio.sleep(0.05)
+        assert poller.is_handling
+
+        await poller.stop(timeout=1)
+        assert handled == [["update"]]
+        assert poller.poll_task.cancelled() is False
+
+    async def test_cancels_idle_long_poll(self):
+        async def long_poll():
+            await asyncio.sleep(10)
+            return []
+
+        poller = make_poller(long_poll, None)
+        await poller.start()
+        await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(poller.stop(timeout=1), 0.5)
+        assert poller.poll_task.cancelled()
+
+    async def test_cancels_after_timeout(self):
+        async def stuck(_):
+            await asyncio.sleep(10)
+
+        poller = make_poller(quick_poll, stuck)
+        await poller.start()
+        await asyncio.sleep(0.05)
+
+        await asyncio.wait_for(poller.stop(timeout=0.05), 0.5)
+        assert poller.poll_task.cancelled()
+
+
+class TestPollerErrors:
+    async def test_keeps_polling_after_failed_batch(self):
+        handled = []
+
+        async def handle_updates(updates):
+            handled.append(updates)
+            if len(handled) == 1:
+                raise RuntimeError("broken update")
+
+        poller = make_poller(quick_poll, handle_updates)
+        await poller.start()
+        await asyncio.sleep(0.05)
+
+        await poller.stop(timeout=1)
+        assert len(handled) > 1
+        assert not poller.is_handling
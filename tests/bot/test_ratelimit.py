@@ -0,0 +1,69 @@
+import pytest
+
+from app.store import Store
+from app.store.bot.ratelimit import TokenBuckets, UpdateRateLimiter
+from app.store.vk_api.dataclasses import Update, UpdateObject
+
+
+def message(peer_id: int, user_id: int, body: str = "привет") -> Update:
+    return Update(
+        type="message_new",
+        object=UpdateObject(peer_id=peer_id, user_id=user_id, body=body),
+    )
+
+
+class TestTokenBuckets:
+    def test_refill(self):
+        buckets = TokenBuckets(rate=1, burst=2)
+        assert buckets.tokens("a", 0) == 2
+        buckets.take("a", 0, 2)
+        buckets.take("a", 0, 1)
+        assert buckets.tokens("a", 0) == 0
+        assert buckets.tokens("a", 0.5) == 0.5
+        assert buckets.tokens("a", 10) == 2
+
+    def test_idle_buckets_expire(self):
+        buckets = TokenBuckets(rate=1, burst=2)
+        for key in range(100):
+            buckets.take(key, 0, 2)
+        assert len(buckets) == 100
+        for key in range(100, 200):
+            buckets.take(key, 5, 2)
+        assert len(buckets) == 100
+
+
+class TestUpdateRateLimiter:
+    def test_drop(self):
+        limiter = UpdateRateLimiter(1, 2, 10, 10)
+        updates = [message(1, 10) for _ in range(4)] + [message(1, 20)]
+        allowed = limiter.filter(updates, now=0)
+        assert [u.object.user_id for u in allowed] == [10, 10, 20]
+        assert len(limiter.filter([message(1, 10)], now=1)) == 1
+
+    def test_peer_limit(self):
+        limiter = UpdateRateLimiter(10, 10, 1, 3)
+        updates = [message(1, user_id) for user_id in range(5)]
+        assert len(limiter.filter(updates, now=0)) == 3
+        assert len(limiter.filter([message(2, 1)], now=0)) == 1
+
+    def test_merge(self):
+        limiter = UpdateRateLimiter(1, 1, 10, 10, policy="merge")
+        updates = [message(1, 10, str(i)) for i in range(3)]
+        assert [u.object.body for u in limiter.filter(updates, now=0)] == ["0"]
+        assert limiter.filter([], now=0.5) == []
+        assert [u.object.body for u in limiter.filter([], now=1)] == ["2"]
+        assert limiter.deferred == {}
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError):
+            UpdateRateLimiter(1, 1, 1, 1, policy="queue")
+
+
+class TestHandleUpdatesLimited:
+    async def test_flood_is_dropped(self, store: Store):
+        calls = store.vk_api.send_message.call_count
+        burst = int(store.bots_manager.rate_limiter.users.burst)
+        await store.bots_manager.handle_updates(
+            [message(1, 10) for _ in range(burst + 3)]
+        )
+        assert store.vk_api.send_message.call_count - calls == burst
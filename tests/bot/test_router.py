@@ -0,0 +1,116 @@
+import pytest
+
+from app.store import Store
+from app.store.bot.manager import router as bot_router
+from app.store.bot.router import Argument, ArgumentError, CommandRouter
+from app.store.vk_api.dataclasses import Update, UpdateObject
+
+
+def make_router() -> CommandRouter:
+    router = CommandRouter()
+
+    @router.command("start", "старт", "начать игру")
+    async def start():
+        pass
+
+    @router.command("top", "топ", args=[Argument("limit", int, 10)])
+    async def top():
+        pass
+
+    return router
+
+
+class TestCommandRouter:
+    @pytest.mark.parametrize(
+        "text,name,args",
+        [
+            ("старт", "start", {}),
+            ("  СТАРТ ", "start", {}),
+            ("начать игру", "start", {}),
+            ("топ", "top", {"limit": 10}),
+            ("топ   5", "top", {"limit": 5}),
+            ("top 3", "top", {"limit": 3}),
+        ],
+    )
+    def test_match(self, text, name, args):
+        match = make_router().match(text)
+        assert match.command.name == name
+        assert match.args == args
+
+    @pytest.mark.parametrize("text", ["", "стартап", "окно", "начать", "то"])
+    def test_no_match(self, text):
+        assert make_router().match(text) is None
+
+    def test_bad_arguments(self):
+        router = make_router()
+        with pytest.raises(ArgumentError) as e:
+            router.match("топ много")
+        assert e.value.command.name == "top"
+        with pytest.raises(ArgumentError):
+            router.match("старт сейчас же")
+
+    def test_duplicate_alias(self):
+        router = make_router()
+        with pytest.raises(ValueError):
+            router.command("restart", "старт")(lambda: None)
+
+    def test_bot_commands(self):
+        for name in ("start", "stop", "top", "rules", "skip"):
+            assert bot_router.by_name(name) is not None
+
+
+class TestBotCommands:
+    async def test_rules(self, store: Store):
+        await store.bots_manager.handle_updates(
+            [
+                Update(
+                    type="message_new",
+                    object=UpdateObject(peer_id=1, user_id=1, body="Правила"),
+                )
+            ]
+        )
+        message = store.vk_api.send_message.call_args.args[0]
+        assert message.text.startswith("Называйте по очереди")
+
+    async def test_usage(self, store: Store):
+        await store.bots_manager.handle_updates(
+            [
+                Update(
+                    type="message_new",
+                    object=UpdateObject(peer_id=1, user_id=1, body="/топ все"),
+                )
+            ]
+        )
+        message = store.vk_api.send_message.call_args.args[0]
+        assert message.text == "Использование: топ [количество]"
+
+    async def test_free_text_is_not_a_command(self, store: Store):
+        await store.bots_manager.handle_updates(
+            [
+                Update(
+                    type="message_new",
+                    object=UpdateObject(
+                        peer_id=1, user_id=1, body="стоп завтра"
+                    ),
+                )
+            ]
+        )
+        message = store.vk_api.send_message.call_args.args[0]
+        assert message.text == "И тебе стоп завтра"
+
+    async def test_button_payload(self, store: Store):
+        await store.bots_manager.handle_updates(
+            [
+                Update(
+                    type="message_new",
+                    object=UpdateObject(
+                        peer_id=1,
+                        user_id=1,
+                        body="Счёт",
+                        payload={"command": "rules"},
+                    ),
+                )
+            ]
+        )
+        message = store.vk_api.send_message.call_args.args[0]
+        assert message.text.startswith("Называйте по очереди")
@@ -1 +1,25 @@
+import pytest
+
 from .fixtures import *
+from .fixtures.common import storage_engine
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--storage",
+        default=None,
+        choices=("sql", "memory"),
+        help="storage engine for the app tests, storage.engine of "
+        "tests/config.yml by default",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "sql: the test needs postgres and the sql storage engine"
+    )
+
+
+def pytest_runtest_setup(item):
+    if item.get_closest_marker("sql") and storage_engine(item.config) != "sql":
+        pytest.skip("needs the sql storage engine")
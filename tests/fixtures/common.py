@@ -11,8 +11,9 @@ from sqlalchemy.orm import sessionmaker
 
 from app.store import Database
 from app.store import Store
+from app.store.storage import create_storage
 from app.web.app import setup_app
-from app.web.config import Config
+from app.web.config import Config, load_config
 
 
 @pytest.fixture(scope="session")
@@ -21,51 +22,87 @@ def event_loop():
         yield _loop
 
 
-@pytest.fixture(scope="session")
-def server():
-    app = setup_app(
-        config_path=os.path.join(
-            os.path.abspath(os.path.dirname(__file__)), "..", "config.yml"
-        )
+CONFIG_PATH = os.path.join(
+    os.path.abspath(os.path.dirname(__file__)), "..", "config.yml"
+)
+
+
+def storage_engine(config: pytest.Config) -> str:
+    """--storage if given, else storage.engine of tests/config.yml."""
+    return (
+        config.getoption("storage", None)
+        or load_config(CONFIG_PATH).storage.engine
     )
+
+
+@pytest.fixture(scope="session")
+def server(request):
+    app = setup_app(config_path=CONFIG_PATH)
     app.on_startup.clear()
     app.on_shutdown.clear()
     app.store.vk_api = AsyncMock()
     app.store.vk_api.send_message = AsyncMock()
 
-    app.database = Database(app)
-    app.on_startup.append(app.database.connect)
+    engine = storage_engine(request.config)
+    if engine != app.config.storage.engine:
+        app.config.storage.engine = engine
+        app.store.storage = create_storage(app)
+    # only the sql engine needs postgres, with the memory one the app runs
+    # without a database connection
+    if engine == "sql":
+        app.database = Database(app)
+        app.on_startup.append(app.database.connect)
+        app.on_shutdown.append(app.database.disconnect)
     app.on_startup.append(app.store.admins.connect)
-    app.on_shutdown.append(app.database.disconnect)
 
     return app
 
 
 @pytest.fixture
-def store(server) -> Store:
+def store(cli, server) -> Store:
     return server.store
 
 
-@pytest.fixture(scope="function", autouse=True)
-async def db_session(server):
-    real_session = server.database.session
-    async with server.database._engine.begin() as conn:
-        server.database.session = sessionmaker(
+@pytest.fixture
+async def cli(aiohttp_client, server) -> TestClient:
+    sql = server.config.storage.engine == "sql"
+    if not sql:
+        server.store.storage = create_storage(server)
+    client = await aiohttp_client(server)
+    if not sql:
+        yield client
+    else:
+        # every statement of the test runs in one transaction that is
+        # rolled back afterwards
+        real_session = server.database.session
+        async with server.database._engine.begin() as conn:
+            server.database.session = sessionmaker(
                 bind=conn, expire_on_commit=False, class_=AsyncSession
             )
-        yield server.database.session
-        await conn.rollback()
-    server.database.session = real_session
+            yield client
+            await conn.rollback()
+        server.database.session = real_session
+    # versions are rolled back with the data, so cached lists and the word
+    # index must not outlive the test
+    server.store.words.clear()
+    server.cache.clear()
+    server.store.scores.pending.clear()
+    server.store.games.clear()
+    server.store.dedup.clear()
+    if server.store.bots_manager.rate_limiter is not None:
+        server.store.bots_manager.rate_limiter.clear()
 
 
 @pytest.fixture
-def config(server) -> Config:
-    return server.config
+def db_session(cli, server) -> sessionmaker:
+    if server.config.storage.engine != "sql":
+        pytest.skip("needs the sql storage engine")
+    return server.database.session
 
 
-@pytest.fixture(autouse=True)
-def cli(aiohttp_client, event_loop, server) -> TestClient:
-    return event_loop.run_until_complete(aiohttp_client(server))
+@pytest.fixture
+def config(server) -> Config:
+    return server.config
 
 
 @pytest.fixture
@@ -1,61 +1,42 @@
 import pytest
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.words.models import (
 
     WordModel, SettingModel)
+from app.store import Store
 from tests.utils import clear_table
 
 
 @pytest.fixture(scope="function")
-async def clear_words(db_session: AsyncSession):
-    await clear_table(db_session, "WORDS")
+async def clear_words(server, store: Store):
+    # a memory storage is created empty for every test
+    if server.config.storage.engine == "sql":
+        await clear_table(server.database.session, "WORDS")
+    store.words.bump_version()
 
 
 @pytest.fixture(scope="function")
-async def clear_settings(db_session: AsyncSession):
-    await clear_table(db_session, "SETTINGS")
+async def clear_settings(server, store: Store):
+    if server.config.storage.engine == "sql":
+        await clear_table(server.database.session, "SETTINGS")
+    store.words.bump_version()
 
 
 @pytest.fixture
-async def word_1(db_session: AsyncSession) -> WordModel:
-    title = "олово"
-    is_correct = True
-    new_word = WordModel(title=title, is_correct=is_correct)
-    async with db_session.begin() as session:
-        session.add(new_word)
-
-    return WordModel(id=new_word.id, title=title, is_correct=is_correct)
+async def word_1(store: Store) -> WordModel:
+    return await store.words.create_word("олово", True)
 
 
 @pytest.fixture
-async def word_2(db_session: AsyncSession) -> WordModel:
-    title = "олаво"
-    is_correct = False
-    new_word = WordModel(title=title, is_correct=is_correct)
-    async with db_session.begin() as session:
-        session.add(new_word)
-
-    return WordModel(id=new_word.id, title=title, is_correct=is_correct)
+async def word_2(store: Store) -> WordModel:
+    return await store.words.create_word("олаво", False)
 
 
 @pytest.fixture
-async def setting_1(db_session: AsyncSession) -> SettingModel:
-    title = "настройка 1"
-    timeout = 30
-    new_setting = SettingModel(title=title, timeout=timeout)
-    async with db_session.begin() as session:
-        session.add(new_setting)
-
-    return new_setting
+async def setting_1(store: Store) -> SettingModel:
+    return await store.words.create_setting("настройка 1", 30)
 
 
 @pytest.fixture
-async def setting_2(db_session: AsyncSession) -> SettingModel:
-    title = "настройка 2"
-    timeout = 60
-    new_setting = SettingModel(title=title, timeout=timeout)
-    async with db_session.begin() as session:
-        session.add(new_setting)
-
-    return new_setting
+async def setting_2(store: Store) -> SettingModel:
+    return await store.words.create_setting("настройка 2", 60)
@@ -0,0 +1,248 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from aiohttp import web
+
+from app.store import Store
+from app.store.game.accessor import GameError, next_letter
+from app.store.game.dataclasses import GAME_ACTIVE, GAME_STOPPED
+from app.store.game.used_words import UsedWords
+from app.store.vk_api.dataclasses import Player, Update, UpdateObject
+from app.words.models import WordModel
+
+PLAYERS = [
+    Player(user_id=10, name="Вася Пупкин", online=1),
+    Player(user_id=20, name="Петя Васечкин", online=1),
+]
+
+
+def message(peer_id: int, user_id: int, body: str) -> Update:
+    return Update(
+        type="message_new",
+        object=UpdateObject(peer_id=peer_id, user_id=user_id, body=body),
+    )
+
+
+class TestGameAccessor:
+    def test_move_creates_new_state(self, store: Store):
+        game = store.games.start_game(1, PLAYERS, "олово")
+        snapshot = store.games.snapshot()
+
+        moved = store.games.make_move(1, "окно", 1, word_id=7)
+        assert moved is not game
+        assert game.last_word == "олово" and game.turn == 0
+        assert moved.last_word == "окно" and moved.turn == 1
+        assert moved.points == (1, 0)
+        assert moved.used_words == UsedWords.of([7], ["олово"])
+        assert 7 not in game.used_words
+        assert snapshot == (game,)
+        assert store.games.snapshot() == (moved,)
+
+    def test_single_active_game(self, store: Store):
+        store.games.start_game(1, PLAYERS, "олово")
+        with pytest.raises(GameError):
+            store.games.start_game(1, PLAYERS, "окно")
+        store.games.stop_game(1)
+        assert store.games.start_game(1, PLAYERS, "окно").status == GAME_ACTIVE
+
+    def test_list_games(self, store: Store):
+        for peer_id in range(5, 0, -1):
+            store.games.start_game(peer_id, PLAYERS, "олово")
+        store.games.stop_game(3)
+
+        total, games = store.games.list_games(offset=1, limit=2)
+        assert total == 5
+        assert [game.peer_id for game in games] == [2, 3]
+
+        total, games = store.games.list_games(status=GAME_ACTIVE)
+        assert total == 4
+        assert 3 not in [game.peer_id for game in games]
+
+        total, games = store.games.list_games(peer_id=3, status=GAME_STOPPED)
+        assert total == 1
+
+    def test_next_letter(self):
+        assert next_letter("олово") == "о"
+        assert next_letter("конь") == "н"
+        assert next_letter("сыры") == "р"
+
+
+class TestGameViews:
+    async def test_unauthorized(self, cli):
+        resp = await cli.get("/game.list_active")
+        assert resp.status == 401
+
+    async def test_list_active(self, authed_cli, store: Store):
+        store.games.start_game(1, PLAYERS, "олово")
+        store.games.start_game(2, PLAYERS, "окно")
+        store.games.stop_game(2)
+
+        resp = await authed_cli.get("/game.list_active")
+        assert resp.status == 200
+        data = (await resp.json())["data"]
+        assert data["total"] == 1
+        game = data["games"][0]
+        assert game["peer_id"] == 1
+        assert game["current_user_id"] == 10
+        assert game["players"][1] == {
+            "user_id": 20,
+            "name": "Петя Васечкин",
+            "points": 0,
+        }
+
+        resp = await authed_cli.get(
+            "/game.list_active", params={"status": "stopped", "peer_id": 2}
+        )
+        assert (await resp.json())["data"]["total"] == 1
+
+    async def test_list_bad_status(self, authed_cli):
+        resp = await authed_cli.get(
+            "/game.list_active", params={"status": "paused"}
+        )
+        assert resp.status == 400
+
+    async def test_get(self, authed_cli, store: Store):
+        store.games.start_game(1, PLAYERS, "олово")
+        resp = await authed_cli.get("/game.get", params={"peer_id": 1})
+        assert resp.status == 200
+        assert (await resp.json())["data"]["last_word"] == "олово"
+
+    async def test_get_not_found(self, authed_cli):
+        resp = await authed_cli.get("/game.get", params={"peer_id": 1})
+        assert resp.status == 404
+
+    async def test_stop(self, authed_cli, store: Store):
+        store.games.start_game(1, PLAYERS, "олово")
+        resp = await authed_cli.post("/game.stop", json={"peer_id": 1})
+        assert resp.status == 200
+        assert (await resp.json())["data"]["status"] == GAME_STOPPED
+        assert store.games.get_active(1) is None
+        sent = store.vk_api.send_message.call_args.args[0]
+        assert sent.peer_id == 1
+
+        resp = await authed_cli.post("/game.stop", json={"peer_id": 1})
+        assert resp.status == 404
+
+    async def test_forwarded_to_bot_worker(
+        self, authed_cli, server, tmp_path, monkeypatch
+    ):
+        seen = []
+
+        async def handler(request):
+            seen.append(
+                (
+                    request.path_qs,
+                    request.headers.get("Cookie"),
+                    await request.read(),
+                )
+            )
+            return web.json_response({"status": "ok"}, status=201)
+
+        bot = web.Application()
+        bot.router.add_route("*", "/{tail:.*}", handler)
+        runner = web.AppRunner(bot)
+        await runner.setup()
+        await web.UnixSite(runner, str(tmp_path / "bot.sock")).start()
+        monkeypatch.setattr(server, "worker_id", 1)
+        monkeypatch.setattr(server, "bot_socket", str(tmp_path / "bot.sock"))
+
+        resp = await authed_cli.get("/game.get", params={"peer_id": 1})
+        assert resp.status == 201
+        assert await resp.json() == {"status": "ok"}
+        resp = await authed_cli.post("/game.stop", json={"peer_id": 1})
+        assert resp.status == 201
+        assert seen[0][0] == "/game.get?peer_id=1"
+        assert seen[0][1]
+        assert seen[1][2] == b'{"peer_id": 1}'
+
+        await runner.cleanup()
+        resp = await authed_cli.get("/game.get", params={"peer_id": 1})
+        assert resp.status == 503
+
+
+class TestGameFlow:
+    async def test_start_and_move(self, store: Store, monkeypatch, word_1):
+        monkeypatch.setattr(
+            store.vk_api, "get_players", AsyncMock(return_value=PLAYERS)
+        )
+        monkeypatch.setattr(
+            store.words,
+            "get_random_word",
+            AsyncMock(return_value=WordModel(title="олово")),
+        )
+        await store.words.create_word("окно", True)
+
+        await store.bots_manager.handle_updates([message(1, 10, "старт")])
+        assert store.games.get_active(1).last_word == "олово"
+
+        await store.bots_manager.handle_updates([message(1, 20, "окно")])
+        assert store.games.get_active(1).moves == 0
+
+        await store.bots_manager.handle_updates([message(1, 10, "Окно")])
+        game = store.games.get_active(1)
+        assert game.moves == 1
+        assert game.current_user_id == 20
+        assert store.scores.pending[(1, 10)].score == 1
+
+        await store.bots_manager.handle_updates([message(1, 20, "олово")])
+        sent = store.vk_api.send_message.call_args.args[0]
+        assert sent.text == "Слово «олово» уже было в этой игре"
+
+    async def test_display_titles(self, store: Store, monkeypatch, clear_words):
+        monkeypatch.setattr(
+            store.vk_api, "get_players", AsyncMock(return_value=PLAYERS)
+        )
+        await store.words.create_word("Мумиё", True)
+        await store.bots_manager.handle_updates([message(1, 10, "старт")])
+        sent = store.vk_api.send_message.call_args.args[0]
+        assert sent.text.startswith("Игра началась! Первое слово: Мумиё")
+        assert store.games.get_active(1).last_word == "мумие"
+
+        await store.words.create_word("Енисей", True)
+        await store.bots_manager.handle_updates([message(1, 10, "ёнисей")])
+        sent = store.vk_api.send_message.call_args.args[0]
+        assert sent.text.startswith("Слово «Енисей» принято")
+
+    async def test_command_words_are_moves(self, store: Store, monkeypatch):
+        monkeypatch.setattr(
+            store.vk_api, "get_players", AsyncMock(return_value=PLAYERS)
+        )
+        monkeypatch.setattr(
+            store.words,
+            "get_random_word",
+            AsyncMock(return_value=WordModel(title="кокос")),
+        )
+        await store.words.create_word("стоп", True)
+        await store.words.create_word("пропуск", True)
+
+        await store.bots_manager.handle_updates([message(1, 10, "старт")])
+        await store.bots_manager.handle_updates([message(1, 10, "Стоп")])
+        await store.bots_manager.handle_updates([message(1, 20, "пропуск")])
+        game = store.games.get_active(1)
+        assert game.moves == 2
+        assert game.points == (1, 1)
+
+        await store.bots_manager.handle_updates([message(1, 10, "/стоп")])
+        assert store.games.get_active(1) is None
+
+    async def test_unknown_word_suggestions(
+        self, store: Store, monkeypatch, clear_words
+    ):
+        monkeypatch.setattr(
+            store.vk_api, "get_players", AsyncMock(return_value=PLAYERS)
+        )
+        monkeypatch.setattr(
+            store.words,
+            "get_random_word",
+            AsyncMock(return_value=WordModel(title="олово")),
+        )
+        await store.words.create_word("окно", True)
+        await store.words.create_word("окунь", True)
+        await store.words.build_suggestions()
+
+        await store.bots_manager.handle_updates([message(1, 10, "старт")])
+        await store.bots_manager.handle_updates([message(1, 10, "окн")])
+        sent = store.vk_api.send_message.call_args.args[0]
+        assert sent.text == (
+            "Слова «окн» нет в словаре\n" "Может быть, вы имели в виду: окно"
+        )
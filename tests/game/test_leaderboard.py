@@ -0,0 +1,84 @@
+from app.store import Store
+from app.store.vk_api.dataclasses import Message, Update, UpdateObject
+from tests.utils import ok_response
+
+
+class TestScoresAccessor:
+    async def test_flush_upserts(self, store: Store):
+        store.scores.add_points(1, 10, 3)
+        store.scores.add_points(1, 10, 2)
+        store.scores.add_points(2, 10, 1)
+        store.scores.add_points(1, 20, 4)
+        assert await store.scores.flush() == 3
+        assert store.scores.pending == {}
+
+        store.scores.add_points(1, 20, 4)
+        await store.scores.flush()
+
+        assert await store.scores.top_chat(1) == [(20, 8, 2), (10, 5, 2)]
+        assert await store.scores.top_chat(2) == [(10, 1, 1)]
+        assert await store.scores.top_global() == [(20, 8, 2), (10, 6, 3)]
+
+    async def test_top_includes_pending(self, store: Store):
+        for user_id in range(1, 6):
+            store.scores.add_points(1, user_id, user_id)
+        await store.scores.flush()
+        store.scores.add_points(1, 1, 10)
+        store.scores.add_points(1, 6, 4)
+
+        assert await store.scores.top_chat(1, limit=3) == [
+            (1, 11, 2),
+            (5, 5, 1),
+            (4, 4, 1),
+        ]
+        assert (6, 4, 1) in await store.scores.top_chat(1, limit=5)
+
+    async def test_empty(self, store: Store):
+        assert await store.scores.top_chat(1) == []
+        assert await store.scores.flush() == 0
+
+
+class TestLeaderboardView:
+    async def test_unauthorized(self, cli):
+        resp = await cli.get("/game.leaderboard")
+        assert resp.status == 401
+
+    async def test_chat(self, authed_cli, store: Store):
+        store.scores.add_points(1, 10, 3)
+        store.scores.add_points(2, 20, 5)
+        resp = await authed_cli.get("/game.leaderboard", params={"peer_id": 1})
+        assert resp.status == 200
+        assert await resp.json() == ok_response(
+            data={
+                "peer_id": 1,
+                "scores": [{"user_id": 10, "score": 3, "moves": 1}],
+            }
+        )
+
+    async def test_global(self, authed_cli, store: Store):
+        store.scores.add_points(1, 10, 3)
+        store.scores.add_points(2, 20, 5)
+        await store.scores.flush()
+        resp = await authed_cli.get("/game.leaderboard", params={"limit": 1})
+        assert resp.status == 200
+        data = (await resp.json())["data"]
+        assert data["scores"] == [{"user_id": 20, "score": 5, "moves": 1}]
+
+    async def test_bad_limit(self, authed_cli):
+        resp = await authed_cli.get("/game.leaderboard", params={"limit": 0})
+        assert resp.status == 400
+
+
+class TestTopCommand:
+    async def test_top(self, store: Store):
+        store.scores.add_points(1, 10, 3)
+        await store.bots_manager.handle_updates(
+            [
+                Update(
+                    type="message_new",
+                    object=UpdateObject(peer_id=1, user_id=10, body="Топ"),
+                )
+            ]
+        )
+        message: Message = store.vk_api.send_message.call_args.args[0]
+        assert message.text == "Счёт:\n1. @id10 — 3"
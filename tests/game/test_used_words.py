@@ -0,0 +1,62 @@
+import random
+from dataclasses import replace
+
+from app.store.game.dataclasses import GameState
+from app.store.game.used_words import ARRAY_LIMIT, UsedWords
+
+
+class TestUsedWords:
+    def test_ids_and_titles(self):
+        used = UsedWords().add_word(5, "кот").add_word(None, "котэ")
+        assert 5 in used
+        assert "котэ" in used
+        assert 6 not in used
+        assert "кот" not in used
+        assert used.contains(None, "котэ")
+        assert used.contains(5, "неважно")
+        assert len(used) == 2
+
+    def test_immutable(self):
+        first = UsedWords.of([1, 2])
+        second = first.add(3)
+        assert list(first.ids()) == [1, 2]
+        assert list(second.ids()) == [1, 2, 3]
+        assert second.add(3) is second
+        assert second.add_word(None, "кот").add_word(None, "кот").extra == {
+            "кот"
+        }
+
+    def test_hash(self):
+        used = UsedWords.of([3, 1], ["кот"])
+        assert hash(used) == hash(UsedWords.of([1, 3], ["кот"]))
+        assert (
+            len({used, UsedWords.of([1, 3], ["кот"]), UsedWords.of([1])}) == 2
+        )
+        # frozen game states hash their fields
+        state = GameState(
+            peer_id=1, players=(1,), names=("a",), started_at=0, updated_at=0
+        )
+        assert hash(state) == hash(replace(state))
+
+    def test_chunks(self):
+        rng = random.Random(0)
+        expected = set()
+        used = UsedWords()
+        states = []
+        while len(expected) < ARRAY_LIMIT * 3:
+            word_id = rng.randrange(0, 1 << 18)
+            used = used.add(word_id)
+            expected.add(word_id)
+            if len(expected) % ARRAY_LIMIT == 0:
+                states.append((used, sorted(expected)))
+        # a single chunk past the limit becomes a bitmap
+        for word_id in range(ARRAY_LIMIT + 1):
+            used = used.add(word_id)
+            expected.add(word_id)
+
+        assert len(used) == len(expected)
+        assert list(used.ids()) == sorted(expected)
+        for word_id in rng.sample(range(1 << 18), 1000):
+            assert (word_id in used) == (word_id in expected)
+        for state, ids in states:
+            assert list(state.ids()) == ids
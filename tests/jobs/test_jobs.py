@@ -0,0 +1,181 @@
+import asyncio
+import gzip
+from unittest.mock import AsyncMock
+
+from app.jobs.models import JOB_DONE, JOB_FAILED, JOB_QUEUED, JOB_RUNNING
+from app.store import Store
+from app.store.jobs.accessor import registry
+
+
+class TestJobsAccessor:
+    async def test_claim_order(self, store: Store):
+        first = await store.jobs.enqueue("words.list")
+        second = await store.jobs.enqueue("words.list", {"is_correct": True})
+        assert first.status == JOB_QUEUED
+
+        claimed = await store.jobs.claim()
+        assert claimed.id == first.id
+        assert claimed.status == JOB_RUNNING
+        assert claimed.attempts == 1
+        assert (await store.jobs.claim()).id == second.id
+        assert await store.jobs.claim() is None
+
+    async def test_run_import(self, store: Store, clear_words, word_1):
+        job = await store.jobs.enqueue(
+            "words.import",
+            {
+                "words": [
+                    {"title": "Арбуз", "is_correct": True},
+                    {"title": "арбуз", "is_correct": True},
+                    {"title": word_1.title, "is_correct": True},
+                    {"title": "зебра", "is_correct": False},
+                ]
+            },
+        )
+        assert await store.jobs.run_next() is True
+        assert await store.jobs.run_next() is False
+
+        job = await store.jobs.get(job.id)
+        assert job.status == JOB_DONE
+        assert job.result == {"inserted": 2, "skipped": 2}
+        assert (job.done, job.total) == (3, 3)
+        assert job.finished_at is not None
+        assert await store.words.get_word_by_title("арбуз") is not None
+
+    async def test_run_list(
+        self, store: Store, config, clear_words, word_1, monkeypatch, tmp_path
+    ):
+        monkeypatch.setattr(config.jobs, "result_dir", str(tmp_path))
+        job = await store.jobs.enqueue("words.list", {"format": "jsonl"})
+        await store.jobs.run_next()
+
+        job = await store.jobs.get(job.id)
+        assert job.status == JOB_DONE
+        line = (
+            f'{{"id":{word_1.id},"title":"{word_1.title}","is_correct":true}}\n'
+        )
+        assert job.result == {
+            "file": f"words-{job.id}.jsonl",
+            "count": 1,
+            "size": len(line.encode()),
+        }
+        assert (tmp_path / job.result["file"]).read_text() == line
+        assert [path.name for path in tmp_path.iterdir()] == [
+            job.result["file"]
+        ]
+
+    async def test_worker_requeues_stale(
+        self, store: Store, config, monkeypatch
+    ):
+        monkeypatch.setattr(config.jobs, "requeue_interval", 0)
+        requeue = AsyncMock()
+        monkeypatch.setattr(store.jobs, "requeue_stale", requeue)
+        runs = []
+
+        async def run_next():
+            runs.append(requeue.await_count)
+            store.jobs._stopping = len(runs) == 3
+            return True
+
+        monkeypatch.setattr(store.jobs, "run_next", run_next)
+        monkeypatch.setattr(store.jobs, "_wakeup", asyncio.Event())
+        monkeypatch.setattr(store.jobs, "_stopping", False)
+        await store.jobs._work()
+        assert runs == [1, 2, 3]
+
+    async def test_failed_job(self, store: Store):
+        @registry.job("tests.fail")
+        async def fail(context):
+            await context.progress(1, 2)
+            raise RuntimeError("boom")
+
+        try:
+            job = await store.jobs.enqueue("tests.fail")
+            await store.jobs.run_next()
+        finally:
+            del registry.handlers["tests.fail"]
+
+        job = await store.jobs.get(job.id)
+        assert job.status == JOB_FAILED
+        assert job.error == "boom"
+        assert (job.done, job.total) == (1, 2)
+
+    async def test_reads_replica_after_claim(self, server, store, monkeypatch):
+        monkeypatch.setattr(
+            server.database, "_replica_sessions", [lambda: "replica"]
+        )
+        claim = store.jobs.claim
+
+        async def claim_and_write():
+            job = await claim()
+            server.database.mark_written()
+            return job
+
+        monkeypatch.setattr(store.jobs, "claim", claim_and_write)
+        reads = []
+
+        @registry.job("tests.read")
+        async def read(context):
+            reads.append(context.app.database.read_session())
+
+        try:
+            await store.jobs.enqueue("tests.read")
+            await store.jobs.run_next()
+        finally:
+            del registry.handlers["tests.read"]
+        assert reads == ["replica"]
+
+
+class TestJobViews:
+    async def test_unauthorized(self, cli):
+        resp = await cli.get("/jobs.get", params={"id": 1})
+        assert resp.status == 401
+
+    async def test_not_found(self, authed_cli):
+        resp = await authed_cli.get("/jobs.get", params={"id": 10**6})
+        assert resp.status == 404
+
+    async def test_import_words(self, authed_cli, store: Store, clear_words):
+        resp = await authed_cli.post(
+            "/words.import_words",
+            json={"words": [{"title": "Арбуз", "is_correct": True}]},
+        )
+        assert resp.status == 200
+        data = (await resp.json())["data"]
+        assert data["kind"] == "words.import"
+        assert data["status"] == JOB_QUEUED
+
+        await store.jobs.run_next()
+        resp = await authed_cli.get("/jobs.get", params={"id": data["id"]})
+        job = (await resp.json())["data"]
+        assert job["status"] == JOB_DONE
+        assert job["result"] == {"inserted": 1, "skipped": 0}
+
+    async def test_list_words_job(
+        self,
+        authed_cli,
+        store: Store,
+        config,
+        clear_words,
+        monkeypatch,
+        tmp_path,
+    ):
+        monkeypatch.setattr(config.jobs, "result_dir", str(tmp_path))
+        resp = await authed_cli.post(
+            "/words.list_words_job", json={"gzip": True}
+        )
+        assert resp.status == 200
+        data = (await resp.json())["data"]
+        assert data["kind"] == "words.list"
+        assert data["status"] == JOB_QUEUED
+
+        resp = await authed_cli.get("/jobs.result", params={"id": data["id"]})
+        assert resp.status == 404
+        await store.jobs.run_next()
+        resp = await authed_cli.get("/jobs.result", params={"id": data["id"]})
+        assert resp.status == 200
+        filename = f"words-{data['id']}.csv.gz"
+        assert filename in resp.headers["Content-Disposition"]
+        assert gzip.decompress(await resp.read()).decode() == (
+            "id,title,is_correct\n"
+        )
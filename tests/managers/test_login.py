@@ -1,5 +1,6 @@
 from hashlib import sha256
 
+import pytest
 from sqlalchemy import select
 
 from app.admin.models import AdminModel
@@ -8,6 +9,7 @@ from tests.utils import ok_response
 
 
 class TestAdminStore:
+    @pytest.mark.sql
     async def test_create_admin(self, cli, store: Store):
         email = "admin2@admin.com"
         password = 'admin2'
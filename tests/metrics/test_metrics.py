@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+from app.metrics.loop import LoopLagMonitor
+from app.metrics.registry import Counter, Histogram, Registry
+from app.metrics.watchdog import LoopWatchdog
+from app.store import Store
+from app.words.models import WordModel
+from tests.utils import ok_response
+
+
+class TestRegistry:
+    def test_counter(self):
+        registry = Registry()
+        counter = Counter(
+            "errors_total", "errors", ("method",), registry=registry
+        )
+        counter.labels("messages.send").inc()
+        counter.labels("messages.send").inc()
+        assert 'errors_total{method="messages.send"} 2' in registry.render()
+
+    def test_histogram(self):
+        registry = Registry()
+        histogram = Histogram(
+            "latency", "latency", buckets=(0.1, 1), registry=registry
+        )
+        histogram.observe(0.05)
+        histogram.observe(5)
+        rendered = registry.render()
+        assert 'latency_bucket{le="0.1"} 1' in rendered
+        assert 'latency_bucket{le="1"} 1' in rendered
+        assert 'latency_bucket{le="+Inf"} 2' in rendered
+        assert "latency_count 2" in rendered
+
+
+class TestMetricsView:
+    async def test_success(self, cli, store: Store, word_1: WordModel):
+        await store.words.get_word_by_id(word_1.id)
+        await cli.get("/admin.current")
+        resp = await cli.get("/metrics")
+        assert resp.status == 200
+        assert resp.headers["Content-Type"].startswith("text/plain")
+        text = await resp.text()
+        assert 'db_query_seconds_count{method="get_word_by_id"}' in text
+        assert (
+            'http_request_seconds_count{route="/admin.current",status="401"}'
+            in text
+        )
+        assert (
+            'http_middleware_seconds_count{middleware="auth_middleware"}'
+            in text
+        )
+
+
+def blocking_call():
+    time.sleep(0.3)
+
+
+class TestLoopWatchdog:
+    async def test_captures_blocking_stack(self):
+        monitor = LoopLagMonitor(interval=0.02)
+        watchdog = LoopWatchdog(monitor, threshold=0.1)
+        await monitor.start()
+        await watchdog.start()
+        await asyncio.sleep(0.05)
+        blocking_call()
+        await asyncio.sleep(0.05)
+        await watchdog.stop()
+        await monitor.stop()
+
+        stalls = watchdog.snapshot()
+        assert stalls
+        assert stalls[0]["kind"] == "stall"
+        assert any("blocking_call" in line for line in stalls[0]["stack"])
+
+
+class TestLoopStallListView:
+    async def test_unauthorized(self, cli):
+        resp = await cli.get("/metrics.loop_stalls")
+        assert resp.status == 401
+        data = await resp.json()
+        assert data["status"] == "unauthorized"
+
+    async def test_disabled(self, authed_cli):
+        resp = await authed_cli.get("/metrics.loop_stalls")
+        assert resp.status == 200
+        data = await resp.json()
+        assert data == ok_response(
+            data={"enabled": False, "threshold": None, "stalls": []}
+        )
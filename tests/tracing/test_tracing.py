@@ -0,0 +1,63 @@
+import pytest
+
+from app.tracing.exporters import RingBufferExporter
+from app.tracing.tracer import TRACER, Tracer
+
+
+@pytest.fixture
+def sample_all():
+    sample_rate = TRACER.sample_rate
+    exporter = TRACER.exporter
+    TRACER.configure(1.0, RingBufferExporter(10))
+    yield TRACER.exporter
+    TRACER.configure(sample_rate, exporter)
+
+
+def span_names(trace: dict) -> list[str]:
+    return [
+        span["name"]
+        for span in trace["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    ]
+
+
+class TestTracer:
+    def test_nested_spans(self):
+        exporter = RingBufferExporter(10)
+        tracer = Tracer(1.0, exporter)
+        with tracer.start_trace("root") as root:
+            with tracer.span("child") as child:
+                assert child.trace_id == root.trace_id
+                assert child.parent_id == root.span_id
+        assert len(exporter.traces) == 1
+        assert [span.name for span in exporter.traces[0]] == ["child", "root"]
+
+    def test_span_without_trace_is_noop(self):
+        exporter = RingBufferExporter(10)
+        tracer = Tracer(1.0, exporter)
+        with tracer.span("orphan"):
+            pass
+        assert len(exporter.traces) == 0
+
+    def test_not_sampled(self):
+        tracer = Tracer(0.0, RingBufferExporter(10))
+        assert tracer.should_sample() is False
+
+
+class TestTraceListView:
+    async def test_unauthorized(self, cli):
+        resp = await cli.get("/tracing.list_traces")
+        assert resp.status == 401
+        data = await resp.json()
+        assert data["status"] == "unauthorized"
+
+    async def test_request_spans(self, authed_cli, sample_all):
+        resp = await authed_cli.get("/words.list_words")
+        assert resp.status == 200
+
+        resp = await authed_cli.get("/tracing.list_traces", params={"limit": 2})
+        assert resp.status == 200
+        data = await resp.json()
+        names = span_names(data["data"]["traces"][0])
+        assert "GET /words.list_words" in names
+        assert "session.load" in names
+        assert "words.list_words" in names
@@ -0,0 +1,77 @@
+import os
+import subprocess
+import sys
+
+import pytest
+import yaml
+
+from app.web.app import Application, setup_app
+from app.web.runner import run
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_PATH = os.path.join(TESTS_DIR, "config.yml")
+
+
+class TestSetupApp:
+    def test_fresh_instances(self, server: Application):
+        app = setup_app(CONFIG_PATH)
+        assert app is not server
+        assert app.store is not server.store
+        assert app.store.words is not server.store.words
+
+    def test_import_is_lazy(self):
+        code = (
+            "import sys, app.web.app; " "print(' '.join(sorted(sys.modules)))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.dirname(TESTS_DIR),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        modules = result.stdout.split()
+        for module in (
+            "sqlalchemy",
+            "aiohttp_apispec",
+            "aiohttp_session",
+            "app.admin.views",
+            "app.words.views",
+        ):
+            assert module not in modules
+
+
+class TestDocs:
+    async def test_docs_enabled(self, cli):
+        resp = await cli.get("/docs/json")
+        assert resp.status == 200
+        assert "/words.list_words" in (await resp.json())["paths"]
+
+    def test_docs_disabled(self, tmp_path):
+        with open(CONFIG_PATH) as f:
+            raw_config = yaml.safe_load(f)
+        raw_config["docs"] = {"enabled": False}
+        config_path = tmp_path / "config.yml"
+        config_path.write_text(yaml.safe_dump(raw_config))
+
+        app = setup_app(str(config_path))
+        paths = {route.resource.canonical for route in app.router.routes()}
+        assert "/docs/json" not in paths
+        assert "/docs" not in paths
+        assert "/words.list_words" in paths
+        assert "_apispec_parser" in app
+        # the spec is never built, neither during setup nor on startup
+        assert "swagger_dict" not in app
+        assert not any(hook.__name__ == "doc_routes" for hook in app.on_startup)
+
+
+class TestRunner:
+    def test_memory_storage_single_worker(self, tmp_path):
+        with open(CONFIG_PATH) as f:
+            raw_config = yaml.safe_load(f)
+        raw_config["storage"] = {"engine": "memory"}
+        config_path = tmp_path / "config.yml"
+        config_path.write_text(yaml.safe_dump(raw_config))
+
+        with pytest.raises(ValueError):
+            run(str(config_path), workers=2)
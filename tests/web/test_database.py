@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+from app.store.database.database import Database, async_dsn
+
+
+def make_database(replicas: int) -> Database:
+    database = Database(SimpleNamespace(config=None))
+    database.session = lambda: "primary"
+    database._replica_sessions = [
+        (lambda i=i: f"replica{i}") for i in range(replicas)
+    ]
+    return database
+
+
+def execute(database: Database, **kinds):
+    context = SimpleNamespace(
+        isinsert=kinds.get("insert", False),
+        isupdate=kinds.get("update", False),
+        isdelete=kinds.get("delete", False),
+    )
+    database._after_execute(None, None, "", {}, context, False)
+
+
+class TestReadSession:
+    def test_without_replicas(self):
+        database = make_database(0)
+        with database.scope():
+            assert database.read_session() == "primary"
+
+    def test_round_robin(self):
+        database = make_database(2)
+        with database.scope():
+            sessions = [database.read_session() for _ in range(4)]
+        assert sessions == ["replica0", "replica1", "replica0", "replica1"]
+
+    def test_primary_requested(self):
+        database = make_database(1)
+        with database.scope():
+            assert database.read_session(primary=True) == "primary"
+
+    def test_select_keeps_replica(self):
+        database = make_database(1)
+        with database.scope():
+            execute(database)
+            assert database.read_session() == "replica0"
+
+    def test_sticky_after_write(self):
+        database = make_database(1)
+        with database.scope():
+            execute(database, update=True)
+            assert database.wrote
+            assert database.read_session() == "primary"
+        with database.scope():
+            assert not database.wrote
+            assert database.read_session() == "replica0"
+
+
+def test_async_dsn():
+    assert async_dsn("postgresql://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    assert async_dsn("postgresql+asyncpg://h/db") == "postgresql+asyncpg://h/db"
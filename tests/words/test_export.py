@@ -0,0 +1,38 @@
+import gzip
+import json
+
+import pytest
+
+from app.words.export import ExportStream
+
+ROWS = [(1, "арбуз", True), (2, 'кот, "пёс"', False)]
+
+
+class TestExportStream:
+    def test_csv(self):
+        stream = ExportStream("csv")
+        data = stream.header() + stream.encode(ROWS) + stream.encode([])
+        assert stream.finish() is None
+        assert data.decode() == (
+            "id,title,is_correct\n" "1,арбуз,true\n" '2,"кот, ""пёс""",false\n'
+        )
+
+    def test_jsonl(self):
+        stream = ExportStream("jsonl")
+        data = stream.header() + stream.encode(ROWS)
+        assert [json.loads(line) for line in data.decode().splitlines()] == [
+            {"id": 1, "title": "арбуз", "is_correct": True},
+            {"id": 2, "title": 'кот, "пёс"', "is_correct": False},
+        ]
+
+    @pytest.mark.parametrize("export_format", ["csv", "jsonl"])
+    def test_gzip(self, export_format):
+        plain = ExportStream(export_format)
+        expected = plain.header() + plain.encode(ROWS) + plain.encode(ROWS)
+
+        stream = ExportStream(export_format, gzip=True)
+        data = stream.header() + stream.encode(ROWS) + stream.encode(ROWS)
+        data += stream.finish()
+        assert gzip.decompress(data) == expected
+        assert stream.content_type == "application/gzip"
+        assert stream.filename("words") == f"words.{export_format}.gz"
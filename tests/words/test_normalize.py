@@ -0,0 +1,30 @@
+import pytest
+
+from app.words.normalize import clean, normalize, normalize_many
+
+
+class TestNormalize:
+    @pytest.mark.parametrize(
+        "title, expected",
+        [
+            ("Ёж", "еж"),
+            ("  еж\t", "еж"),
+            ("Северный \n  полюс", "северный полюс"),
+            ("кoт", "кот"),
+            ("KOТ", "кот"),
+            ("hello", "hello"),
+            ("ёж", "еж"),
+        ],
+    )
+    def test_normalize(self, title, expected):
+        assert normalize(title) == expected
+
+    def test_clean_keeps_spelling(self):
+        assert clean("  Ёлка\t ") == "ёлка"
+
+    def test_many_matches_single(self):
+        titles = ["Ёж", " a b ", "кoт", "", "hello", "ёж", "x\x00y"]
+        assert normalize_many(titles) == [normalize(title) for title in titles]
+
+    def test_many_empty(self):
+        assert normalize_many([]) == []
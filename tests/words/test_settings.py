@@ -11,9 +11,11 @@ from tests.utils import ok_response
 
 
 class TestSettingStore:
+    @pytest.mark.sql
     async def test_table_exists(self, cli):
         await check_empty_table_exists(cli, "settings")
 
+    @pytest.mark.sql
     async def test_create_setting(self, cli, store: Store, clear_settings):
         setting_title = "test_setting"
         setting_timeout = 30
@@ -183,6 +185,31 @@ class TestSettingsListView:
         data = await resp.json()
         assert data["status"] == "not_implemented"
 
+    async def test_not_modified(
+        self, authed_cli, clear_settings, setting_1: SettingModel
+    ):
+        resp = await authed_cli.get("/words.list_settings")
+        assert resp.status == 200
+        etag = resp.headers["ETag"]
+
+        resp = await authed_cli.get(
+            "/words.list_settings", headers={"If-None-Match": etag}
+        )
+        assert resp.status == 304
+
+        await authed_cli.post(
+            "/words.delete_setting",
+            json={
+                "id": setting_1.id,
+            },
+        )
+        resp = await authed_cli.get(
+            "/words.list_settings", headers={"If-None-Match": etag}
+        )
+        assert resp.status == 200
+        data = await resp.json()
+        assert data == ok_response(data={"settings": []})
+
 
 class TestIntegration:
     async def test_success(self, authed_cli, clear_settings):
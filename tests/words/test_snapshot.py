@@ -0,0 +1,99 @@
+import os
+
+import pytest
+
+from app.store.words.compact import CompactDictionary
+from app.store.words.snapshot import (
+    SharedSnapshot,
+    SnapshotError,
+    load_snapshot,
+    write_snapshot,
+)
+
+
+@pytest.fixture
+def dictionary() -> CompactDictionary:
+    return CompactDictionary.from_words(
+        [(1, "олово", True), (2, "олаво", False), (3, "арбуз", True, "Арбуз")]
+    )
+
+
+class TestSnapshot:
+    def test_roundtrip(self, tmp_path, dictionary: CompactDictionary):
+        path = str(tmp_path / "words.snapshot")
+        version = write_snapshot(path, dictionary, version=7)
+        loaded, loaded_version, _ = load_snapshot(path)
+        assert version == loaded_version == 7
+        assert len(loaded) == len(dictionary)
+        assert loaded.get("олово") == (1, True)
+        assert loaded.get("олаво") == (2, False)
+        assert loaded.get("нет") is None
+        assert list(loaded.iter_prefix("ол")) == ["олаво", "олово"]
+        position = loaded.random_correct("а")
+        assert loaded.canonical(position) == "арбуз"
+        assert loaded.title(position) == "Арбуз"
+
+    def test_not_a_snapshot(self, tmp_path):
+        path = tmp_path / "words.snapshot"
+        path.write_bytes(b"x" * 64)
+        with pytest.raises(SnapshotError):
+            load_snapshot(str(path))
+
+    @pytest.mark.parametrize("data", [b"", b"WVKSNAP2"])
+    def test_too_short(self, tmp_path, data: bytes):
+        path = tmp_path / "words.snapshot"
+        path.write_bytes(data)
+        with pytest.raises(SnapshotError):
+            load_snapshot(str(path))
+
+    def test_truncated(self, tmp_path, dictionary: CompactDictionary):
+        path = tmp_path / "words.snapshot"
+        write_snapshot(str(path), dictionary)
+        path.write_bytes(path.read_bytes()[:-1])
+        with pytest.raises(SnapshotError):
+            load_snapshot(str(path))
+
+    def test_remap_on_new_version(
+        self, tmp_path, dictionary: CompactDictionary
+    ):
+        path = str(tmp_path / "words.snapshot")
+        write_snapshot(path, dictionary, version=1)
+        shared = SharedSnapshot(path, check_interval=0)
+        old = shared.get()
+        assert shared.version == 1
+
+        write_snapshot(
+            path, CompactDictionary.from_words([(4, "ёж", True)]), version=2
+        )
+        new = shared.get()
+        assert shared.version == 2
+        assert new.get("ёж") == (4, True)
+        # the previous mapping stays readable for whoever still holds it
+        assert old.get("олово") == (1, True)
+
+    def test_keeps_mapping_on_failed_reload(
+        self, tmp_path, dictionary: CompactDictionary
+    ):
+        path = tmp_path / "words.snapshot"
+        write_snapshot(str(path), dictionary, version=1)
+        shared = SharedSnapshot(str(path), check_interval=0)
+        shared.get()
+
+        # snapshots are always swapped in with a rename, writing into the
+        # mapped file itself would crash the readers
+        broken = tmp_path / "broken"
+        broken.write_bytes(b"")
+        os.replace(broken, path)
+        assert shared.get().get("олово") == (1, True)
+        path.unlink()
+        assert shared.get().get("олово") == (1, True)
+        assert shared.version == 1
+
+        write_snapshot(str(path), dictionary, version=2)
+        shared.get()
+        assert shared.version == 2
+
+    def test_first_load_fails(self, tmp_path):
+        shared = SharedSnapshot(str(tmp_path / "missing.snapshot"))
+        with pytest.raises(OSError):
+            shared.get()
@@ -0,0 +1,183 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.jobs.models import JOB_FAILED, JOB_QUEUED, JOB_RUNNING
+from app.store.storage import create_storage
+from app.store.storage.memory import MemoryStorage
+
+
+def make_app(engine: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        config=SimpleNamespace(storage=SimpleNamespace(engine=engine))
+    )
+
+
+@pytest.fixture
+def storage() -> MemoryStorage:
+    return create_storage(make_app("memory"))
+
+
+class TestMemoryStorage:
+    async def test_words(self, storage: MemoryStorage):
+        word = await storage.insert_word("Ёж", True, "еж")
+        assert word.id is not None
+        assert (await storage.get_word_by_canonical("еж")).title == "Ёж"
+        assert (await storage.get_word_by_id(word.id)).canonical == "еж"
+
+        await storage.insert_word("арбуз", False, "арбуз")
+        assert [w.title for w in await storage.list_words()] == ["Ёж", "арбуз"]
+        assert [w.title for w in await storage.list_words(False)] == ["арбуз"]
+        assert await storage.count_words(True) == 1
+
+        await storage.delete_word(word.id)
+        assert await storage.get_word_by_id(word.id) is None
+        assert await storage.get_word_by_canonical("еж") is None
+        await storage.insert_word("еж", True, "еж")
+
+    @pytest.mark.parametrize("title, canonical", [("Ёж", "ёж"), ("ЕЖ", "еж")])
+    async def test_unique_word(self, storage: MemoryStorage, title, canonical):
+        await storage.insert_word("Ёж", True, "еж")
+        with pytest.raises(IntegrityError) as exc_info:
+            await storage.insert_word(title, True, canonical)
+        assert exc_info.value.orig.pgcode == "23505"
+        assert await storage.count_words() == 1
+
+    async def test_update_word(self, storage: MemoryStorage):
+        first = await storage.insert_word("арбуз", True, "арбуз")
+        second = await storage.insert_word("зебра", True, "зебра")
+        with pytest.raises(IntegrityError):
+            await storage.update_word(
+                second.id, title="арбуз", canonical="арбуз"
+            )
+
+        word = await storage.update_word(
+            first.id, title="Ананас", canonical="ананас"
+        )
+        assert (word.title, word.is_correct) == ("Ананас", True)
+        assert await storage.get_word_by_canonical("арбуз") is None
+        assert await storage.update_word(100, is_correct=False) is None
+        await storage.insert_word("арбуз", True, "арбуз")
+
+    async def test_import_skips_duplicates(self, storage: MemoryStorage):
+        await storage.insert_word("арбуз", True, "арбуз")
+        inserted = await storage.import_words(
+            [
+                {"title": "Арбуз", "is_correct": True, "canonical": "арбуз"},
+                {"title": "зебра", "is_correct": True, "canonical": "зебра"},
+                {"title": "зебра", "is_correct": False, "canonical": "зебра"},
+            ]
+        )
+        assert inserted == 1
+        assert await storage.count_words() == 2
+
+    async def test_pages_and_stream(self, storage: MemoryStorage):
+        for i in range(5):
+            await storage.insert_word(f"слово{i}", i % 2 == 0, f"слово{i}")
+        page = await storage.list_words_page(1, 2)
+        assert [word.id for word in page] == [2, 3]
+        page = await storage.list_words_page(0, 10, is_correct=False)
+        assert [word.id for word in page] == [2, 4]
+
+        batches = [batch async for batch in storage.stream_words(True, 2)]
+        assert batches == [
+            [(1, "слово0", True), (3, "слово2", True)],
+            [(5, "слово4", True)],
+        ]
+        rows = await storage.dictionary_rows()
+        assert rows[0] == (1, "слово0", True, "слово0")
+
+    async def test_nearest_words(self, storage: MemoryStorage):
+        await storage.insert_word("кот", True, "кот")
+        await storage.insert_word("кит", True, "кит")
+        await storage.insert_word("кто", False, "кто")
+        await storage.insert_word("котлета", True, "котлета")
+        assert await storage.nearest_words("кот", 1, 10) == ["кот", "кит"]
+
+    async def test_settings(self, storage: MemoryStorage):
+        setting = await storage.insert_setting("быстро", 10)
+        with pytest.raises(IntegrityError) as exc_info:
+            await storage.insert_setting("быстро", 20)
+        assert exc_info.value.orig.pgcode == "23505"
+
+        setting = await storage.update_setting(setting.id, timeout=30)
+        assert setting.timeout == 30
+        assert (await storage.get_setting_by_title("быстро")).timeout == 30
+        await storage.delete_setting(setting.id)
+        assert await storage.list_settings() == []
+
+    async def test_version(self, storage: MemoryStorage):
+        version = await storage.dictionary_version()
+        storage.changed()
+        assert await storage.dictionary_version() == version + 1
+        assert (
+            version
+            != await create_storage(make_app("memory")).dictionary_version()
+        )
+
+    async def test_admins(self, storage: MemoryStorage):
+        admin = await storage.insert_admin("admin@admin.com", "hash")
+        with pytest.raises(IntegrityError):
+            await storage.insert_admin("admin@admin.com", "other")
+        found = await storage.get_admin_by_email("admin@admin.com")
+        assert (found.id, found.password) == (admin.id, "hash")
+        assert await storage.get_admin_by_email("nobody@admin.com") is None
+
+    async def test_scores(self, storage: MemoryStorage):
+        await storage.add_scores([(1, 10, 3, 1), (2, 10, 1, 1)], [(10, 4, 2)])
+        await storage.add_scores([(1, 11, 5, 1)], [(11, 5, 1), (10, 1, 1)])
+        assert await storage.top_scores(1, 1, []) == [(11, 5, 1)]
+        assert await storage.top_scores(1, 1, [10]) == [(11, 5, 1), (10, 3, 1)]
+        assert await storage.top_scores(None, 5, []) == [
+            (10, 5, 3),
+            (11, 5, 1),
+        ]
+
+    async def test_jobs(self, storage: MemoryStorage):
+        job = await storage.insert_job("words.list", {})
+        claimed = await storage.claim_job()
+        assert (claimed.id, claimed.status, claimed.attempts) == (
+            job.id,
+            JOB_RUNNING,
+            1,
+        )
+        assert await storage.claim_job() is None
+        # callers get copies, not the stored rows
+        claimed.status = JOB_QUEUED
+        assert (await storage.get_job(job.id)).status == JOB_RUNNING
+
+        await storage.release_job(job.id)
+        assert (await storage.claim_job()).attempts == 2
+
+        later = datetime.now(timezone.utc) + timedelta(seconds=1)
+        await storage.requeue_stale_jobs(later, max_attempts=2)
+        failed = await storage.get_job(job.id)
+        assert (failed.status, failed.error) == (
+            JOB_FAILED,
+            "abandoned by worker",
+        )
+
+    async def test_processed_updates(self, storage: MemoryStorage):
+        assert await storage.claim_updates([(1, 1), (1, 2)]) == {(1, 1), (1, 2)}
+        assert await storage.claim_updates([(1, 2), (1, 3)]) == {(1, 3)}
+
+        later = datetime.now(timezone.utc) + timedelta(seconds=1)
+        await storage.cleanup_updates(later)
+        assert await storage.claim_updates([(1, 2)]) == {(1, 2)}
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        create_storage(make_app("redis"))
+
+
+def test_sql_reads_primary_after_new_version():
+    app = make_app("sql")
+    app.config.database = SimpleNamespace(replica_lag=60)
+    app.database = SimpleNamespace(read_session=lambda primary: primary)
+    storage = create_storage(app)
+    assert storage._read_session() is False
+    storage.version_seen()
+    assert storage._read_session() is True
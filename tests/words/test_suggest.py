@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from app.store.words.compact import CompactDictionary
+from app.store.words.suggest import (
+    SuggestionIndex,
+    bounded_distance,
+    deletes,
+    rank,
+)
+
+ALPHABET = "абвгдежзиклмнопрст"
+
+
+class TestBoundedDistance:
+    @pytest.mark.parametrize(
+        "a, b, expected",
+        [
+            ("кот", "кот", 0),
+            ("кот", "кит", 1),
+            ("кот", "ко", 1),
+            ("кот", "крот", 1),
+            ("кот", "окт", 1),
+            ("кот", "ток", 2),
+            ("кот", "собака", None),
+        ],
+    )
+    def test_distance(self, a, b, expected):
+        assert bounded_distance(a, b, 2) == expected
+
+    def test_deletes(self):
+        assert deletes("кот", 1) == {"кот", "от", "кт", "ко"}
+
+
+class TestSuggestionIndex:
+    def build(self, titles, **kwargs) -> SuggestionIndex:
+        dictionary = CompactDictionary.from_words(
+            [
+                (i, title, correct)
+                for i, (title, correct) in enumerate(titles, 1)
+            ]
+        )
+        return SuggestionIndex.build(dictionary, **kwargs)
+
+    def test_lookup(self):
+        index = self.build(
+            [
+                ("кот", True),
+                ("кит", True),
+                ("крот", True),
+                ("ток", True),
+                ("кто", False),
+            ]
+        )
+        assert index.lookup("кот") == [("кит", 1), ("крот", 1)]
+        assert index.lookup("кот", limit=1) == [("кит", 1)]
+        assert index.lookup("кот", first_letter="кр") == [("крот", 1)]
+        assert index.lookup("кот", exclude={"кит"}) == [("крот", 1)]
+
+    @pytest.mark.parametrize("max_distance", [1, 2])
+    def test_matches_full_scan(self, max_distance):
+        rng = random.Random(max_distance)
+        titles = sorted(
+            {
+                "".join(rng.choice(ALPHABET) for _ in range(rng.randint(2, 10)))
+                for _ in range(2000)
+            }
+        )
+        index = self.build(
+            [(title, True) for title in titles],
+            max_distance=max_distance,
+            prefix_length=5,
+        )
+        for _ in range(200):
+            word = list(rng.choice(titles))
+            word[rng.randrange(len(word))] = rng.choice(ALPHABET)
+            word = "".join(word)
+            assert index.lookup(word, limit=10) == rank(
+                word, titles, max_distance, 10
+            )
@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+from app.store.storage.memory import MemoryStorage
+from app.store.words.accessor import WordsAccessor
+
+
+class WatchedStorage(MemoryStorage):
+    watching = True
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.reads = 0
+        self.seen = 0
+
+    async def dictionary_version(self) -> int:
+        self.reads += 1
+        return await super().dictionary_version()
+
+    def version_seen(self) -> None:
+        self.seen += 1
+
+
+def make_words(interval: float = 0) -> WordsAccessor:
+    app = SimpleNamespace(
+        on_startup=[],
+        on_cleanup=[],
+        config=SimpleNamespace(
+            words=SimpleNamespace(version_check_interval=interval)
+        ),
+    )
+    app.store = SimpleNamespace(storage=WatchedStorage(app))
+    return WordsAccessor(app)
+
+
+class TestVersion:
+    async def test_pushed_versions_skip_polling(self):
+        words = make_words()
+        storage = words.storage
+        version = await words.get_version()
+        assert await words.get_version() == version
+        assert storage.reads == 1
+
+        words._on_version(version + 5)
+        assert await words.get_version() == version + 5
+        words._on_version(version + 3)
+        assert await words.get_version() == version + 5
+        assert storage.reads == 1
+
+    async def test_new_versions_are_reported(self):
+        words = make_words()
+        version = await words.get_version()
+        assert words.storage.seen == 1
+        words._on_version(version + 1)
+        words._on_version(version)
+        assert words.storage.seen == 2
+
+    async def test_local_write_reads_again(self):
+        words = make_words()
+        version = await words.get_version()
+        words.bump_version()
+        assert await words.get_version() == version + 1
+        assert words.storage.reads == 2
+
+    async def test_polls_without_watching(self):
+        words = make_words(interval=0)
+        words.storage.watching = False
+        await words.get_version()
+        await words.get_version()
+        assert words.storage.reads == 2
@@ -1,3 +1,5 @@
+import gzip
+import json
 from dataclasses import asdict
 
 import pytest
@@ -11,9 +13,11 @@ from tests.utils import ok_response
 
 
 class TestWordStore:
+    @pytest.mark.sql
     async def test_table_exists(self, cli):
         await check_empty_table_exists(cli, "words")
 
+    @pytest.mark.sql
     async def test_create_word(self, cli, store: Store, clear_words):
         word_title = "test_word"
         word_is_correct = True
@@ -86,6 +90,41 @@ class TestWordStore:
         assert word_1_updated.id == word_1.id
 
 
+class TestRandomWord:
+    async def test_only_correct(
+        self, store: Store, clear_words, word_1: WordModel, word_2: WordModel
+    ):
+        for _ in range(10):
+            word = await store.words.get_random_word()
+            assert word == word_1
+
+    async def test_first_letter(
+        self, store: Store, clear_words, word_1: WordModel
+    ):
+        word = await store.words.get_random_word(first_letter="о")
+        assert word == word_1
+        word = await store.words.get_random_word(first_letter="я")
+        assert word is None
+
+    async def test_exclude(self, store: Store, clear_words, word_1: WordModel):
+        word = await store.words.get_random_word(exclude={word_1.title})
+        assert word is None
+
+    async def test_display_title(self, store: Store, clear_words):
+        created = await store.words.create_word("Ёж", True)
+        word = await store.words.get_random_word(first_letter="Е")
+        assert word == created
+        assert await store.words.get_random_word(exclude={"ёж"}) is None
+
+    async def test_index_refreshed_after_mutation(
+        self, store: Store, clear_words, word_1: WordModel
+    ):
+        await store.words.get_random_word()
+        new_word = await store.words.create_word("арбуз", True)
+        word = await store.words.get_random_word(first_letter="а")
+        assert word == new_word
+
+
 class TestWordAddView:
     async def test_unauthorized(self, cli):
         resp = await cli.post(
@@ -159,6 +198,25 @@ class TestWordAddView:
         data = await resp.json()
         assert data["status"] == "conflict"
 
+    async def test_conflict_spelling(self, authed_cli, clear_words):
+        resp = await authed_cli.post(
+            "/words.add_word", json={"title": "ёлка", "is_correct": True}
+        )
+        assert resp.status == 200
+        resp = await authed_cli.post(
+            "/words.add_word", json={"title": " EЛКА ", "is_correct": True}
+        )
+        assert resp.status == 409
+
+    async def test_get_by_spelling(self, authed_cli, clear_words):
+        await authed_cli.post(
+            "/words.add_word", json={"title": " Ёлка\t", "is_correct": True}
+        )
+        resp = await authed_cli.get("/words.get_word", params={"title": "eлка"})
+        assert resp.status == 200
+        data = await resp.json()
+        assert data["data"]["title"] == "ёлка"
+
 
 class TestWordsListView:
     async def test_unauthorized(self, cli):
@@ -193,6 +251,138 @@ class TestWordsListView:
         data = await resp.json()
         assert data["status"] == "not_implemented"
 
+    async def test_not_modified(
+        self, authed_cli, clear_words, word_1: WordModel
+    ):
+        resp = await authed_cli.get("/words.list_words")
+        assert resp.status == 200
+        etag = resp.headers["ETag"]
+
+        resp = await authed_cli.get(
+            "/words.list_words", headers={"If-None-Match": etag}
+        )
+        assert resp.status == 304
+        assert resp.headers["ETag"] == etag
+
+    async def test_etag_changes_after_mutation(
+        self, authed_cli, clear_words, word_1: WordModel
+    ):
+        resp = await authed_cli.get("/words.list_words")
+        etag = resp.headers["ETag"]
+
+        await authed_cli.post(
+            "/words.add_word",
+            json={"title": "новоеслово", "is_correct": True},
+        )
+        resp = await authed_cli.get(
+            "/words.list_words", headers={"If-None-Match": etag}
+        )
+        assert resp.status == 200
+        assert resp.headers["ETag"] != etag
+        data = await resp.json()
+        assert len(data["data"]["words"]) == 2
+
+    async def test_etag_changes_after_write_elsewhere(
+        self,
+        authed_cli,
+        config,
+        monkeypatch,
+        db_session,
+        clear_words,
+        word_1: WordModel,
+    ):
+        # a write made by another process only moves the version row
+        resp = await authed_cli.get("/words.list_words")
+        etag = resp.headers["ETag"]
+        async with db_session.begin() as session:
+            session.add(WordModel(title="арбуз", is_correct=True))
+
+        monkeypatch.setattr(config.words, "version_check_interval", 0)
+        resp = await authed_cli.get(
+            "/words.list_words", headers={"If-None-Match": etag}
+        )
+        assert resp.status == 200
+        data = await resp.json()
+        assert len(data["data"]["words"]) == 2
+
+
+class TestWordsExportView:
+    async def test_unauthorized(self, cli):
+        resp = await cli.get("/words.export")
+        assert resp.status == 401
+
+    async def test_csv(
+        self, authed_cli, clear_words, word_1: WordModel, word_2: WordModel
+    ):
+        resp = await authed_cli.get("/words.export")
+        assert resp.status == 200
+        assert resp.headers["Content-Type"] == "text/csv; charset=utf-8"
+        assert 'filename="words.csv"' in resp.headers["Content-Disposition"]
+        assert await resp.text() == (
+            "id,title,is_correct\n"
+            f"{word_1.id},{word_1.title},true\n"
+            f"{word_2.id},{word_2.title},false\n"
+        )
+
+    async def test_jsonl_filtered(
+        self, authed_cli, clear_words, word_1: WordModel, word_2: WordModel
+    ):
+        resp = await authed_cli.get(
+            "/words.export", params={"format": "jsonl", "is_correct": "false"}
+        )
+        assert resp.status == 200
+        lines = (await resp.text()).splitlines()
+        assert [json.loads(line) for line in lines] == [asdict(word_2)]
+
+    async def test_gzip(self, authed_cli, clear_words, word_1: WordModel):
+        resp = await authed_cli.get(
+            "/words.export", params={"format": "jsonl", "gzip": "true"}
+        )
+        assert resp.status == 200
+        assert resp.headers["Content-Type"] == "application/gzip"
+        assert (
+            'filename="words.jsonl.gz"' in resp.headers["Content-Disposition"]
+        )
+        body = gzip.decompress(await resp.read()).decode()
+        assert json.loads(body) == asdict(word_1)
+
+    async def test_unknown_format(self, authed_cli):
+        resp = await authed_cli.get("/words.export", params={"format": "xml"})
+        assert resp.status == 400
+
+
+class TestWordsSuggestView:
+    async def test_unauthorized(self, cli):
+        resp = await cli.get("/words.suggest", params={"title": "олов"})
+        assert resp.status == 401
+
+    @pytest.mark.parametrize("source", ["memory", "db"])
+    async def test_suggest(
+        self,
+        authed_cli,
+        clear_words,
+        word_1: WordModel,
+        word_2: WordModel,
+        source,
+    ):
+        resp = await authed_cli.get(
+            "/words.suggest", params={"title": "Олов", "source": source}
+        )
+        assert resp.status == 200
+        data = await resp.json()
+        # word_2 is not a correct word, so it is never suggested
+        assert data == ok_response(
+            data={"suggestions": [{"title": word_1.title, "distance": 1}]}
+        )
+
+    async def test_nothing_close(
+        self, authed_cli, clear_words, word_1: WordModel
+    ):
+        resp = await authed_cli.get("/words.suggest", params={"title": "кот"})
+        assert resp.status == 200
+        data = await resp.json()
+        assert data == ok_response(data={"suggestions": []})
+
 
 class TestIntegration:
     async def test_success(self, authed_cli, clear_words):
@@ -244,6 +434,18 @@ class TestWordsPatchView:
             }
         )
 
+    async def test_conflict_spelling(
+        self, authed_cli, store: Store, clear_words, word_1: WordModel
+    ):
+        await store.words.create_word("ёлка", True)
+        resp = await authed_cli.post(
+            "/words.patch_word", json={"id": word_1.id, "title": " EЛКА "}
+        )
+        assert resp.status == 409
+        data = await resp.json()
+        assert data["status"] == "conflict"
+        assert (await store.words.get_word_by_id(word_1.id)).title == "олово"
+
     async def test_not_found(self, authed_cli, clear_words):
         resp = await authed_cli.post(
             "/words.patch_word",
@@ -0,0 +1,144 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+
+from app.store import Store
+from app.store.storage.sql import INSERT_WORD
+from app.store.writes.accessor import PendingWrite, WritesAccessor
+from app.words.models import WordModel
+
+
+@pytest.fixture(autouse=True)
+async def flush_writes(store: Store):
+    yield
+    await store.writes.flush()
+
+
+def word_row(title: str) -> dict:
+    return {"title": title, "is_correct": True, "canonical": title}
+
+
+def queue_word(store: Store, title: str):
+    return store.writes.execute(INSERT_WORD, word_row(title), key="title")
+
+
+class Result:
+    returns_rows = True
+
+    def __init__(self, rows: list):
+        self.rows = rows
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+
+class Connection:
+    """Answers every INSERT with the given rows, in the given order."""
+
+    def __init__(self, rows: list):
+        self.rows = rows
+        self.calls = 0
+
+    async def execute(self, statement, params=None):
+        self.calls += 1
+        return Result(self.rows)
+
+
+def returned(word_id: int, title: str) -> SimpleNamespace:
+    return SimpleNamespace(id=word_id, _mapping={"id": word_id, "title": title})
+
+
+class TestExecuteGroup:
+    async def test_rows_matched_by_key(self):
+        writes = [
+            PendingWrite(INSERT_WORD, word_row(title), None, "title")
+            for title in ("арбуз", "зебра")
+        ]
+        # postgres may return the rows in any order
+        connection = Connection([returned(2, "зебра"), returned(1, "арбуз")])
+        rows = await WritesAccessor._execute_group(
+            connection, INSERT_WORD, "title", writes
+        )
+        assert [row.id for row in rows] == [1, 2]
+        assert connection.calls == 1
+
+    async def test_returning_without_key_is_not_grouped(self):
+        writes = [
+            PendingWrite(INSERT_WORD, word_row(title), None)
+            for title in ("арбуз", "зебра")
+        ]
+        connection = Connection([returned(1, "арбуз")])
+        await WritesAccessor._execute_group(
+            connection, INSERT_WORD, None, writes
+        )
+        assert connection.calls == 2
+
+
+@pytest.mark.sql
+class TestWritesAccessor:
+    async def test_one_batch(self, store: Store, clear_words):
+        rows = await asyncio.gather(
+            *(
+                queue_word(store, title)
+                for title in ("арбуз", "зебра", "ананас")
+            )
+        )
+        assert len({row.id for row in rows}) == 3
+        word = await store.words.get_word_by_id(rows[1].id)
+        assert word.title == "зебра"
+
+    async def test_failure_is_per_write(
+        self, store: Store, clear_words, word_1
+    ):
+        results = await asyncio.gather(
+            queue_word(store, "арбуз"),
+            queue_word(store, word_1.title),
+            queue_word(store, "зебра"),
+            return_exceptions=True,
+        )
+        assert isinstance(results[1], IntegrityError)
+        assert results[1].orig.pgcode == "23505"
+        assert await store.words.get_word_by_id(results[0].id) is not None
+        assert await store.words.get_word_by_id(results[2].id) is not None
+
+    async def test_skipped_rows(self, store: Store, clear_words, word_1):
+        statement = (
+            insert(WordModel.__table__)
+            .on_conflict_do_nothing()
+            .returning(WordModel.__table__.c.id)
+        )
+        skipped, inserted = await asyncio.gather(
+            store.writes.execute(statement, word_row(word_1.title)),
+            store.writes.execute(statement, word_row("арбуз")),
+        )
+        assert skipped is None
+        assert (await store.words.get_word_by_id(inserted.id)).title == "арбуз"
+
+    async def test_max_batch(self, store: Store, config, clear_words):
+        max_batch, config.writes.max_batch = config.writes.max_batch, 2
+        window, config.writes.window = config.writes.window, 60
+        try:
+            first = asyncio.ensure_future(queue_word(store, "арбуз"))
+            await asyncio.sleep(0)
+            assert not first.done()
+            second = await queue_word(store, "зебра")
+            assert (await first).id != second.id
+        finally:
+            config.writes.max_batch = max_batch
+            config.writes.window = window
+
+    async def test_words_accessor(self, store: Store, clear_words):
+        word = await store.words.create_word("арбуз", True)
+        assert (await store.words.get_word_by_title("арбуз")).id == word.id
+        await store.words.delete_word(word.id)
+        assert await store.words.get_word_by_id(word.id) is None
+
+    async def test_flush_empty(self, store: Store):
+        await store.writes.flush()
+        assert store.writes.pending == []